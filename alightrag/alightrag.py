@@ -4,6 +4,7 @@ import traceback
 import asyncio
 import configparser
 import inspect
+import itertools
 import os
 import time
 import warnings
@@ -29,6 +30,7 @@ from alightrag.exceptions import PipelineCancelledException
 from alightrag.constants import (
     DEFAULT_MAX_GLEANING,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
+    DEFAULT_ENABLE_BULK_MERGE,
     DEFAULT_TOP_K,
     DEFAULT_CHUNK_TOP_K,
     DEFAULT_MAX_ENTITY_TOKENS,
@@ -43,6 +45,16 @@ from alightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_MAX_PARALLEL_EXTRACT,
+    DEFAULT_MAX_PARALLEL_CHUNK,
+    DEFAULT_MAX_PARALLEL_PERSIST,
+    DEFAULT_PIPELINE_QUEUE_SIZE,
+    DEFAULT_ENABLE_GROUP_COMMIT,
+    DEFAULT_GROUP_COMMIT_INTERVAL,
+    DEFAULT_GROUP_COMMIT_BYTES,
+    DEFAULT_CHUNK_STREAM_BATCH_SIZE,
+    DEFAULT_CPU_EXECUTOR,
+    DEFAULT_CPU_EXECUTOR_WORKERS,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
@@ -50,6 +62,7 @@ from alightrag.constants import (
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_EMBEDDING_COALESCE_WAIT,
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
@@ -86,6 +99,8 @@ from alightrag.base import (
 from alightrag.namespace import NameSpace
 from alightrag.operate import (
     chunking_by_token_size,
+    iter_chunks_by_token_size,
+    ChunkExtractionScheduler,
     extract_entities,
     merge_nodes_and_edges,
     kg_query,
@@ -100,7 +115,12 @@ from alightrag.utils import (
     always_get_an_event_loop,
     compute_mdhash_id,
     lazy_external_import,
+    acquire_cpu_executor,
+    release_cpu_executor,
+    acquire_shared_http_clients,
+    release_shared_http_clients,
     priority_limit_async_func_call,
+    coalesce_embedding_func_call,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
@@ -110,6 +130,9 @@ from alightrag.utils import (
     subtract_source_ids,
     make_relation_chunk_key,
     normalize_source_ids_limit_method,
+    bump_kg_version,
+    PipelineStage,
+    GroupCommitter,
 )
 from alightrag.types import KnowledgeGraph
 from dotenv import load_dotenv
@@ -216,6 +239,13 @@ class AlightRAG:
         )
     )
 
+    enable_bulk_merge: bool = field(
+        default=get_env_value("ENABLE_BULK_MERGE", DEFAULT_ENABLE_BULK_MERGE, bool)
+    )
+    """Merge a document's entities and relations with batched storage reads and writes.
+    Nodes, edges and chunk-tracking records are prefetched in batches, merged in memory and written back
+    with batched upserts; all of the document's entities stay locked during its merge."""
+
     # Text chunking
     # ---
 
@@ -227,6 +257,13 @@ class AlightRAG:
     )
     """Number of overlapping tokens between consecutive text chunks to preserve context."""
 
+    chunk_stream_batch_size: int = field(
+        default=get_env_value(
+            "CHUNK_STREAM_BATCH_SIZE", DEFAULT_CHUNK_STREAM_BATCH_SIZE, int
+        )
+    )
+    """Number of chunks handed to entity extraction at a time while a document is still being chunked."""
+
     tokenizer: Optional[Tokenizer] = field(default=None)
     """
     A function that returns a Tokenizer instance.
@@ -246,7 +283,11 @@ class AlightRAG:
             int,
             int,
         ],
-        Union[List[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]],
+        Union[
+            List[Dict[str, Any]],
+            Iterator[Dict[str, Any]],
+            Awaitable[List[Dict[str, Any]]],
+        ],
     ] = field(default_factory=lambda: chunking_by_token_size)
     """
     Custom chunking function for splitting text into chunks before processing.
@@ -263,11 +304,15 @@ class AlightRAG:
         - `chunk_overlap_token_size`: The number of overlapping tokens between consecutive chunks.
 
     The function should return a list of dictionaries (or an awaitable that resolves to a list),
-    where each dictionary contains the following keys:
+    or an iterator/generator yielding them, where each dictionary contains the following keys:
         - `tokens`: The number of tokens in the chunk.
         - `content`: The text content of the chunk.
 
-    Defaults to `chunking_by_token_size` if not specified.
+    Chunks returned by an iterator are pulled in a worker thread, and entity extraction starts
+    on each batch of `chunk_stream_batch_size` chunks while later chunks are still being produced.
+
+    Defaults to `chunking_by_token_size` if not specified; it is run as the streaming
+    `iter_chunks_by_token_size` generator in the document pipeline.
     """
 
     # Embedding
@@ -284,6 +329,14 @@ class AlightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    embedding_coalesce_wait: float = field(
+        default=float(
+            os.getenv("EMBEDDING_COALESCE_WAIT", DEFAULT_EMBEDDING_COALESCE_WAIT)
+        )
+    )
+    """Time window in seconds for gathering concurrent small embedding requests into one
+    batched call of up to `embedding_batch_num` texts. Set to 0 to disable coalescing."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
@@ -368,7 +421,68 @@ class AlightRAG:
     max_parallel_insert: int = field(
         default=int(os.getenv("MAX_PARALLEL_INSERT", DEFAULT_MAX_PARALLEL_INSERT))
     )
-    """Maximum number of parallel insert operations."""
+    """Maximum number of documents merged into the knowledge graph in parallel."""
+
+    max_parallel_extract: int = field(
+        default=get_env_value(
+            "MAX_PARALLEL_EXTRACT", DEFAULT_MAX_PARALLEL_EXTRACT, int
+        )
+    )
+    """Maximum number of documents in the chunking and entity extraction stages at a time.
+    Their chunks share one extraction queue limited by `llm_model_max_async`, served round-robin across documents."""
+
+    max_parallel_chunk: int = field(
+        default=get_env_value("MAX_PARALLEL_CHUNK", DEFAULT_MAX_PARALLEL_CHUNK, int)
+    )
+    """Maximum number of documents being split into chunks at a time."""
+
+    max_parallel_persist: int = field(
+        default=get_env_value(
+            "MAX_PARALLEL_PERSIST", DEFAULT_MAX_PARALLEL_PERSIST, int
+        )
+    )
+    """Maximum number of processed documents persisted (status update and storage flush) at a time."""
+
+    pipeline_queue_size: int = field(
+        default=get_env_value(
+            "PIPELINE_QUEUE_SIZE", DEFAULT_PIPELINE_QUEUE_SIZE, int
+        )
+    )
+    """Number of documents queued in front of each pipeline stage before the previous stage waits.
+    The extraction queue holds this many chunk batches (`chunk_stream_batch_size` chunks each)."""
+
+    enable_group_commit: bool = field(
+        default=get_env_value(
+            "ENABLE_GROUP_COMMIT", DEFAULT_ENABLE_GROUP_COMMIT, bool
+        )
+    )
+    """If True, processed documents are persisted in groups rather than one storage flush per document.
+    A document is marked PROCESSED only after its group is committed."""
+
+    group_commit_interval: float = field(
+        default=get_env_value(
+            "GROUP_COMMIT_INTERVAL", DEFAULT_GROUP_COMMIT_INTERVAL, float
+        )
+    )
+    """Seconds after which an open commit group is persisted."""
+
+    group_commit_bytes: int = field(
+        default=get_env_value("GROUP_COMMIT_BYTES", DEFAULT_GROUP_COMMIT_BYTES, int)
+    )
+    """Total content length of the documents in a group that triggers its commit."""
+
+    cpu_executor: str = field(
+        default=get_env_value("CPU_EXECUTOR", DEFAULT_CPU_EXECUTOR)
+    )
+    """Executor for CPU-bound tokenization and extraction parsing: "none" (inline on the event loop), "thread" or "process".
+    The executor is shared by all AlightRAG instances of the process."""
+
+    cpu_executor_workers: int = field(
+        default=get_env_value(
+            "CPU_EXECUTOR_WORKERS", DEFAULT_CPU_EXECUTOR_WORKERS, int
+        )
+    )
+    """Number of worker threads or processes of the CPU executor."""
 
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
@@ -525,6 +639,15 @@ class AlightRAG:
             queue_name="Embedding func",
         )(self.embedding_func)
 
+        # Coalesce concurrent small embedding requests (e.g. single-record vector
+        # upserts during merging) into batched calls
+        if self.embedding_coalesce_wait > 0:
+            self.embedding_func = coalesce_embedding_func_call(
+                self.embedding_batch_num,
+                max_wait_time=self.embedding_coalesce_wait,
+                queue_name="Embedding coalescer",
+            )(self.embedding_func)
+
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
             self._get_storage_class(self.kv_storage)
@@ -640,6 +763,9 @@ class AlightRAG:
             )
         )
 
+        # Commit group of the running document pipeline, flushed on finalize
+        self._group_committer: GroupCommitter | None = None
+
         self._storages_status = StoragesStatus.CREATED
 
     async def initialize_storages(self):
@@ -663,12 +789,19 @@ class AlightRAG:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            acquire_cpu_executor(
+                self.cpu_executor, self.cpu_executor_workers, self.tokenizer
+            )
+            acquire_shared_http_clients()
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
     async def finalize_storages(self):
         """Asynchronously finalize the storages with improved error handling"""
         if self._storages_status == StoragesStatus.INITIALIZED:
+            if self._group_committer is not None:
+                await self._group_committer.flush()
+
             storages = [
                 ("full_docs", self.full_docs),
                 ("text_chunks", self.text_chunks),
@@ -712,6 +845,14 @@ class AlightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            get_embedding_stats = getattr(self.embedding_func, "get_stats", None)
+            if get_embedding_stats is not None:
+                logger.info(f"Embedding batch statistics: {get_embedding_stats()}")
+
+            release_cpu_executor()
+            # Pooled LLM, embedding and rerank clients are closed with their last user
+            # and recreated on next use
+            await release_shared_http_clients()
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -1586,6 +1727,14 @@ class AlightRAG:
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
             if not pipeline_status.get("busy", False):
+                interrupted_docs = await GroupCommitter.recover_journal(
+                    self._group_commit_journal_path(), self._reset_uncommitted_docs
+                )
+                if interrupted_docs:
+                    logger.warning(
+                        f"Group commit of {len(interrupted_docs)} document(s) was interrupted, reprocessing them"
+                    )
+
                 processing_docs, failed_docs, pending_docs = await asyncio.gather(
                     self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
                     self.doc_status.get_docs_by_status(DocStatus.FAILED),
@@ -1612,6 +1761,10 @@ class AlightRAG:
                         "request_pending": False,  # Clear any previous request
                         "cancellation_requested": False,  # Initialize cancellation flag
                         "latest_message": "",
+                        "chunks_extracted": 0,
+                        "chunks_per_minute": 0.0,
+                        "stages": {},
+                        "bulk_merge_conflicts": 0,
                     }
                 )
                 # Cleaning history_messages without breaking it as a shared list object
@@ -1692,8 +1845,48 @@ class AlightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # Documents in the chunking and extraction stage at a time
+                extraction_semaphore = asyncio.Semaphore(self.max_parallel_extract)
+                # Chunks of all documents share one extraction queue and LLM budget
+                chunk_scheduler = ChunkExtractionScheduler(
+                    self.llm_model_max_async,
+                    self.pipeline_queue_size * self.chunk_stream_batch_size,
+                )
+                # Documents pass through the stages in order. Each stage has its own
+                # workers and a bounded queue, and a document waits for a place in the
+                # next queue before leaving its stage, so merging and persisting some
+                # documents overlaps with extracting others without unbounded buildup
+                stages: dict[str, PipelineStage] = {
+                    "chunk": PipelineStage(
+                        "chunk", self.max_parallel_chunk, self.pipeline_queue_size
+                    ),
+                    "extract": chunk_scheduler.stage,
+                    "merge": PipelineStage(
+                        "merge", self.max_parallel_insert, self.pipeline_queue_size
+                    ),
+                    "persist": PipelineStage(
+                        "persist", self.max_parallel_persist, self.pipeline_queue_size
+                    ),
+                }
+
+                group_committer = None
+                if self.enable_group_commit:
+                    group_committer = GroupCommitter(
+                        lambda: self._insert_done(pipeline_status, pipeline_status_lock),
+                        lambda records, error: self._complete_commit_group(
+                            records, error, pipeline_status, pipeline_status_lock
+                        ),
+                        self._group_commit_journal_path(),
+                        self.group_commit_interval,
+                        self.group_commit_bytes,
+                    )
+                self._group_committer = group_committer
+
+                async def publish_stage_stats() -> None:
+                    async with pipeline_status_lock:
+                        pipeline_status["stages"] = {
+                            name: stage.get_stats() for name, stage in stages.items()
+                        }
 
                 async def process_document(
                     doc_id: str,
@@ -1702,22 +1895,23 @@ class AlightRAG:
                     split_by_character_only: bool,
                     pipeline_status: dict,
                     pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
+                    extraction_semaphore: asyncio.Semaphore,
+                    stages: dict[str, PipelineStage],
                 ) -> None:
-                    """Process single document"""
+                    """Process single document through the chunk, extract, merge and persist stages"""
                     # Initialize variables at the start to prevent UnboundLocalError in error handling
                     file_path = "unknown_source"
                     current_file_number = 0
                     file_extraction_stage_ok = False
                     processing_start_time = int(time.time())
                     first_stage_tasks = []
-                    entity_relation_task = None
+                    extraction_tasks = []
 
-                    async with semaphore:
+                    async with extraction_semaphore:
                         nonlocal processed_count
                         # Initialize to prevent UnboundLocalError in error handling
                         first_stage_tasks = []
-                        entity_relation_task = None
+                        extraction_tasks = []
                         try:
                             # Check for cancellation before starting document processing
                             async with pipeline_status_lock:
@@ -1762,100 +1956,110 @@ class AlightRAG:
                                 )
                             content = content_data["content"]
 
-                            # Call chunking function, supporting both sync and async implementations
-                            chunking_result = self.chunking_func(
-                                self.tokenizer,
-                                content,
-                                split_by_character,
-                                split_by_character_only,
-                                self.chunk_overlap_token_size,
-                                self.chunk_token_size,
-                            )
+                            async def store_and_extract(
+                                batch_chunks: dict[str, Any],
+                            ) -> list:
+                                # Entity extraction reads and updates the stored chunks
+                                await asyncio.gather(
+                                    self.chunks_vdb.upsert(batch_chunks),
+                                    self.text_chunks.upsert(batch_chunks),
+                                )
+                                batch_results = await self._process_extract_entities(
+                                    batch_chunks,
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                    chunk_scheduler,
+                                )
+                                await publish_stage_stats()
+                                return batch_results
 
-                            # If result is awaitable, await to get actual result
-                            if inspect.isawaitable(chunking_result):
-                                chunking_result = await chunking_result
+                            # Record processing start time
+                            processing_start_time = int(time.time())
 
-                            # Validate return type
-                            if not isinstance(chunking_result, (list, tuple)):
-                                raise TypeError(
-                                    f"chunking_func must return a list or tuple of dicts, "
-                                    f"got {type(chunking_result)}"
-                                )
+                            # Stage 1: Chunk the document and store the chunks. Chunks arrive in
+                            # batches (produced in a worker thread) and each batch goes on to
+                            # Stage 2, entity extraction, while later chunks are still produced
+                            chunks: dict[str, Any] = {}
+                            await stages["chunk"].put(doc_id)
+                            await publish_stage_stats()
+                            async with stages["chunk"].slot(doc_id):
+                                async for chunk_batch in self._iter_document_chunk_batches(
+                                    content, split_by_character, split_by_character_only
+                                ):
+                                    batch_chunks: dict[str, Any] = {}
+                                    for dp in chunk_batch:
+                                        chunk_id = compute_mdhash_id(
+                                            dp["content"], prefix="chunk-"
+                                        )
+                                        # Duplicate chunks keep their first occurrence: earlier
+                                        # batches are already stored and being extracted
+                                        if chunk_id in chunks or chunk_id in batch_chunks:
+                                            continue
+                                        batch_chunks[chunk_id] = {
+                                            **dp,
+                                            "full_doc_id": doc_id,
+                                            "file_path": file_path,  # Add file path to each chunk
+                                            "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+                                        }
+                                    if not batch_chunks:
+                                        continue
+                                    chunks.update(batch_chunks)
 
-                            # Build chunks dictionary
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                }
-                                for dp in chunking_result
-                            }
+                                    # Check for cancellation before entity extraction
+                                    async with pipeline_status_lock:
+                                        if pipeline_status.get(
+                                            "cancellation_requested", False
+                                        ):
+                                            raise PipelineCancelledException(
+                                                "User cancelled"
+                                            )
+
+                                    # Waits while the extraction queue is full
+                                    await stages["extract"].put(doc_id, len(batch_chunks))
+                                    extraction_tasks.append(
+                                        asyncio.create_task(store_and_extract(batch_chunks))
+                                    )
 
                             if not chunks:
                                 logger.warning("No document chunks to process")
 
-                            # Record processing start time
-                            processing_start_time = int(time.time())
-
-                            # Check for cancellation before entity extraction
-                            async with pipeline_status_lock:
-                                if pipeline_status.get("cancellation_requested", False):
-                                    raise PipelineCancelledException("User cancelled")
-
-                            # Process document in two stages
-                            # Stage 1: Process text chunks and docs (parallel execution)
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time
-                                            },
+                            first_stage_tasks = [
+                                asyncio.create_task(
+                                    self.doc_status.upsert(
+                                        {
+                                            doc_id: {
+                                                "status": DocStatus.PROCESSING,
+                                                "chunks_count": len(chunks),
+                                                "chunks_list": list(
+                                                    chunks.keys()
+                                                ),  # Save chunks list
+                                                "content_summary": status_doc.content_summary,
+                                                "content_length": status_doc.content_length,
+                                                "created_at": status_doc.created_at,
+                                                "updated_at": datetime.now(
+                                                    timezone.utc
+                                                ).isoformat(),
+                                                "file_path": file_path,
+                                                "track_id": status_doc.track_id,  # Preserve existing track_id
+                                                "metadata": {
+                                                    "processing_start_time": processing_start_time
+                                                },
+                                            }
                                         }
-                                    }
+                                    )
                                 )
-                            )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
-
-                            # First stage tasks (parallel execution)
-                            first_stage_tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                text_chunks_task,
                             ]
-                            entity_relation_task = None
-
-                            # Execute first stage tasks
                             await asyncio.gather(*first_stage_tasks)
 
-                            # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
-                                )
-                            )
-                            chunk_results = await entity_relation_task
+                            # Wait for Stage 2 on all batches
+                            batch_results = await asyncio.gather(*extraction_tasks)
+                            chunk_results = [
+                                result
+                                for results in batch_results
+                                for result in results
+                            ]
+                            # Hold the extraction slot until the merge queue has room
+                            await stages["merge"].put(doc_id)
                             file_extraction_stage_ok = True
 
                         except Exception as e:
@@ -1884,12 +2088,12 @@ class AlightRAG:
                                     )
 
                             # Cancel tasks that are not yet completed
-                            all_tasks = first_stage_tasks + (
-                                [entity_relation_task] if entity_relation_task else []
-                            )
+                            all_tasks = first_stage_tasks + extraction_tasks
                             for task in all_tasks:
                                 if task and not task.done():
                                     task.cancel()
+                            for stage in stages.values():
+                                stage.discard(doc_id)
 
                             # Persistent llm cache with error handling
                             if self.llm_response_cache:
@@ -1925,9 +2129,11 @@ class AlightRAG:
                                 }
                             )
 
-                        # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
-                            try:
+                    # Hand the document to the merge stage as soon as its chunks are extracted
+                    if file_extraction_stage_ok:
+                        try:
+                            # Concurrency is controlled by keyed lock for individual entities and relationships
+                            async with stages["merge"].slot(doc_id):
                                 # Check for cancellation before merge
                                 async with pipeline_status_lock:
                                     if pipeline_status.get(
@@ -1957,33 +2163,46 @@ class AlightRAG:
                                     file_path=file_path,
                                 )
 
+                                # Wait for room in the persist queue before freeing the merge slot
+                                await stages["persist"].put(doc_id)
+                                await publish_stage_stats()
+
+                            async with stages["persist"].slot(doc_id):
                                 # Record processing end time
                                 processing_end_time = int(time.time())
 
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
+                                processed_status = {
+                                    "status": DocStatus.PROCESSED,
+                                    "chunks_count": len(chunks),
+                                    "chunks_list": list(chunks.keys()),
+                                    "content_summary": status_doc.content_summary,
+                                    "content_length": status_doc.content_length,
+                                    "created_at": status_doc.created_at,
+                                    "updated_at": datetime.now(
+                                        timezone.utc
+                                    ).isoformat(),
+                                    "file_path": file_path,
+                                    "track_id": status_doc.track_id,  # Preserve existing track_id
+                                    "metadata": {
+                                        "processing_start_time": processing_start_time,
+                                        "processing_end_time": processing_end_time,
+                                    },
+                                }
+
+                                if group_committer is not None:
+                                    # Marked PROCESSED once its group is committed
+                                    await group_committer.add(
+                                        doc_id,
+                                        processed_status,
+                                        status_doc.content_length or 0,
+                                    )
+                                else:
+                                    await self.doc_status.upsert(
+                                        {doc_id: processed_status}
+                                    )
 
-                                # Call _insert_done after processing each file
-                                await self._insert_done()
+                                    # Call _insert_done after processing each file
+                                    await self._insert_done()
 
                                 async with pipeline_status_lock:
                                     log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
@@ -1993,62 +2212,67 @@ class AlightRAG:
                                         log_message
                                     )
 
-                            except Exception as e:
-                                # Check if this is a user cancellation
-                                if isinstance(e, PipelineCancelledException):
-                                    # User cancellation - log brief message only, no traceback
-                                    error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
-                                    logger.warning(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
-                                else:
-                                    # Other exceptions - log with traceback
-                                    logger.error(traceback.format_exc())
-                                    error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                                    logger.error(error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = error_msg
-                                        pipeline_status["history_messages"].append(
-                                            traceback.format_exc()
-                                        )
-                                        pipeline_status["history_messages"].append(
-                                            error_msg
-                                        )
+                        except Exception as e:
+                            # Check if this is a user cancellation
+                            if isinstance(e, PipelineCancelledException):
+                                # User cancellation - log brief message only, no traceback
+                                error_msg = f"User cancelled during merge {current_file_number}/{total_files}: {file_path}"
+                                logger.warning(error_msg)
+                                async with pipeline_status_lock:
+                                    pipeline_status["latest_message"] = error_msg
+                                    pipeline_status["history_messages"].append(
+                                        error_msg
+                                    )
+                            else:
+                                # Other exceptions - log with traceback
+                                logger.error(traceback.format_exc())
+                                error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
+                                logger.error(error_msg)
+                                async with pipeline_status_lock:
+                                    pipeline_status["latest_message"] = error_msg
+                                    pipeline_status["history_messages"].append(
+                                        traceback.format_exc()
+                                    )
+                                    pipeline_status["history_messages"].append(
+                                        error_msg
+                                    )
 
-                                # Persistent llm cache with error handling
-                                if self.llm_response_cache:
-                                    try:
-                                        await self.llm_response_cache.index_done_callback()
-                                    except Exception as persist_error:
-                                        logger.error(
-                                            f"Failed to persist LLM cache: {persist_error}"
-                                        )
+                            for stage in stages.values():
+                                stage.discard(doc_id)
 
-                                # Record processing end time for failed case
-                                processing_end_time = int(time.time())
+                            # Persistent llm cache with error handling
+                            if self.llm_response_cache:
+                                try:
+                                    await self.llm_response_cache.index_done_callback()
+                                except Exception as persist_error:
+                                    logger.error(
+                                        f"Failed to persist LLM cache: {persist_error}"
+                                    )
 
-                                # Update document status to failed
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.FAILED,
-                                            "error_msg": str(e),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now().isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
+                            # Record processing end time for failed case
+                            processing_end_time = int(time.time())
+
+                            # Update document status to failed
+                            await self.doc_status.upsert(
+                                {
+                                    doc_id: {
+                                        "status": DocStatus.FAILED,
+                                        "error_msg": str(e),
+                                        "content_summary": status_doc.content_summary,
+                                        "content_length": status_doc.content_length,
+                                        "created_at": status_doc.created_at,
+                                        "updated_at": datetime.now().isoformat(),
+                                        "file_path": file_path,
+                                        "track_id": status_doc.track_id,  # Preserve existing track_id
+                                        "metadata": {
+                                            "processing_start_time": processing_start_time,
+                                            "processing_end_time": processing_end_time,
+                                        },
                                     }
-                                )
+                                }
+                            )
+
+                    await publish_stage_stats()
 
                 # Create processing tasks for all documents
                 doc_tasks = []
@@ -2061,7 +2285,8 @@ class AlightRAG:
                             split_by_character_only,
                             pipeline_status,
                             pipeline_status_lock,
-                            semaphore,
+                            extraction_semaphore,
+                            stages,
                         )
                     )
 
@@ -2079,6 +2304,11 @@ class AlightRAG:
 
                     # Exit directly (document statuses already updated in process_document)
                     return
+                finally:
+                    # Commit the documents completed so far, also on cancellation
+                    if group_committer is not None:
+                        await group_committer.flush()
+                    self._group_committer = None
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -2120,8 +2350,73 @@ class AlightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    async def _iter_document_chunk_batches(
+        self,
+        content: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the chunks of a document in batches of chunk_stream_batch_size.
+
+        The default chunker, and any chunking_func returning an iterator, is advanced
+        in a worker thread so that chunking large documents does not block the event
+        loop and downstream stages can start on the first batches.
+        """
+        if self.chunking_func is chunking_by_token_size:
+            chunk_iter = iter_chunks_by_token_size(
+                self.tokenizer,
+                content,
+                split_by_character,
+                split_by_character_only,
+                self.chunk_overlap_token_size,
+                self.chunk_token_size,
+            )
+        else:
+            # Call chunking function, supporting both sync and async implementations
+            chunking_result = self.chunking_func(
+                self.tokenizer,
+                content,
+                split_by_character,
+                split_by_character_only,
+                self.chunk_overlap_token_size,
+                self.chunk_token_size,
+            )
+
+            # If result is awaitable, await to get actual result
+            if inspect.isawaitable(chunking_result):
+                chunking_result = await chunking_result
+
+            # Validate return type
+            if isinstance(chunking_result, (list, tuple)):
+                for start in range(
+                    0, len(chunking_result), self.chunk_stream_batch_size
+                ):
+                    yield list(
+                        chunking_result[start : start + self.chunk_stream_batch_size]
+                    )
+                return
+            if not isinstance(chunking_result, Iterator):
+                raise TypeError(
+                    f"chunking_func must return a list, tuple or iterator of dicts, "
+                    f"got {type(chunking_result)}"
+                )
+            chunk_iter = chunking_result
+
+        batch_size = self.chunk_stream_batch_size
+        while True:
+            batch = await asyncio.to_thread(
+                lambda: list(itertools.islice(chunk_iter, batch_size))
+            )
+            if not batch:
+                return
+            yield batch
+
     async def _process_extract_entities(
-        self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
+        self,
+        chunk: dict[str, Any],
+        pipeline_status=None,
+        pipeline_status_lock=None,
+        chunk_scheduler: ChunkExtractionScheduler | None = None,
     ) -> list:
         try:
             chunk_results = await extract_entities(
@@ -2131,6 +2426,7 @@ class AlightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                chunk_scheduler=chunk_scheduler,
             )
             return chunk_results
         except Exception as e:
@@ -2141,9 +2437,68 @@ class AlightRAG:
                 pipeline_status["history_messages"].append(error_msg)
             raise e
 
+    def _group_commit_journal_path(self) -> str:
+        workspace_dir = (
+            os.path.join(self.working_dir, self.workspace)
+            if self.workspace
+            else self.working_dir
+        )
+        return os.path.join(workspace_dir, "group_commit_journal.json")
+
+    async def _reset_uncommitted_docs(self, doc_ids: list[str]) -> None:
+        """Reset documents of an interrupted group commit to PENDING"""
+        docs_to_reset = {}
+        status_docs = await self.doc_status.get_by_ids(doc_ids)
+        for doc_id, status_doc in zip(doc_ids, status_docs):
+            # PROCESSED documents were committed before the interruption
+            if not status_doc or status_doc.get("status") == DocStatus.PROCESSED:
+                continue
+            docs_to_reset[doc_id] = {
+                "status": DocStatus.PENDING,
+                "content_summary": status_doc.get("content_summary", ""),
+                "content_length": status_doc.get("content_length", 0),
+                "created_at": status_doc.get("created_at"),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "file_path": status_doc.get("file_path", "unknown_source"),
+                "track_id": status_doc.get("track_id", ""),
+                "error_msg": "",
+                "metadata": {},
+            }
+        if docs_to_reset:
+            await self.doc_status.upsert(docs_to_reset)
+            await self.doc_status.index_done_callback()
+
+    async def _complete_commit_group(
+        self,
+        records: dict[str, dict[str, Any]],
+        error: Exception | None,
+        pipeline_status=None,
+        pipeline_status_lock=None,
+    ) -> None:
+        """Mark the documents of a commit group PROCESSED, or FAILED if its commit failed"""
+        if error is not None:
+            records = {
+                doc_id: {**record, "status": DocStatus.FAILED, "error_msg": str(error)}
+                for doc_id, record in records.items()
+            }
+            log_message = f"Failed to commit {len(records)} document(s): {error}"
+        else:
+            log_message = f"Committed {len(records)} processed document(s)"
+        await self.doc_status.upsert(records)
+        await self.doc_status.index_done_callback()
+
+        logger.info(log_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
+        # The knowledge graph may have changed, so cached query answers are stale
+        await bump_kg_version(self.llm_response_cache)
+
         tasks = [
             cast(StorageNameSpace, storage_inst).index_done_callback()
             for storage_inst in [  # type: ignore
@@ -2223,6 +2578,7 @@ class AlightRAG:
 
             # Insert entities into knowledge graph
             all_entities_data: list[dict[str, str]] = []
+            graph_nodes: list[tuple[str, dict[str, str]]] = []
             for entity_data in custom_kg.get("entities", []):
                 entity_name = entity_data["entity_name"]
                 entity_type = entity_data.get("entity_type", "UNKNOWN")
@@ -2246,16 +2602,30 @@ class AlightRAG:
                     "file_path": file_path,
                     "created_at": int(time.time()),
                 }
-                # Insert node data into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_node(
-                    entity_name, node_data=node_data
-                )
-                node_data["entity_name"] = entity_name
-                all_entities_data.append(node_data)
+                graph_nodes.append((entity_name, node_data))
+                all_entities_data.append({**node_data, "entity_name": entity_name})
                 update_storage = True
 
+            # Insert node data into the knowledge graph
+            await self.chunk_entity_relation_graph.upsert_nodes_batch(graph_nodes)
+
             # Insert relationships into knowledge graph
             all_relationships_data: list[dict[str, str]] = []
+            graph_edges: list[tuple[str, str, dict[str, str]]] = []
+            missing_nodes: dict[str, dict[str, str]] = {}
+            relationship_node_ids = list(
+                dict.fromkeys(
+                    node_id
+                    for relationship_data in custom_kg.get("relationships", [])
+                    for node_id in (
+                        relationship_data["src_id"],
+                        relationship_data["tgt_id"],
+                    )
+                )
+            )
+            existing_nodes = await self.chunk_entity_relation_graph.get_nodes_batch(
+                relationship_node_ids
+            )
             for relationship_data in custom_kg.get("relationships", []):
                 src_id = relationship_data["src_id"]
                 tgt_id = relationship_data["tgt_id"]
@@ -2272,35 +2642,34 @@ class AlightRAG:
                         f"Relationship from '{src_id}' to '{tgt_id}' has an UNKNOWN source_id. Please check the source mapping."
                     )
 
-                # Check if nodes exist in the knowledge graph
+                # Create the nodes missing from the knowledge graph
                 for need_insert_id in [src_id, tgt_id]:
-                    if not (
-                        await self.chunk_entity_relation_graph.has_node(need_insert_id)
+                    if (
+                        need_insert_id not in existing_nodes
+                        and need_insert_id not in missing_nodes
                     ):
-                        await self.chunk_entity_relation_graph.upsert_node(
-                            need_insert_id,
-                            node_data={
-                                "entity_id": need_insert_id,
-                                "source_id": source_id,
-                                "description": "UNKNOWN",
-                                "entity_type": "UNKNOWN",
-                                "file_path": file_path,
-                                "created_at": int(time.time()),
-                            },
-                        )
+                        missing_nodes[need_insert_id] = {
+                            "entity_id": need_insert_id,
+                            "source_id": source_id,
+                            "description": "UNKNOWN",
+                            "entity_type": "UNKNOWN",
+                            "file_path": file_path,
+                            "created_at": int(time.time()),
+                        }
 
-                # Insert edge into the knowledge graph
-                await self.chunk_entity_relation_graph.upsert_edge(
-                    src_id,
-                    tgt_id,
-                    edge_data={
-                        "weight": weight,
-                        "description": description,
-                        "keywords": keywords,
-                        "source_id": source_id,
-                        "file_path": file_path,
-                        "created_at": int(time.time()),
-                    },
+                graph_edges.append(
+                    (
+                        src_id,
+                        tgt_id,
+                        {
+                            "weight": weight,
+                            "description": description,
+                            "keywords": keywords,
+                            "source_id": source_id,
+                            "file_path": file_path,
+                            "created_at": int(time.time()),
+                        },
+                    )
                 )
 
                 edge_data: dict[str, str] = {
@@ -2316,6 +2685,12 @@ class AlightRAG:
                 all_relationships_data.append(edge_data)
                 update_storage = True
 
+            # Insert edges into the knowledge graph, after their missing nodes
+            await self.chunk_entity_relation_graph.upsert_nodes_batch(
+                list(missing_nodes.items())
+            )
+            await self.chunk_entity_relation_graph.upsert_edges_batch(graph_edges)
+
             # Insert entities into vector storage with consistent format
             data_for_vdb = {
                 compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
@@ -2400,7 +2775,15 @@ class AlightRAG:
                 - Streaming: Returns AsyncIterator[str]
         """
         # Call the new aquery_llm function to get complete results
-        result = await self.aquery_llm(query, param, system_prompt, use_reasoning, use_reflection)
+        # raw_data is discarded here, so a query cache hit can skip context building
+        result = await self.aquery_llm(
+            query,
+            param,
+            system_prompt,
+            use_reasoning,
+            use_reflection,
+            need_raw_data=False,
+        )
 
         # Extract and return only the LLM response for backward compatibility
         llm_response = result.get("llm_response", {})
@@ -2645,6 +3028,7 @@ class AlightRAG:
         system_prompt: str | None = None,
         use_reasoning: bool = True,
         use_reflection: bool = True,
+        need_raw_data: bool = True,
     ) -> dict[str, Any]:
         """
         Asynchronous complete query API: returns structured retrieval results with LLM generation.
@@ -2656,6 +3040,8 @@ class AlightRAG:
             query: Query text for retrieval and LLM generation.
             param: Query parameters controlling retrieval and LLM behavior.
             system_prompt: Optional custom system prompt for LLM generation.
+            need_raw_data: Whether the structured data is needed. If False, a query cache
+                hit is answered without retrieval and the structured data may be empty.
 
         Returns:
             dict[str, Any]: Complete response with structured data and LLM response.
@@ -2681,6 +3067,7 @@ class AlightRAG:
                     chunks_vdb=self.chunks_vdb,
                     use_reasoning=use_reasoning,
                     use_reflection=use_reflection,
+                    need_raw_data=need_raw_data,
                 )
             elif param.mode == "naive":
                 query_result = await naive_query(
@@ -3559,12 +3946,15 @@ class AlightRAG:
         """
         from alightrag.utils_graph import adelete_by_entity
 
-        return await adelete_by_entity(
+        result = await adelete_by_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def delete_by_entity(self, entity_name: str) -> DeletionResult:
         """Synchronously delete an entity and all its relationships.
@@ -3592,12 +3982,15 @@ class AlightRAG:
         """
         from alightrag.utils_graph import adelete_by_relation
 
-        return await adelete_by_relation(
+        result = await adelete_by_relation(
             self.chunk_entity_relation_graph,
             self.relationships_vdb,
             source_entity,
             target_entity,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def delete_by_relation(
         self, source_entity: str, target_entity: str
@@ -3687,7 +4080,7 @@ class AlightRAG:
         """
         from alightrag.utils_graph import aedit_entity
 
-        return await aedit_entity(
+        result = await aedit_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3698,6 +4091,9 @@ class AlightRAG:
             self.entity_chunks,
             self.relation_chunks,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def edit_entity(
         self,
@@ -3729,7 +4125,7 @@ class AlightRAG:
         """
         from alightrag.utils_graph import aedit_relation
 
-        return await aedit_relation(
+        result = await aedit_relation(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3738,6 +4134,9 @@ class AlightRAG:
             updated_data,
             self.relation_chunks,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def edit_relation(
         self, source_entity: str, target_entity: str, updated_data: dict[str, Any]
@@ -3763,13 +4162,16 @@ class AlightRAG:
         """
         from alightrag.utils_graph import acreate_entity
 
-        return await acreate_entity(
+        result = await acreate_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
             entity_data,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def create_entity(
         self, entity_name: str, entity_data: dict[str, Any]
@@ -3794,7 +4196,7 @@ class AlightRAG:
         """
         from alightrag.utils_graph import acreate_relation
 
-        return await acreate_relation(
+        result = await acreate_relation(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3802,6 +4204,9 @@ class AlightRAG:
             target_entity,
             relation_data,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def create_relation(
         self, source_entity: str, target_entity: str, relation_data: dict[str, Any]
@@ -3840,7 +4245,7 @@ class AlightRAG:
         """
         from alightrag.utils_graph import amerge_entities
 
-        return await amerge_entities(
+        result = await amerge_entities(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3851,6 +4256,9 @@ class AlightRAG:
             self.entity_chunks,
             self.relation_chunks,
         )
+        await bump_kg_version(self.llm_response_cache)
+        await self.llm_response_cache.index_done_callback()
+        return result
 
     def merge_entities(
         self,
@@ -53,7 +53,12 @@ from alightrag.api.routers.query_routes import create_query_routes
 from alightrag.api.routers.graph_routes import create_graph_routes
 from alightrag.api.routers.ollama_api import OllamaAPI
 
-from alightrag.utils import logger, set_verbose_debug
+from alightrag.utils import (
+    logger,
+    set_verbose_debug,
+    EventLoopLagMonitor,
+    get_cpu_executor_info,
+)
 from alightrag.kg.shared_storage import (
     get_namespace_data,
     initialize_pipeline_status,
@@ -342,11 +347,15 @@ def create_app(args):
     # Initialize document manager with workspace support for data isolation
     doc_manager = DocumentManager(args.input_dir, workspace=args.workspace)
 
+    # Tracks how long request handling is held up by work blocking the event loop
+    loop_lag_monitor = EventLoopLagMonitor()
+
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Lifespan context manager for startup and shutdown events"""
         # Store background tasks
         app.state.background_tasks = set()
+        loop_lag_monitor.start()
 
         try:
             # Initialize database connections
@@ -361,6 +370,8 @@ def create_app(args):
             yield
 
         finally:
+            await loop_lag_monitor.stop()
+
             # Clean up database connections
             await rag.finalize_storages()
 
@@ -1048,6 +1059,8 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                "event_loop_lag": loop_lag_monitor.get_stats(),
+                "cpu_executor": get_cpu_executor_info(),
                 "core_version": core_version,
                 "api_version": api_version_display,
                 "webui_title": webui_title,
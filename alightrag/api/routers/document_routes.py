@@ -3,8 +3,12 @@ This module contains all document-related routes for the AlightRAG API.
 """
 
 import asyncio
+import json
+import os
+from collections import Counter
 from functools import lru_cache
-from alightrag.utils import logger, get_pinyin_sort_key
+from hashlib import md5
+from alightrag.utils import logger, get_pinyin_sort_key, load_json
 import aiofiles
 import shutil
 import traceback
@@ -732,6 +736,11 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        chunks_extracted: Number of chunks extracted in the current job
+        chunks_per_minute: Chunk extraction throughput over the last minute
+        stages: Queue depth, workers and latency of the chunk, extract, merge and persist stages
+        bulk_merge_conflicts: Bulk merges in the current job that re-merged entities or
+            relations changed by a concurrent merge
     """
 
     autoscanned: bool = False
@@ -745,6 +754,10 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    chunks_extracted: int = 0
+    chunks_per_minute: float = 0.0
+    stages: Optional[dict] = None
+    bulk_merge_conflicts: int = 0
 
     @field_validator("job_start", mode="before")
     @classmethod
@@ -757,6 +770,9 @@ class PipelineStatusResponse(BaseModel):
 
 
 class DocumentManager:
+    # Files handled by earlier scans, persisted in the input directory
+    MANIFEST_FILENAME = ".scan_manifest.json"
+
     def __init__(
         self,
         input_dir: str,
@@ -817,16 +833,119 @@ class DocumentManager:
         # Create input directory if it doesn't exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
 
+        # Manifest of handled files: file name -> {size, mtime_ns, content_hash}
+        self.manifest_path = self.input_dir / self.MANIFEST_FILENAME
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._manifest_dirty = False
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return load_json(str(self.manifest_path)) or {}
+        except Exception as e:
+            logger.warning(
+                f"Ignoring unreadable scan manifest {self.manifest_path}: {e}"
+            )
+            return {}
+
+    def save_manifest(self):
+        """Persist the scan manifest if it changed since the last save"""
+        if not self._manifest_dirty:
+            return
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_dirty = False
+
+    @staticmethod
+    def _content_hash(file_path: str) -> str:
+        digest = md5()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
     def scan_directory_for_new_files(self) -> List[Path]:
-        """Scan input directory for new files"""
+        """Scan input directory for new or changed files
+
+        The directory is listed once. Files recorded in the manifest with the same size
+        and mtime are skipped without being read; files whose size matches but mtime
+        changed are hashed and skipped if their content is unchanged. Manifest entries
+        of files no longer in the directory are dropped.
+        """
+        extensions = tuple(ext.lower() for ext in self.supported_extensions)
         new_files = []
-        for ext in self.supported_extensions:
-            logger.debug(f"Scanning for {ext} files in {self.input_dir}")
-            for file_path in self.input_dir.glob(f"*{ext}"):
-                if file_path not in self.indexed_files:
-                    new_files.append(file_path)
+        seen = set()
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name == self.MANIFEST_FILENAME
+                    or not name.lower().endswith(extensions)
+                    or not entry.is_file()
+                ):
+                    continue
+                seen.add(name)
+                if self.indexed_files and Path(entry.path) in self.indexed_files:
+                    continue
+                known = self.manifest.get(name)
+                if known is not None:
+                    stat = entry.stat()
+                    if known["size"] == stat.st_size:
+                        if known["mtime_ns"] == stat.st_mtime_ns:
+                            continue
+                        try:
+                            content_hash = self._content_hash(entry.path)
+                        except OSError:
+                            content_hash = None
+                        if content_hash == known["content_hash"]:
+                            known["mtime_ns"] = stat.st_mtime_ns
+                            self._manifest_dirty = True
+                            continue
+                new_files.append(Path(entry.path))
+
+        removed = self.manifest.keys() - seen
+        if removed:
+            for name in removed:
+                del self.manifest[name]
+            self._manifest_dirty = True
+        logger.debug(
+            f"Scanned {len(seen)} supported files in {self.input_dir}, "
+            f"{len(new_files)} new or changed"
+        )
         return new_files
 
+    def record_scanned_files(self, file_paths: List[Path]):
+        """Record handled files in the manifest so later scans skip them while unchanged
+
+        Files that are no longer in the input directory (moved to __enqueued__) are
+        dropped from the manifest instead.
+        """
+        for file_path in file_paths:
+            try:
+                content_hash = self._content_hash(str(file_path))
+                stat = file_path.stat()
+            except OSError:
+                self.manifest.pop(file_path.name, None)
+            else:
+                self.manifest[file_path.name] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "content_hash": content_hash,
+                }
+            self._manifest_dirty = True
+
+    def forget_file(self, file_name: str):
+        """Drop a file from the manifest so that the next scan indexes it again"""
+        if self.manifest.pop(Path(file_name).name, None) is not None:
+            self._manifest_dirty = True
+
+    def clear_manifest(self):
+        """Forget all recorded files, used when the input directory is cleared"""
+        self.manifest = {}
+        self._manifest_dirty = True
+        self.save_manifest()
+
     def mark_as_indexed(self, file_path: Path):
         self.indexed_files.add(file_path)
 
@@ -1510,31 +1629,89 @@ async def pipeline_index_file(rag: AlightRAG, file_path: Path, track_id: str = N
         logger.error(traceback.format_exc())
 
 
+def _batch_files_by_content(
+    file_paths: List[Path], batch_size: int
+) -> List[List[Path]]:
+    """Split files into batches of at most batch_size files
+
+    A file with the same content as a file of the current batch goes into a later
+    batch, so that it is enqueued after that file and ignored as a duplicate, instead
+    of both passing the doc_status check in parallel. Only files whose size matches
+    another file are hashed to compare their content.
+    """
+    sizes: Dict[Path, int] = {}
+    for file_path in file_paths:
+        try:
+            sizes[file_path] = file_path.stat().st_size
+        except OSError:
+            pass
+    size_counts = Counter(sizes.values())
+
+    batches: List[List[Path]] = []
+    last_batch_of_content: Dict[str, int] = {}
+    for file_path in file_paths:
+        content_key = str(file_path)
+        if size_counts[sizes.get(file_path)] > 1:
+            try:
+                content_key = DocumentManager._content_hash(str(file_path))
+            except OSError:
+                pass
+        index = last_batch_of_content.get(content_key, -1) + 1
+        while index < len(batches) and len(batches[index]) >= batch_size:
+            index += 1
+        if index == len(batches):
+            batches.append([])
+        batches[index].append(file_path)
+        last_batch_of_content[content_key] = index
+    return batches
+
+
 async def pipeline_index_files(
-    rag: AlightRAG, file_paths: List[Path], track_id: str = None
+    rag: AlightRAG,
+    file_paths: List[Path],
+    track_id: str = None,
+    doc_manager: Optional[DocumentManager] = None,
 ):
-    """Index multiple files sequentially to avoid high CPU load
+    """Index multiple files, enqueuing them in bounded parallel batches
+
+    At most MAX_PARALLEL_ENQUEUE_FILES files are read and enqueued at a time to avoid
+    high CPU load.
 
     Args:
         rag: AlightRAG instance
         file_paths: Paths to the files to index
         track_id: Optional tracking ID to pass to all files
+        doc_manager: Optional DocumentManager recording enqueued files in its manifest
     """
     if not file_paths:
         return
     try:
         enqueued = False
+        batch_size = max(1, global_args.max_parallel_enqueue_files)
 
         # Use get_pinyin_sort_key for Chinese pinyin sorting
         sorted_file_paths = sorted(
             file_paths, key=lambda p: get_pinyin_sort_key(str(p))
         )
 
-        # Process files sequentially with track_id
-        for file_path in sorted_file_paths:
-            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
-            if success:
+        batches = await asyncio.to_thread(
+            _batch_files_by_content, sorted_file_paths, batch_size
+        )
+
+        # Process files in batches with track_id
+        for batch in batches:
+            results = await asyncio.gather(
+                *(pipeline_enqueue_file(rag, path, track_id) for path in batch)
+            )
+            succeeded = [path for path, (success, _) in zip(batch, results) if success]
+            if succeeded:
                 enqueued = True
+                if doc_manager is not None:
+                    await asyncio.to_thread(doc_manager.record_scanned_files, succeeded)
+
+        # Save the manifest before the potentially long document processing
+        if doc_manager is not None:
+            await asyncio.to_thread(doc_manager.save_manifest)
 
         # Process the queue only if at least one file was successfully enqueued
         if enqueued:
@@ -1583,7 +1760,7 @@ async def run_scanning_process(
         track_id: Optional tracking ID to pass to all scanned files
     """
     try:
-        new_files = doc_manager.scan_directory_for_new_files()
+        new_files = await asyncio.to_thread(doc_manager.scan_directory_for_new_files)
         total_files = len(new_files)
         logger.info(f"Found {total_files} files to index.")
 
@@ -1604,9 +1781,16 @@ async def run_scanning_process(
                     # File is new or in non-PROCESSED status, add to processing list
                     valid_files.append(file_path)
 
+            # Remember processed files so later scans skip them without a lookup
+            if processed_files:
+                await asyncio.to_thread(
+                    doc_manager.record_scanned_files,
+                    [doc_manager.input_dir / name for name in processed_files],
+                )
+
             # Process valid files (new files + non-PROCESSED status files)
             if valid_files:
-                await pipeline_index_files(rag, valid_files, track_id)
+                await pipeline_index_files(rag, valid_files, track_id, doc_manager)
                 if processed_files:
                     logger.info(
                         f"Scanning process completed: {len(valid_files)} files Processed {len(processed_files)} skipped."
@@ -1629,6 +1813,11 @@ async def run_scanning_process(
     except Exception as e:
         logger.error(f"Error during scanning process: {str(e)}")
         logger.error(traceback.format_exc())
+    finally:
+        try:
+            await asyncio.to_thread(doc_manager.save_manifest)
+        except Exception as e:
+            logger.error(f"Error saving scan manifest: {str(e)}")
 
 
 async def background_delete_documents(
@@ -1715,6 +1904,10 @@ async def background_delete_documents(
                     async with pipeline_status_lock:
                         pipeline_status["history_messages"].append(success_msg)
 
+                    # An input file that is kept is indexed again by the next scan
+                    if result.file_path:
+                        doc_manager.forget_file(result.file_path)
+
                     # Handle file deletion if requested and file_path is available
                     if (
                         delete_file
@@ -1851,6 +2044,11 @@ async def background_delete_documents(
         async with pipeline_status_lock:
             pipeline_status["history_messages"].append(error_msg)
     finally:
+        try:
+            await asyncio.to_thread(doc_manager.save_manifest)
+        except Exception as e:
+            logger.error(f"Error saving scan manifest: {str(e)}")
+
         # Final summary and check for pending requests
         async with pipeline_status_lock:
             pipeline_status["busy"] = False
@@ -2247,6 +2445,9 @@ def create_document_routes(
             file_errors_count = 0
 
             for file_path in doc_manager.input_dir.glob("*"):
+                # The scan manifest is reset below instead of being deleted
+                if file_path.name.startswith(doc_manager.MANIFEST_FILENAME):
+                    continue
                 if file_path.is_file():
                     try:
                         file_path.unlink()
@@ -2255,6 +2456,12 @@ def create_document_routes(
                         logger.error(f"Error deleting file {file_path}: {str(e)}")
                         file_errors_count += 1
 
+            try:
+                await asyncio.to_thread(doc_manager.clear_manifest)
+            except Exception as e:
+                logger.error(f"Error resetting scan manifest: {str(e)}")
+                errors.append("Failed to reset scan manifest")
+
             # Log file deletion results
             if "history_messages" in pipeline_status:
                 if file_errors_count > 0:
@@ -2321,6 +2528,9 @@ def create_document_routes(
                 - cur_batch (int): Current processing batch
                 - request_pending (bool): Flag for pending request for processing
                 - latest_message (str): Latest message from pipeline processing
+                - stages (dict, optional): Per-stage statistics (chunk, extract, merge, persist) with
+                  concurrency, active workers, queue_depth/queue_size, completed items and
+                  wait/latency in milliseconds
                 - history_messages (List[str], optional): List of history messages (limited to latest 1000 entries,
                   with truncation message if more than 1000 messages exist)
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
+import numpy as np
 from typing import (
     Any,
     Literal,
@@ -169,6 +171,15 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    enable_speculation: bool = (
+        os.getenv("ALIGHTRAG_SPECULATIVE", "false").lower() == "true"
+    )
+    """Enable speculative execution in "alightrag" mode.
+    Token truncation and chunk merging for the accumulated search result are started
+    while the reasoning/reflection LLM calls are still running, and cancelled when the
+    loop continues with another iteration. Answers are identical to the sequential pipeline.
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -234,6 +245,57 @@ class BaseVectorStorage(StorageNameSpace, ABC):
                            If provided, skips embedding computation for better performance.
         """
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Query the vector storage with several queries at once.
+
+        Query texts without a pre-computed embedding are embedded with a single
+        embedding call. The default implementation then runs one `query` per
+        embedding; storages that can search many vectors in one pass should
+        override it with a single batch search.
+
+        Args:
+            queries: The query strings to search for
+            top_k: Number of top results to return for each query
+            query_embeddings: Optional pre-computed embeddings, one per query
+
+        Returns:
+            One result list per query, in the order of `queries` and in the
+            same format as `query`
+        """
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        return list(
+            await asyncio.gather(
+                *(
+                    self.query(query, top_k, query_embedding=embedding)
+                    for query, embedding in zip(queries, embeddings)
+                )
+            )
+        )
+
+    async def _embed_queries(
+        self,
+        queries: list[str],
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[float]]:
+        """Return one embedding per query, embedding all texts in one call"""
+        if query_embeddings is not None:
+            if len(query_embeddings) != len(queries):
+                raise ValueError(
+                    f"Got {len(query_embeddings)} query embeddings for {len(queries)} queries"
+                )
+            return list(query_embeddings)
+        if not queries:
+            return []
+        embeddings = await self.embedding_func(
+            queries, _priority=5
+        )  # higher priority for query
+        return list(embeddings)
+
     @abstractmethod
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """Insert or update vectors in the storage.
@@ -314,6 +376,31 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    async def get_vectors_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs stacked into a single float32 matrix
+
+        The default implementation stacks the result of get_vectors_by_ids.
+        Storages that keep vectors in memory should override it to gather the
+        rows without going through Python lists.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Tuple of (found_ids, matrix) where matrix has shape (len(found_ids), dim)
+            and row i holds the vector of found_ids[i]. IDs that are not found
+            are skipped.
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [id for id in ids if id in vectors]
+        if not found_ids:
+            dim = self.embedding_func.embedding_dim
+            return [], np.empty((0, dim), dtype=np.float32)
+        matrix = np.asarray([vectors[id] for id in found_ids], dtype=np.float32)
+        return found_ids, matrix
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
@@ -559,6 +646,36 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple nodes
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges, whose nodes must already exist
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -17,6 +17,8 @@ DEFAULT_ENTITY_NAME_MAX_LENGTH = 256
 
 # Number of description fragments to trigger LLM summary
 DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE = 8
+# Merge a document's entities and relations with batched storage reads and writes
+DEFAULT_ENABLE_BULK_MERGE = True
 # Max description token size to trigger LLM summary
 DEFAULT_SUMMARY_MAX_TOKENS = 1200
 # Recommended LLM summary output length in tokens
@@ -86,10 +88,39 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+DEFAULT_MAX_PARALLEL_ENQUEUE_FILES = 4  # Scanned files read and enqueued at a time
+DEFAULT_MAX_PARALLEL_EXTRACT = 16  # Documents chunked and extracted at a time, sharing one chunk queue
+DEFAULT_MAX_PARALLEL_CHUNK = 4  # Documents being split into chunks at a time
+DEFAULT_MAX_PARALLEL_PERSIST = 1  # Documents persisted (status update and storage flush) at a time
+DEFAULT_PIPELINE_QUEUE_SIZE = 8  # Documents (chunk batches for extraction) queued in front of each pipeline stage
+DEFAULT_ENABLE_GROUP_COMMIT = True  # Persist processed documents in groups instead of per document
+DEFAULT_GROUP_COMMIT_INTERVAL = 10.0  # Seconds after which an open commit group is persisted
+DEFAULT_GROUP_COMMIT_BYTES = 16 * 1024 * 1024  # Document content size that triggers a group commit
+DEFAULT_CHUNK_STREAM_BATCH_SIZE = 16  # Chunks handed to entity extraction at a time while chunking
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+DEFAULT_EMBEDDING_COALESCE_WAIT = 0.005  # Seconds to gather small embedding requests into a batch
+
+# CPU executor for tokenization and extraction parsing (keeps the event loop responsive)
+CPU_EXECUTOR_NONE = "none"  # Run CPU-bound work inline on the event loop
+CPU_EXECUTOR_THREAD = "thread"  # Thread pool (tiktoken releases the GIL while encoding)
+CPU_EXECUTOR_PROCESS = "process"  # Process pool with a warm tokenizer per worker
+VALID_CPU_EXECUTOR_MODES = {CPU_EXECUTOR_NONE, CPU_EXECUTOR_THREAD, CPU_EXECUTOR_PROCESS}
+DEFAULT_CPU_EXECUTOR = CPU_EXECUTOR_THREAD
+DEFAULT_CPU_EXECUTOR_WORKERS = 4
+DEFAULT_CPU_OFFLOAD_MIN_CHARS = 4096  # Smaller batches run inline, dispatch would cost more
+
+# Event loop lag monitoring defaults
+DEFAULT_EVENT_LOOP_LAG_INTERVAL = 0.1  # Seconds between lag probes
+DEFAULT_EVENT_LOOP_LAG_WINDOW = 600  # Number of recent probes kept for statistics
+
+# Shared HTTP client pool defaults for the LLM, embedding and rerank bindings
+DEFAULT_HTTP_MAX_CONNECTIONS = 100  # Per pooled client
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection stays open
+DEFAULT_HTTP2_ENABLED = False  # HTTP/2 for httpx based clients, needs the h2 package
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
@@ -21,6 +21,7 @@ STORAGE_IMPLEMENTATIONS = {
     "VECTOR_STORAGE": {
         "implementations": [
             "NanoVectorDBStorage",
+            "NumpyVectorDBStorage",
             "MilvusVectorDBStorage",
             "PGVectorStorage",
             "FaissVectorDBStorage",
@@ -71,6 +72,7 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     ],
     # Vector Storage Implementations
     "NanoVectorDBStorage": [],
+    "NumpyVectorDBStorage": [],
     "MilvusVectorDBStorage": [
         "MILVUS_URI",
         "MILVUS_DB_NAME",
@@ -98,6 +100,7 @@ STORAGES = {
     "NetworkXStorage": ".kg.networkx_impl",
     "JsonKVStorage": ".kg.json_kv_impl",
     "NanoVectorDBStorage": ".kg.nano_vector_db_impl",
+    "NumpyVectorDBStorage": ".kg.numpy_vector_db_impl",
     "JsonDocStatusStorage": ".kg.json_doc_status_impl",
     "Neo4JStorage": ".kg.neo4j_impl",
     "MilvusVectorDBStorage": ".kg.milvus_impl",
@@ -18,6 +18,19 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Supported Faiss index layouts
+FAISS_INDEX_TYPES = ("flat", "ivf", "hnsw")
+# Faiss recommends at least 39 training points per IVF list
+IVF_MIN_POINTS_PER_LIST = 39
+# Fraction of tombstoned vectors that triggers an HNSW rebuild
+HNSW_REBUILD_DELETED_RATIO = 0.2
+# On-disk dtypes supported for the flat vector file
+FAISS_VECTOR_DTYPES = ("float32", "float16")
+# Version tag of the columnar metadata file
+FAISS_META_FORMAT_VERSION = 2
+# Rows copied from the memory-mapped vector file into Faiss per step
+FAISS_LOAD_CHUNK_ROWS = 65536
+
 
 @final
 @dataclass
@@ -25,6 +38,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for AlightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    Vectors are stored under stable int64 Faiss IDs and a custom ID -> Faiss ID dict is
+    kept alongside the metadata, so upsert, lookup and delete cost O(batch).
+    Index layouts (`faiss_index_type` in vector_db_storage_cls_kwargs or FAISS_INDEX_TYPE):
+    - flat: exact search, IndexIDMap2 over IndexFlatIP (default)
+    - ivf: IndexIVFFlat, trained once the collection holds enough vectors (exact flat search before that)
+    - hnsw: IndexIDMap2 over IndexHNSWFlat, deletions are tombstoned until the next rebuild
+
+    Persistence: flat indexes are written as a contiguous `.vectors.npy` matrix (float32 or
+    float16, `faiss_vector_dtype` / FAISS_VECTOR_DTYPE) that is memory-mapped on load, while
+    trained IVF/HNSW indexes use the native Faiss index file. Metadata is stored column-wise in
+    `.meta.columns.json` without vectors. Legacy `.meta.json` files are migrated on the next save.
     """
 
     def __post_init__(self):
@@ -54,20 +79,41 @@ class FaissVectorDBStorage(BaseVectorStorage):
         self._faiss_index_file = os.path.join(
             workspace_dir, f"faiss_index_{self.namespace}.index"
         )
+        # Legacy metadata file with one dict (including the vector) per Faiss ID
         self._meta_file = self._faiss_index_file + ".meta.json"
+        self._meta_columns_file = self._faiss_index_file + ".meta.columns.json"
+        self._vectors_file = self._faiss_index_file + ".vectors.npy"
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
+        self._index_type = str(
+            kwargs.get("faiss_index_type", os.getenv("FAISS_INDEX_TYPE", "flat"))
+        ).lower()
+        if self._index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported faiss_index_type '{self._index_type}', expected one of {FAISS_INDEX_TYPES}"
+            )
+        self._ivf_nlist = int(
+            kwargs.get("faiss_ivf_nlist", os.getenv("FAISS_IVF_NLIST", 1024))
+        )
+        self._ivf_nprobe = int(
+            kwargs.get("faiss_ivf_nprobe", os.getenv("FAISS_IVF_NPROBE", 16))
+        )
+        self._hnsw_m = int(kwargs.get("faiss_hnsw_m", os.getenv("FAISS_HNSW_M", 32)))
+        self._hnsw_ef_search = int(
+            kwargs.get("faiss_hnsw_ef_search", os.getenv("FAISS_HNSW_EF_SEARCH", 64))
+        )
+        self._vector_dtype = str(
+            kwargs.get("faiss_vector_dtype", os.getenv("FAISS_VECTOR_DTYPE", "float32"))
+        ).lower()
+        if self._vector_dtype not in FAISS_VECTOR_DTYPES:
+            raise ValueError(
+                f"Unsupported faiss_vector_dtype '{self._vector_dtype}', expected one of {FAISS_VECTOR_DTYPES}"
+            )
 
+        self._reset_index()
         self._load_faiss_index()
 
     async def initialize(self):
@@ -87,8 +133,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -153,8 +198,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 1. Identify which vectors to remove if they exist
         # 2. Remove them
         # 3. Add the new vectors
+        await self._get_index()
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -162,17 +208,20 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
-        index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        # Step 2: Add new vectors under fresh, stable Faiss IDs
+        async with self._storage_lock:
+            fids = np.arange(
+                self._next_fid, self._next_fid + len(list_data), dtype=np.int64
+            )
+            self._next_fid += len(list_data)
+            self._index.add_with_ids(embeddings, fids)
+
+            # Step 3: Store metadata for each new ID, vectors live in the index only
+            for fid, meta in zip(fids.tolist(), list_data):
+                self._id_to_meta[fid] = meta
+                self._custom_id_to_fid[meta["__id__"]] = fid
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+            self._maybe_train_ivf()
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -195,37 +244,61 @@ class FaissVectorDBStorage(BaseVectorStorage):
             embedding = np.array(embedding, dtype=np.float32)
 
         faiss.normalize_L2(embedding)  # we do in-place normalization
-
-        # Perform the similarity search
+        return (await self._search(embedding, top_k))[0]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search all queries with a single multi-row `index.search` call"""
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        if not embeddings:
+            return []
+        embedding = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embedding)
+        return await self._search(embedding, top_k)
+
+    async def _search(
+        self, embeddings: np.ndarray, top_k: int
+    ) -> list[list[dict[str, Any]]]:
+        """Search normalized query rows, returning one result list per row"""
+        # Perform the similarity search, over-fetching to skip tombstoned HNSW entries
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
-
-        distances = distances[0]
-        indices = indices[0]
-
-        results = []
-        for dist, idx in zip(distances, indices):
-            if idx == -1:
-                # Faiss returns -1 if no neighbor
-                continue
-
-            # Cosine similarity threshold
-            if dist < self.cosine_better_than_threshold:
-                continue
-
-            meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
-            results.append(
-                {
-                    **filtered_meta,
-                    "id": meta.get("__id__"),
-                    "distance": float(dist),
-                    "created_at": meta.get("__created_at__"),
-                }
-            )
+        search_k = min(top_k + len(self._deleted_fids), index.ntotal)
+        if search_k <= 0:
+            return [[] for _ in range(len(embeddings))]
+        all_distances, all_indices = index.search(embeddings, search_k)
+
+        batch_results = []
+        for distances, indices in zip(all_distances, all_indices):
+            results = []
+            for dist, idx in zip(distances, indices):
+                if idx == -1:
+                    # Faiss returns -1 if no neighbor
+                    continue
+                if idx in self._deleted_fids:
+                    continue
+                if len(results) >= top_k:
+                    break
+
+                # Cosine similarity threshold
+                if dist < self.cosine_better_than_threshold:
+                    continue
+
+                meta = self._id_to_meta.get(idx, {})
+                results.append(
+                    {
+                        **meta,
+                        "id": meta.get("__id__"),
+                        "distance": float(dist),
+                        "created_at": meta.get("__created_at__"),
+                    }
+                )
+            batch_results.append(results)
 
-        return results
+        return batch_results
 
     @property
     def client_storage(self):
@@ -295,79 +368,277 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _create_index(self, index_type: str):
+        """Create an empty Faiss index that supports add_with_ids."""
+        if index_type == "hnsw":
+            base = faiss.IndexHNSWFlat(
+                self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            base.hnsw.efSearch = self._hnsw_ef_search
+            return faiss.IndexIDMap2(base)
+        # IVF collections start as an exact flat index until enough vectors exist to train
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _reset_index(self):
+        """Reset the index and all in-memory lookup structures."""
+        self._index = self._create_index(self._index_type)
+        # Maps <int faiss_id> → metadata (including your original ID).
+        self._id_to_meta = {}
+        # Maps <custom id> → <int faiss_id>
+        self._custom_id_to_fid = {}
+        # Next Faiss ID to assign; IDs are never reused
+        self._next_fid = 0
+        # Faiss IDs removed from an HNSW index but still present in the graph
+        self._deleted_fids = set()
+
+    def _live_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return (faiss_ids, vectors) of all live entries, reconstructed from the index."""
+        fids = np.array(sorted(self._id_to_meta), dtype=np.int64)
+        if len(fids) == 0:
+            return fids, np.empty((0, self._dim), dtype=np.float32)
+        return fids, self._index.reconstruct_batch(fids)
+
+    def _rebuild_index(self, index_type: str):
+        """Rebuild the index from its live vectors, dropping tombstones."""
+        fids, vectors = self._live_vectors()
+        if index_type == "ivf":
+            quantizer = faiss.IndexFlatIP(self._dim)
+            index = faiss.IndexIVFFlat(
+                quantizer, self._dim, self._ivf_nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(vectors)
+            # Hashtable direct map keeps reconstruct() and remove_ids() available
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            index.nprobe = self._ivf_nprobe
+        else:
+            index = self._create_index(index_type)
+        if len(fids):
+            index.add_with_ids(vectors, fids)
+        self._index = index
+        self._deleted_fids = set()
+
+    def _is_trained_ivf(self) -> bool:
+        return isinstance(self._index, faiss.IndexIVF)
+
+    def _maybe_train_ivf(self):
+        """Switch an IVF collection from flat to a trained IVF index once it is large enough."""
+        if self._index_type != "ivf" or self._is_trained_ivf():
+            return
+        if len(self._id_to_meta) < self._ivf_nlist * IVF_MIN_POINTS_PER_LIST:
+            return
+        logger.info(
+            f"[{self.workspace}] Training IVF index ({self._ivf_nlist} lists) for {self.namespace} with {len(self._id_to_meta)} vectors"
+        )
+        self._rebuild_index("ivf")
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Flat and IVF indexes remove the vectors in place; HNSW does not support
+        removals, so the IDs are tombstoned and the graph is rebuilt once too many
+        of its entries are stale.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+            fids = [fid for fid in dict.fromkeys(fid_list) if fid in self._id_to_meta]
+            if not fids:
+                return
+            for fid in fids:
+                meta = self._id_to_meta.pop(fid)
+                if self._custom_id_to_fid.get(meta.get("__id__")) == fid:
+                    del self._custom_id_to_fid[meta["__id__"]]
+
+            if self._index_type == "hnsw":
+                self._deleted_fids.update(fids)
+                if (
+                    len(self._deleted_fids)
+                    > self._index.ntotal * HNSW_REBUILD_DELETED_RATIO
+                ):
+                    self._rebuild_index("hnsw")
+            else:
+                self._index.remove_ids(np.array(fids, dtype=np.int64))
+
+    def _is_flat_index(self) -> bool:
+        """Whether the current index is an ID-mapped exact index whose vectors fit the flat file."""
+        return isinstance(self._index, faiss.IndexIDMap2) and isinstance(
+            faiss.downcast_index(self._index.index), faiss.IndexFlat
+        )
 
-            self._id_to_meta = new_id_to_meta
+    @staticmethod
+    def _remove_file(path: str):
+        if os.path.exists(path):
+            os.remove(path)
 
     def _save_faiss_index(self):
         """
         Save the current Faiss index + metadata to disk so it can persist across runs.
         """
-        faiss.write_index(self._index, self._faiss_index_file)
+        if self._deleted_fids:
+            # Persist HNSW graphs without tombstones
+            self._rebuild_index(self._index_type)
+
+        # Both files are written to temporary files first and replaced afterwards, so
+        # a crash never leaves a partially written file behind. The metadata records
+        # the size of the data file it belongs to, which is checked when loading.
+        fids, vectors = self._live_vectors()
+        if self._is_flat_index():
+            # A flat index is nothing but its vectors: keep them in one contiguous matrix
+            data_file, stale_file = self._vectors_file, self._faiss_index_file
+            with open(data_file + ".tmp", "wb") as f:
+                np.save(f, vectors.astype(self._vector_dtype, copy=False))
+        else:
+            data_file, stale_file = self._faiss_index_file, self._vectors_file
+            faiss.write_index(self._index, data_file + ".tmp")
+
+        # Metadata is stored column-wise, rows aligned with the saved vector matrix.
+        # Rows lacking a field are listed separately to keep explicit None values.
+        metas = [self._id_to_meta[fid] for fid in fids.tolist()]
+        fields = sorted({k for meta in metas for k in meta})
+        columns = {field: [meta.get(field) for meta in metas] for field in fields}
+        absent = {
+            field: [row for row, meta in enumerate(metas) if field not in meta]
+            for field in fields
+        }
+        with open(self._meta_columns_file + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": FAISS_META_FORMAT_VERSION,
+                    "dim": self._dim,
+                    "data_file": os.path.basename(data_file),
+                    "data_size": os.path.getsize(data_file + ".tmp"),
+                    "fids": fids.tolist(),
+                    "columns": columns,
+                    "absent": {field: rows for field, rows in absent.items() if rows},
+                },
+                f,
+                ensure_ascii=False,
+            )
 
-        # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
-        # We'll keep the int -> dict, but JSON requires string keys.
-        serializable_dict = {}
-        for fid, meta in self._id_to_meta.items():
-            serializable_dict[str(fid)] = meta
+        os.replace(data_file + ".tmp", data_file)
+        os.replace(self._meta_columns_file + ".tmp", self._meta_columns_file)
+        self._remove_file(stale_file)
+        self._remove_file(self._meta_file)
 
-        with open(self._meta_file, "w", encoding="utf-8") as f:
-            json.dump(serializable_dict, f)
+    def _load_metadata(self) -> tuple[dict[int, dict[str, Any]], str | None]:
+        """
+        Load metadata from the columnar file, or from a legacy per-ID JSON file.
+
+        Returns the metadata by Faiss ID and the data file it was saved with, if known.
+        """
+        if os.path.exists(self._meta_columns_file):
+            with open(self._meta_columns_file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if "data_file" in stored:
+                data_file = os.path.join(
+                    os.path.dirname(self._meta_columns_file), stored["data_file"]
+                )
+                if (
+                    not os.path.exists(data_file)
+                    or os.path.getsize(data_file) != stored["data_size"]
+                ):
+                    raise ValueError(
+                        f"{data_file} does not match its metadata (interrupted save)"
+                    )
+            else:
+                data_file = None
+            columns = stored["columns"]
+            if stored.get("version", 1) < 2:
+                # Version 1 wrote None for absent fields
+                absent = {
+                    field: {row for row, value in enumerate(values) if value is None}
+                    for field, values in columns.items()
+                }
+            else:
+                absent = {
+                    field: set(rows) for field, rows in stored.get("absent", {}).items()
+                }
+            id_to_meta = {}
+            for row, fid in enumerate(stored["fids"]):
+                id_to_meta[fid] = {
+                    field: values[row]
+                    for field, values in columns.items()
+                    if row not in absent.get(field, ())
+                }
+            return id_to_meta, data_file
+
+        with open(self._meta_file, "r", encoding="utf-8") as f:
+            stored_dict = json.load(f)
+        # Convert string keys back to int and drop the embedded vectors
+        id_to_meta = {}
+        for fid_str, meta in stored_dict.items():
+            meta.pop("__vector__", None)
+            id_to_meta[int(fid_str)] = meta
+        return id_to_meta, None
+
+    def _load_flat_vectors(self, fids: np.ndarray):
+        """Build a flat index from the memory-mapped vector file."""
+        vectors = np.load(self._vectors_file, mmap_mode="r")
+        if vectors.shape != (len(fids), self._dim):
+            raise ValueError(
+                f"Vector file shape {vectors.shape} does not match {len(fids)} ids of dim {self._dim}"
+            )
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+        for start in range(0, len(fids), FAISS_LOAD_CHUNK_ROWS):
+            end = start + FAISS_LOAD_CHUNK_ROWS
+            index.add_with_ids(
+                np.ascontiguousarray(vectors[start:end], dtype=np.float32),
+                fids[start:end],
+            )
+        return index
 
     def _load_faiss_index(self):
         """
         Load the Faiss index + metadata from disk if it exists,
         and rebuild in-memory structures so we can query.
         """
-        if not os.path.exists(self._faiss_index_file):
+        has_vectors = os.path.exists(self._vectors_file)
+        if not has_vectors and not os.path.exists(self._faiss_index_file):
             logger.warning(
                 f"[{self.workspace}] No existing Faiss index file found for {self.namespace}"
             )
             return
 
         try:
-            # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
             # Load metadata
-            with open(self._meta_file, "r", encoding="utf-8") as f:
-                stored_dict = json.load(f)
-
-            # Convert string keys back to int
-            self._id_to_meta = {}
-            for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+            self._id_to_meta, data_file = self._load_metadata()
+            if data_file is not None:
+                # Ignore a stale file of the other layout left by an interrupted save
+                has_vectors = data_file == self._vectors_file
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+            }
+            self._next_fid = max(self._id_to_meta, default=-1) + 1
+            self._deleted_fids = set()
+
+            # Load the vectors / Faiss index
+            if has_vectors:
+                fids = np.array(list(self._id_to_meta), dtype=np.int64)
+                index = self._load_flat_vectors(fids)
+            else:
+                index = faiss.read_index(self._faiss_index_file)
+
+            if isinstance(index, faiss.IndexIVF):
+                index.nprobe = self._ivf_nprobe
+            elif not isinstance(index, faiss.IndexIDMap2):
+                # Legacy IndexFlatIP files use positional IDs 0..n-1
+                vectors = index.reconstruct_n(0, index.ntotal)
+                index = faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+                index.add_with_ids(
+                    vectors, np.arange(len(vectors), dtype=np.int64)
+                )
+            else:
+                base = faiss.downcast_index(index.index)
+                if isinstance(base, faiss.IndexHNSW):
+                    base.hnsw.efSearch = self._hnsw_ef_search
+            self._index = index
+            if self._index_type == "hnsw" and self._is_flat_index():
+                self._rebuild_index("hnsw")
+            self._maybe_train_ivf()
 
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
@@ -377,8 +648,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -388,8 +658,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -430,10 +699,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -457,12 +724,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid)
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     record = {
-                        **filtered_metadata,
+                        **metadata,
                         "id": metadata.get("__id__"),
                         "created_at": metadata.get("__created_at__"),
                     }
@@ -483,17 +746,39 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not ids:
             return {}
 
-        vectors_dict = {}
+        found_ids = []
+        fids = []
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
             if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+                found_ids.append(id)
+                fids.append(fid)
+        if not fids:
+            return {}
+
+        # Reconstruct all requested vectors from the index in one call
+        index = await self._get_index()
+        vectors = index.reconstruct_batch(np.array(fids, dtype=np.int64))
+        return dict(zip(found_ids, vectors.tolist()))
+
+    async def get_vectors_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as a (n, dim) float32 matrix in found-ID order"""
+        found_ids = []
+        fids = []
+        for id in ids:
+            fid = self._find_faiss_id_by_custom_id(id)
+            if fid is not None and fid in self._id_to_meta:
+                found_ids.append(id)
+                fids.append(fid)
+        if not fids:
+            return [], np.empty((0, self._dim), dtype=np.float32)
 
-        return vectors_dict
+        index = await self._get_index()
+        vectors = index.reconstruct_batch(np.array(fids, dtype=np.int64))
+        return found_ids, np.asarray(vectors, dtype=np.float32)
 
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
@@ -514,16 +799,17 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
-                if os.path.exists(self._faiss_index_file):
-                    os.remove(self._faiss_index_file)
-                if os.path.exists(self._meta_file):
-                    os.remove(self._meta_file)
+                for path in (
+                    self._faiss_index_file,
+                    self._meta_file,
+                    self._meta_columns_file,
+                    self._vectors_file,
+                ):
+                    self._remove_file(path)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -1,3 +1,5 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
 from dataclasses import dataclass
 import os
 from typing import Any, Union, final
@@ -25,6 +27,162 @@ from .shared_storage import (
 )
 
 
+SORT_FIELDS = ("created_at", "updated_at", "id", "file_path")
+
+
+def _prepare_doc_status(doc_data: dict[str, Any]) -> DocProcessingStatus:
+    """Build a DocProcessingStatus from a stored record, filling fields of old records"""
+    # Make a copy of the data to avoid modifying the original
+    data = doc_data.copy()
+    # Remove deprecated content field if it exists
+    data.pop("content", None)
+    # If file_path is not in data, use document id as file path
+    if "file_path" not in data:
+        data["file_path"] = "no-file-path"
+    # Ensure new fields exist with default values
+    if "metadata" not in data:
+        data["metadata"] = {}
+    if "error_msg" not in data:
+        data["error_msg"] = None
+    return DocProcessingStatus(**data)
+
+
+class _DocStatusIndex:
+    """In-memory secondary indexes over the records of a doc status namespace.
+
+    Maps status, track_id and file_path to document ids, and keeps one sorted list of
+    (sort key, sequence, id) per requested (status filter, sort field, direction).
+    The sequence is the record's position in the storage dict, so documents with
+    equal sort keys keep the order of the former stable sort over all records.
+    Sorted lists are built on first use and then updated on every change.
+    """
+
+    def __init__(self, data: dict[str, dict[str, Any]]):
+        self._next_seq = 0
+        self.seq: dict[str, int] = {}
+        self.status_ids: dict[str, set[str]] = defaultdict(set)
+        self.track_ids: dict[str, set[str]] = defaultdict(set)
+        self.file_path_ids: dict[str, set[str]] = defaultdict(set)
+        # doc_id -> indexed fields and computed sort keys of the record
+        self._entries: dict[str, dict[str, Any]] = {}
+        # (status or None, sort_field, descending) -> sorted entries
+        self._sorted: dict[tuple[str | None, str, bool], list[tuple]] = {}
+        for doc_id, doc_data in data.items():
+            self.add(doc_id, doc_data)
+
+    def add(self, doc_id: str, doc_data: dict[str, Any]) -> None:
+        """Index a new record, or re-index an updated one in place"""
+        seq = self.seq.get(doc_id)
+        if seq is not None:
+            self.remove(doc_id, keep_seq=True)
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+            self.seq[doc_id] = seq
+
+        # Copy the indexed values: records may later be changed in place
+        entry = {
+            "status": doc_data.get("status"),
+            "track_id": doc_data.get("track_id"),
+            "file_path": doc_data.get("file_path"),
+            "sort_path": doc_data.get("file_path", "no-file-path"),
+            "sort_keys": {
+                "id": doc_id,
+                "created_at": doc_data.get("created_at") or "",
+                "updated_at": doc_data.get("updated_at") or "",
+            },
+        }
+        self._entries[doc_id] = entry
+        self.status_ids[entry["status"]].add(doc_id)
+        if entry["track_id"] is not None:
+            self.track_ids[entry["track_id"]].add(doc_id)
+        if entry["file_path"] is not None:
+            self.file_path_ids[entry["file_path"]].add(doc_id)
+
+        for status, sort_field, descending in self._sorted:
+            if status is None or status == entry["status"]:
+                insort(
+                    self._sorted[(status, sort_field, descending)],
+                    self._sort_entry(doc_id, sort_field, descending),
+                )
+
+    def remove(self, doc_id: str, keep_seq: bool = False) -> None:
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return
+        for status, sort_field, descending in self._sorted:
+            if status is None or status == entry["status"]:
+                sorted_list = self._sorted[(status, sort_field, descending)]
+                item = self._sort_entry(doc_id, sort_field, descending, entry)
+                pos = bisect_left(sorted_list, item)
+                if pos < len(sorted_list) and sorted_list[pos] == item:
+                    del sorted_list[pos]
+
+        self._discard(self.status_ids, entry["status"], doc_id)
+        if entry["track_id"] is not None:
+            self._discard(self.track_ids, entry["track_id"], doc_id)
+        if entry["file_path"] is not None:
+            self._discard(self.file_path_ids, entry["file_path"], doc_id)
+        if not keep_seq:
+            self.seq.pop(doc_id, None)
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: Any, doc_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del index[key]
+
+    def ordered(self, ids: set[str]) -> list[str]:
+        """Ids in the order of the records in the storage dict"""
+        return sorted(ids, key=self.seq.__getitem__)
+
+    def _sort_entry(
+        self,
+        doc_id: str,
+        sort_field: str,
+        descending: bool,
+        entry: dict[str, Any] | None = None,
+    ) -> tuple:
+        entry = entry or self._entries[doc_id]
+        sort_keys = entry["sort_keys"]
+        if sort_field not in sort_keys:
+            # Use pinyin sorting for file_path field to support Chinese characters,
+            # computed only once the file_path order is requested
+            sort_keys[sort_field] = get_pinyin_sort_key(entry["sort_path"])
+        # Descending pages are read from the end, so negate the sequence there to
+        # keep equal keys in storage order
+        seq = self.seq[doc_id]
+        return (sort_keys[sort_field], -seq if descending else seq, doc_id)
+
+    def page(
+        self,
+        status: str | None,
+        sort_field: str,
+        descending: bool,
+        start: int,
+        size: int,
+    ) -> tuple[list[str], int]:
+        """Return (ids of the page, total count) for a status filter and sort order"""
+        key = (status, sort_field, descending)
+        sorted_list = self._sorted.get(key)
+        if sorted_list is None:
+            ids = self._entries if status is None else self.status_ids.get(status, ())
+            sorted_list = sorted(
+                self._sort_entry(doc_id, sort_field, descending) for doc_id in ids
+            )
+            self._sorted[key] = sorted_list
+
+        total = len(sorted_list)
+        if descending:
+            end_idx = max(total - start, 0)
+            items = sorted_list[max(end_idx - size, 0) : end_idx][::-1]
+        else:
+            items = sorted_list[start : start + size]
+        return [item[2] for item in items], total
+
+
 @final
 @dataclass
 class JsonDocStatusStorage(DocStatusStorage):
@@ -47,6 +205,10 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Secondary indexes, rebuilt when another instance or process changed the data
+        self._index: _DocStatusIndex | None = None
+        self._index_version = None
+        self._index_seen = -1
 
     async def initialize(self):
         """Initialize storage data"""
@@ -56,6 +218,9 @@ class JsonDocStatusStorage(DocStatusStorage):
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            self._index_version = await get_namespace_data(
+                f"{self.final_namespace}_index_version"
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
@@ -64,6 +229,27 @@ class JsonDocStatusStorage(DocStatusStorage):
                         f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
 
+    def _get_index(self) -> _DocStatusIndex:
+        """Return the secondary indexes, rebuilding them if the data changed elsewhere.
+
+        Must be called while holding the storage lock.
+        """
+        version = self._index_version.get("version", 0)
+        if self._index is None or self._index_seen != version:
+            self._index = _DocStatusIndex(self._data)
+            self._index_seen = version
+        return self._index
+
+    def _index_updated(self) -> None:
+        """Publish a change already applied to this instance's indexes.
+
+        Other instances and processes see the new version and rebuild theirs.
+        Must be called while holding the storage lock.
+        """
+        version = self._index_version.get("version", 0) + 1
+        self._index_version["version"] = version
+        self._index_seen = version
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         if self._storage_lock is None:
@@ -90,8 +276,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            for status, ids in self._get_index().status_ids.items():
+                counts[status] = len(ids)
         return counts
 
     async def get_docs_by_status(
@@ -100,27 +286,15 @@ class JsonDocStatusStorage(DocStatusStorage):
         """Get all documents with a specific status"""
         result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
+            index = self._get_index()
+            for k in index.ordered(index.status_ids.get(status.value, set())):
+                try:
+                    result[k] = _prepare_doc_status(self._data[k])
+                except KeyError as e:
+                    logger.error(
+                        f"[{self.workspace}] Missing required field for document {k}: {e}"
+                    )
+                    continue
         return result
 
     async def get_docs_by_track_id(
@@ -129,27 +303,15 @@ class JsonDocStatusStorage(DocStatusStorage):
         """Get all documents with a specific track_id"""
         result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v.get("track_id") == track_id:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
+            index = self._get_index()
+            for k in index.ordered(index.track_ids.get(track_id, set())):
+                try:
+                    result[k] = _prepare_doc_status(self._data[k])
+                except KeyError as e:
+                    logger.error(
+                        f"[{self.workspace}] Missing required field for document {k}: {e}"
+                    )
+                    continue
         return result
 
     async def index_done_callback(self) -> None:
@@ -174,6 +336,8 @@ class JsonDocStatusStorage(DocStatusStorage):
                     if cleaned_data is not None:
                         self._data.clear()
                         self._data.update(cleaned_data)
+                        self._index = None
+                        self._index_updated()
 
                 await clear_all_update_flags(self.final_namespace)
 
@@ -191,11 +355,15 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
+            index = self._get_index()
             # Ensure chunks_list field exists for new documents
             for doc_id, doc_data in data.items():
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            for doc_id, doc_data in data.items():
+                index.add(doc_id, doc_data)
+            self._index_updated()
             await set_all_update_flags(self.final_namespace)
 
         await self.index_done_callback()
@@ -246,73 +414,34 @@ class JsonDocStatusStorage(DocStatusStorage):
         elif page_size > 200:
             page_size = 200
 
-        if sort_field not in ["created_at", "updated_at", "id", "file_path"]:
+        if sort_field not in SORT_FIELDS:
             sort_field = "updated_at"
 
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For JSON storage, we load all data and sort/filter in memory
-        all_docs = []
-
+        # Only the documents of the requested page are read, the order comes from
+        # the sorted lists maintained by the secondary indexes
+        paginated_docs = []
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                # Apply status filter
-                if (
-                    status_filter is not None
-                    and doc_data.get("status") != status_filter.value
-                ):
-                    continue
-
+            page_ids, total_count = self._get_index().page(
+                status_filter.value if status_filter is not None else None,
+                sort_field,
+                sort_direction.lower() == "desc",
+                (page - 1) * page_size,
+                page_size,
+            )
+            for doc_id in page_ids:
                 try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
-
-                    # Add sort key for sorting
-                    if sort_field == "id":
-                        doc_status._sort_key = doc_id
-                    elif sort_field == "file_path":
-                        # Use pinyin sorting for file_path field to support Chinese characters
-                        file_path_value = getattr(doc_status, sort_field, "")
-                        doc_status._sort_key = get_pinyin_sort_key(file_path_value)
-                    else:
-                        doc_status._sort_key = getattr(doc_status, sort_field, "")
-
-                    all_docs.append((doc_id, doc_status))
-
+                    paginated_docs.append(
+                        (doc_id, _prepare_doc_status(self._data[doc_id]))
+                    )
                 except KeyError as e:
                     logger.error(
                         f"[{self.workspace}] Error processing document {doc_id}: {e}"
                     )
                     continue
 
-        # Sort documents
-        reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(
-            key=lambda x: getattr(x[1], "_sort_key", ""), reverse=reverse_sort
-        )
-
-        # Remove sort key from documents
-        for doc_id, doc in all_docs:
-            if hasattr(doc, "_sort_key"):
-                delattr(doc, "_sort_key")
-
-        total_count = len(all_docs)
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
-
         return paginated_docs, total_count
 
     async def get_all_status_counts(self) -> dict[str, int]:
@@ -343,13 +472,16 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
+            index = self._get_index()
             any_deleted = False
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
+                    index.remove(doc_id)
                     any_deleted = True
 
             if any_deleted:
+                self._index_updated()
                 await set_all_update_flags(self.final_namespace)
 
     async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
@@ -366,10 +498,13 @@ class JsonDocStatusStorage(DocStatusStorage):
             raise StorageNotInitializedError("JsonDocStatusStorage")
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                if doc_data.get("file_path") == file_path:
-                    # Return complete document data, consistent with get_by_ids method
-                    return doc_data
+            index = self._get_index()
+            doc_ids = index.file_path_ids.get(file_path)
+            if doc_ids:
+                # First matching record in storage order, as a full scan would find
+                doc_id = min(doc_ids, key=index.seq.__getitem__)
+                # Return complete document data, consistent with get_by_ids method
+                return self._data[doc_id]
 
         return None
 
@@ -389,6 +524,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._index = None
+                self._index_updated()
                 await set_all_update_flags(self.final_namespace)
 
             await self.index_done_callback()
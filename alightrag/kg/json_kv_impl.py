@@ -1,4 +1,7 @@
+import asyncio
+import json
 import os
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import Any, final
 
@@ -6,6 +9,7 @@ from alightrag.base import (
     BaseKVStorage,
 )
 from alightrag.utils import (
+    SanitizingJSONEncoder,
     load_json,
     logger,
     write_json,
@@ -14,6 +18,7 @@ from alightrag.exceptions import StorageNotInitializedError
 from .shared_storage import (
     get_namespace_data,
     get_storage_lock,
+    get_storage_keyed_lock,
     get_data_init_lock,
     get_update_flag,
     set_all_update_flags,
@@ -21,10 +26,34 @@ from .shared_storage import (
     try_initialize_namespace,
 )
 
+# Suffix of the shared namespace that tracks keys changed since the last persist
+KV_PENDING_NAMESPACE_SUFFIX = "__journal_pending"
+# Compact the journal into the snapshot once it outgrows this fraction of the snapshot...
+KV_JOURNAL_COMPACT_RATIO = 1.0
+# ...and this many bytes
+KV_JOURNAL_MIN_COMPACT_BYTES = 8 * 1024 * 1024
+
 
 @final
 @dataclass
 class JsonKVStorage(BaseKVStorage):
+    """
+    JSON file backed KV storage with a write-ahead journal.
+
+    `kv_store_<namespace>.json` is a full snapshot. index_done_callback only appends the records
+    upserted or deleted since the last persist to `kv_store_<namespace>.journal.jsonl`. Once the
+    journal outgrows the snapshot, a background task folds it into a new snapshot, which is
+    written to a temporary file and atomically swapped in before the journal is removed.
+    Loading replays the journal (and a journal left by an interrupted compaction) over the
+    snapshot; replay is idempotent and drops a torn trailing line, so a crash at any point
+    loses no persisted write.
+
+    Reads skip the storage lock when the data is a process-local dict (single-process mode):
+    writers never await while mutating it, so every read on the event loop sees a consistent
+    state, and readers no longer queue behind compactions or other storages' writers.
+    Manager-backed dicts shared between worker processes keep reading under the lock.
+    """
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -39,10 +68,18 @@ class JsonKVStorage(BaseKVStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._journal_file = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.journal.jsonl"
+        )
+        # Journal entries being folded into a new snapshot by a running compaction
+        self._compacting_journal_file = self._journal_file + ".compacting"
 
         self._data = None
+        self._pending = None
+        self._lock_free_reads = False
         self._storage_lock = None
         self.storage_updated = None
+        self._compaction_task: asyncio.Task | None = None
 
     async def initialize(self):
         """Initialize storage data"""
@@ -52,8 +89,17 @@ class JsonKVStorage(BaseKVStorage):
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            self._pending = await get_namespace_data(
+                self.final_namespace + KV_PENDING_NAMESPACE_SUFFIX
+            )
+            # Manager dict proxies are shared between processes and need the lock
+            self._lock_free_reads = not hasattr(self._data, "_getvalue")
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
+                # Replay changes journaled after the snapshot
+                replayed = self._replay_journal(
+                    loaded_data, self._compacting_journal_file
+                ) + self._replay_journal(loaded_data, self._journal_file)
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -65,40 +111,179 @@ class JsonKVStorage(BaseKVStorage):
                     data_count = len(loaded_data)
 
                     logger.info(
-                        f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records"
+                        f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records ({replayed} journal entries)"
                     )
 
-    async def index_done_callback(self) -> None:
-        async with self._storage_lock:
-            if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
+    def _read_guard(self):
+        """Lock for read paths: none for process-local data, the storage lock for shared data."""
+        if self._storage_lock is None:
+            raise StorageNotInitializedError("JsonKVStorage")
+        return nullcontext() if self._lock_free_reads else self._storage_lock
+
+    def _replay_journal(self, data: dict[str, Any], file_name: str) -> int:
+        """Apply journal entries to data, truncating a torn trailing write. Returns entry count."""
+        if not os.path.exists(file_name):
+            return 0
+        entries = 0
+        valid_size = 0
+        with open(file_name, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if entry["op"] == "upsert":
+                    data.update(entry["data"])
+                elif entry["op"] == "delete":
+                    for key in entry["ids"]:
+                        data.pop(key, None)
+                valid_size += len(line)
+                entries += 1
+        if valid_size < os.path.getsize(file_name):
+            logger.warning(
+                f"[{self.workspace}] Truncating incomplete journal entry in {file_name}"
+            )
+            with open(file_name, "r+b") as f:
+                f.truncate(valid_size)
+        return entries
 
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
+    def _append_journal(self, entries: list[dict[str, Any]]) -> None:
+        """Append entries to the journal, sanitizing strings that cannot be encoded."""
+        try:
+            lines = "".join(
+                json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
+            ).encode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            lines = "".join(
+                json.dumps(entry, ensure_ascii=False, cls=SanitizingJSONEncoder) + "\n"
+                for entry in entries
+            ).encode("utf-8")
+            # Keep shared memory identical to what was persisted
+            for line in lines.decode("utf-8").splitlines():
+                entry = json.loads(line)
+                if entry["op"] == "upsert":
+                    self._data.update(entry["data"])
+            logger.info(
+                f"[{self.workspace}] JSON sanitization applied during journal write: {self._journal_file}"
+            )
+        with open(self._journal_file, "ab") as f:
+            f.write(lines)
+
+    def _compaction_due(self) -> bool:
+        if not os.path.exists(self._journal_file):
+            return False
+        journal_size = os.path.getsize(self._journal_file)
+        snapshot_size = (
+            os.path.getsize(self._file_name) if os.path.exists(self._file_name) else 0
+        )
+        return journal_size > max(
+            KV_JOURNAL_MIN_COMPACT_BYTES, snapshot_size * KV_JOURNAL_COMPACT_RATIO
+        )
 
-                logger.debug(
-                    f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
+    def _rotate_journal(self) -> None:
+        """Move the journal aside so later writes start a new one (lock held)."""
+        if not os.path.exists(self._journal_file):
+            return
+        if not os.path.exists(self._compacting_journal_file):
+            os.replace(self._journal_file, self._compacting_journal_file)
+            return
+        # Left by an interrupted compaction: keep its entries ahead of the newer ones
+        with open(self._journal_file, "rb") as src, open(
+            self._compacting_journal_file, "ab"
+        ) as dst:
+            dst.write(src.read())
+        os.remove(self._journal_file)
+
+    async def _compact(self, force: bool = False) -> None:
+        """Fold the journal into a new snapshot.
+
+        The snapshot is taken and the journal moved aside under the storage lock; the
+        snapshot is then written outside it, so other storages sharing the lock are not
+        blocked by the write. Changes made meanwhile go to the new journal, which is
+        replayed after the moved-aside one. Compactions of one namespace are serialized
+        by a keyed lock.
+        """
+        async with get_storage_keyed_lock(
+            ["compaction"], namespace=self.final_namespace
+        ):
+            async with self._storage_lock:
+                if not force and not self._compaction_due():
+                    # Another process compacted in the meantime
+                    return
+                self._journal_pending()
+                data_dict = dict(self._data)
+                self._rotate_journal()
+
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} KV compacting {len(data_dict)} records to {self.namespace}"
+            )
+            tmp_file = self._file_name + ".tmp"
+            needs_reload = await asyncio.to_thread(write_json, data_dict, tmp_file)
 
-                # Write JSON and check if sanitization was applied
-                needs_reload = write_json(data_dict, self._file_name)
+            async with self._storage_lock:
+                os.replace(tmp_file, self._file_name)
+                if os.path.exists(self._compacting_journal_file):
+                    os.remove(self._compacting_journal_file)
 
-                # If data was sanitized, reload cleaned data to update shared memory
+                # If data was sanitized, reload cleaned records not changed since the snapshot
                 if needs_reload:
                     logger.info(
                         f"[{self.workspace}] Reloading sanitized data into shared memory for {self.namespace}"
                     )
-                    cleaned_data = load_json(self._file_name)
-                    if cleaned_data is not None:
-                        self._data.clear()
-                        self._data.update(cleaned_data)
+                    cleaned_data = load_json(self._file_name) or {}
+                    for key, value in cleaned_data.items():
+                        if (
+                            value != data_dict.get(key)
+                            and self._data.get(key) == data_dict.get(key)
+                        ):
+                            self._data[key] = value
+
+    def _journal_pending(self) -> int:
+        """Append the current state of all tracked changed keys to the journal (lock held)."""
+        pending_keys = list(self._pending.keys())
+        if not pending_keys:
+            return 0
+        self._pending.clear()
+
+        upserts = {}
+        deletes = []
+        for key in pending_keys:
+            value = self._data.get(key)
+            if value is None:
+                deletes.append(key)
+            else:
+                upserts[key] = value
+        entries = []
+        if deletes:
+            entries.append({"op": "delete", "ids": deletes})
+        if upserts:
+            entries.append({"op": "upsert", "data": upserts})
+
+        logger.debug(
+            f"[{self.workspace}] Process {os.getpid()} KV journaling {len(upserts)} upserts, {len(deletes)} deletes to {self.namespace}"
+        )
+        self._append_journal(entries)
+        return len(pending_keys)
 
+    async def index_done_callback(self) -> None:
+        full_snapshot = False
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                # Data changed without tracked keys (e.g. drop): rewrite the snapshot
+                full_snapshot = self._journal_pending() == 0
                 await clear_all_update_flags(self.final_namespace)
 
+        if full_snapshot:
+            await self._compact(force=True)
+        elif self._compaction_due() and (
+            self._compaction_task is None or self._compaction_task.done()
+        ):
+            self._compaction_task = asyncio.create_task(self._compact())
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
+        async with self._read_guard():
             result = self._data.get(id)
             if result:
                 # Create a copy to avoid modifying the original data
@@ -111,7 +296,7 @@ class JsonKVStorage(BaseKVStorage):
             return result
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
+        async with self._read_guard():
             results = []
             for id in ids:
                 data = self._data.get(id, None)
@@ -129,7 +314,11 @@ class JsonKVStorage(BaseKVStorage):
             return results
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
-        async with self._storage_lock:
+        async with self._read_guard():
+            if self._lock_free_reads:
+                # Probe only the requested keys instead of materializing the whole key set
+                return {key for key in keys if key not in self._data}
+            # One round trip for Manager dict proxies
             return set(keys) - set(self._data.keys())
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
@@ -168,6 +357,7 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            self._pending.update(dict.fromkeys(data))
             await set_all_update_flags(self.final_namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -184,13 +374,14 @@ class JsonKVStorage(BaseKVStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
+            deleted_ids = []
             for doc_id in ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
-                    any_deleted = True
+                    deleted_ids.append(doc_id)
 
-            if any_deleted:
+            if deleted_ids:
+                self._pending.update(dict.fromkeys(deleted_ids))
                 await set_all_update_flags(self.final_namespace)
 
     async def is_empty(self) -> bool:
@@ -199,7 +390,7 @@ class JsonKVStorage(BaseKVStorage):
         Returns:
             bool: True if storage contains no data, False otherwise
         """
-        async with self._storage_lock:
+        async with self._read_guard():
             return len(self._data) == 0
 
     async def drop(self) -> dict[str, str]:
@@ -219,6 +410,8 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                # An empty pending set makes index_done_callback rewrite the snapshot
+                self._pending.clear()
                 await set_all_update_flags(self.final_namespace)
 
             await self.index_done_callback()
@@ -294,3 +487,5 @@ class JsonKVStorage(BaseKVStorage):
         """
         if self.namespace.endswith("_cache"):
             await self.index_done_callback()
+        if self._compaction_task is not None:
+            await self._compaction_task
@@ -1083,12 +1083,30 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                 [query], _priority=5
             )  # higher priority for query
 
+        return self._search(embedding, top_k)[0]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Send all query vectors to Milvus in one multi-vector search request"""
+        # Ensure collection is loaded before querying
+        self._ensure_collection_loaded()
+
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        if not embeddings:
+            return []
+        return self._search(embeddings, top_k)
+
+    def _search(self, embeddings: list, top_k: int) -> list[list[dict[str, Any]]]:
         # Include all meta_fields (created_at is now always included)
         output_fields = list(self.meta_fields)
 
         results = self._client.search(
             collection_name=self.final_namespace,
-            data=embedding,
+            data=embeddings,
             limit=top_k,
             output_fields=output_fields,
             search_params={
@@ -1097,13 +1115,16 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             },
         )
         return [
-            {
-                **dp["entity"],
-                "id": dp["id"],
-                "distance": dp["distance"],
-                "created_at": dp.get("created_at"),
-            }
-            for dp in results[0]
+            [
+                {
+                    **dp["entity"],
+                    "id": dp["id"],
+                    "distance": dp["distance"],
+                    "created_at": dp.get("created_at"),
+                }
+                for dp in hits
+            ]
+            for hits in results
         ]
 
     async def index_done_callback(self) -> None:
@@ -88,6 +88,37 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
             return self._client
 
+    def _client_internals(self, client: NanoVectorDB) -> dict[str, Any] | None:
+        """NanoVectorDB's private {"data", "matrix"} storage, or None if its layout changed
+
+        nano-vectordb has no public accessor for its vector matrix. The batch search
+        and vector matrix paths read it directly and fall back to the public API when
+        the attribute is missing or no longer has the expected shape.
+        """
+        storage = getattr(client, "_NanoVectorDB__storage", None)
+        if (
+            isinstance(storage, dict)
+            and isinstance(storage.get("data"), list)
+            and isinstance(storage.get("matrix"), np.ndarray)
+            and len(storage["matrix"]) == len(storage["data"])
+        ):
+            return storage
+        logger.warning(
+            f"[{self.workspace}] Unsupported nano-vectordb storage layout, "
+            "falling back to per-item access (tested with nano-vectordb 0.0.4.x)"
+        )
+        return None
+
+    async def _require_client_internals(self) -> dict[str, Any]:
+        client = await self._get_client()
+        storage = self._client_internals(client)
+        if storage is None:
+            raise ValueError(
+                "Unsupported nano-vectordb version: its internal storage layout changed "
+                "(tested with nano-vectordb 0.0.4.x)"
+            )
+        return storage
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes:
@@ -166,10 +197,58 @@ class NanoVectorDBStorage(BaseVectorStorage):
         ]
         return results
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search all queries with one matrix product over the client's matrix
+
+        Mirrors NanoVectorDB's cosine query row by row, so each result list is the
+        same as the one `query` returns for that query.
+        """
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        if not embeddings:
+            return []
+
+        client = await self._get_client()
+        storage = self._client_internals(client)
+        if storage is None:
+            return await super().query_batch(queries, top_k, embeddings)
+        if not storage["data"] or top_k <= 0:
+            return [[] for _ in embeddings]
+
+        query_matrix = np.asarray(embeddings, dtype=storage["matrix"].dtype)
+        # A zero query vector scores 0 against every row instead of NaN
+        query_matrix = query_matrix / np.maximum(
+            np.linalg.norm(query_matrix, axis=1, keepdims=True), 1e-12
+        )
+        scores = query_matrix @ storage["matrix"].T
+        top_rows = np.argsort(scores, axis=1)[:, -top_k:][:, ::-1]
+
+        batch_results = []
+        for row_scores, rows in zip(scores, top_rows):
+            results = []
+            for row in rows.tolist():
+                score = row_scores[row]
+                if score < self.cosine_better_than_threshold:
+                    break
+                dp = {**storage["data"][row], "__metrics__": score}
+                results.append(
+                    {
+                        **{k: v for k, v in dp.items() if k != "vector"},
+                        "id": dp["__id__"],
+                        "distance": dp["__metrics__"],
+                        "created_at": dp.get("__created_at__"),
+                    }
+                )
+            batch_results.append(results)
+        return batch_results
+
     @property
     async def client_storage(self):
-        client = await self._get_client()
-        return getattr(client, "_NanoVectorDB__storage")
+        return await self._require_client_internals()
 
     async def delete(self, ids: list[str]):
         """Delete vectors with specified IDs
@@ -238,8 +317,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         """
 
         try:
-            client = await self._get_client()
-            storage = getattr(client, "_NanoVectorDB__storage")
+            storage = await self._require_client_internals()
             relations = [
                 dp
                 for dp in storage["data"]
@@ -382,6 +460,30 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_vectors_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as a (n, dim) float32 matrix in found-ID order
+
+        Rows are gathered from the client's in-memory matrix, which NanoVectorDB
+        keeps unit-normalized for cosine search.
+        """
+        client = await self._get_client()
+        storage = self._client_internals(client)
+        if storage is None:
+            return await super().get_vectors_matrix_by_ids(ids)
+        wanted = set(ids)
+        row_of = {
+            dp["__id__"]: row
+            for row, dp in enumerate(storage["data"])
+            if dp["__id__"] in wanted
+        }
+        found_ids = [id for id in ids if id in row_of]
+        rows = np.fromiter(
+            (row_of[id] for id in found_ids), dtype=np.int64, count=len(found_ids)
+        )
+        return found_ids, np.asarray(storage["matrix"][rows], dtype=np.float32)
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -1,11 +1,13 @@
 import os
+import json
 from dataclasses import dataclass
-from typing import final
+from typing import Any, final
 
 from alightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from alightrag.utils import logger
 from alightrag.base import BaseGraphStorage
 import networkx as nx
+import numpy as np
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -19,10 +21,93 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# Version tag of the binary graph snapshot
+GRAPH_SNAPSHOT_FORMAT_VERSION = 1
+# Rewrite the snapshot once the journal holds this fraction of the graph size in entries
+GRAPH_JOURNAL_COMPACT_RATIO = 0.5
+# ...but never for journals shorter than this
+GRAPH_JOURNAL_MIN_COMPACT_ENTRIES = 1000
+
+
+def _encode_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Pack strings into one UTF-8 byte blob plus int64 byte offsets."""
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(blob: np.ndarray, offsets: np.ndarray) -> list[str]:
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [
+        data[bounds[i] : bounds[i + 1]].decode("utf-8")
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def _encode_attributes(
+    prefix: str, rows: list[dict[str, Any]], arrays: dict[str, np.ndarray]
+) -> list[dict[str, Any]]:
+    """Store row attributes column-wise as interned value tables plus int32 codes.
+
+    Columns holding only strings keep raw values, other columns are JSON encoded.
+    Returns the column descriptors for the snapshot header.
+    """
+    keys = sorted({key for row in rows for key in row})
+    columns = []
+    for column, key in enumerate(keys):
+        values = [row.get(key) for row in rows]
+        is_json = any(
+            value is not None and not isinstance(value, str) for value in values
+        )
+        table: dict[str, int] = {}
+        codes = np.full(len(rows), -1, dtype=np.int32)
+        for row, value in enumerate(values):
+            if value is None and key not in rows[row]:
+                continue
+            encoded = json.dumps(value) if is_json else value
+            codes[row] = table.setdefault(encoded, len(table))
+        blob, offsets = _encode_strings(list(table))
+        arrays[f"{prefix}_{column}_codes"] = codes
+        arrays[f"{prefix}_{column}_blob"] = blob
+        arrays[f"{prefix}_{column}_offsets"] = offsets
+        columns.append({"key": key, "json": is_json})
+    return columns
+
+
+def _decode_attributes(
+    prefix: str, columns: list[dict[str, Any]], count: int, arrays
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = [{} for _ in range(count)]
+    for column, descriptor in enumerate(columns):
+        key = descriptor["key"]
+        table = _decode_strings(
+            arrays[f"{prefix}_{column}_blob"], arrays[f"{prefix}_{column}_offsets"]
+        )
+        if descriptor["json"]:
+            table = [json.loads(value) for value in table]
+        for row, code in enumerate(arrays[f"{prefix}_{column}_codes"].tolist()):
+            if code >= 0:
+                rows[row][key] = table[code]
+    return rows
+
 
 @final
 @dataclass
 class NetworkXStorage(BaseGraphStorage):
+    """
+    In-memory NetworkX graph storage.
+
+    The graph is persisted as a binary snapshot (`graph_<namespace>.snapshot.npz`: interned
+    node name table, CSR adjacency arrays and columnar node/edge attributes) plus an
+    append-only JSON-lines change journal. index_done_callback only appends the nodes and
+    edges changed since the previous save to the journal, and folds the journal into a new
+    snapshot once it grows past GRAPH_JOURNAL_COMPACT_RATIO of the graph size.
+    GraphML is kept for import of existing graphs and for export via export_graphml().
+    """
+
     @staticmethod
     def load_nx_graph(file_name) -> nx.Graph:
         if os.path.exists(file_name):
@@ -36,6 +121,76 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def load_graph_snapshot(file_name) -> nx.Graph | None:
+        if not os.path.exists(file_name):
+            return None
+        with np.load(file_name, allow_pickle=False) as arrays:
+            header = json.loads(arrays["header"].tobytes().decode("utf-8"))
+            names = _decode_strings(arrays["node_names_blob"], arrays["node_names_offsets"])
+            node_attrs = _decode_attributes(
+                "node_attr", header["node_columns"], len(names), arrays
+            )
+            indptr = arrays["indptr"]
+            targets = arrays["indices"].tolist()
+            sources = np.repeat(
+                np.arange(len(names), dtype=np.int64), np.diff(indptr)
+            ).tolist()
+            edge_attrs = _decode_attributes(
+                "edge_attr", header["edge_columns"], len(targets), arrays
+            )
+
+        graph = nx.Graph()
+        graph.add_nodes_from(zip(names, node_attrs))
+        graph.add_edges_from(
+            (names[src], names[tgt], attrs)
+            for src, tgt, attrs in zip(sources, targets, edge_attrs)
+        )
+        return graph
+
+    @staticmethod
+    def write_graph_snapshot(graph: nx.Graph, file_name, workspace="_"):
+        logger.info(
+            f"[{workspace}] Writing graph snapshot with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        names = list(graph.nodes)
+        node_index = {name: i for i, name in enumerate(names)}
+        edges = list(graph.edges(data=True))
+        sources = np.fromiter(
+            (node_index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges)
+        )
+        targets = np.fromiter(
+            (node_index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges)
+        )
+        # CSR adjacency: each undirected edge is stored once, under its first endpoint
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(names)), out=indptr[1:])
+
+        arrays: dict[str, np.ndarray] = {"indptr": indptr, "indices": targets[order]}
+        arrays["node_names_blob"], arrays["node_names_offsets"] = _encode_strings(
+            [str(name) for name in names]
+        )
+        node_columns = _encode_attributes(
+            "node_attr", [graph.nodes[name] for name in names], arrays
+        )
+        edge_columns = _encode_attributes(
+            "edge_attr", [edges[i][2] for i in order.tolist()], arrays
+        )
+        header = {
+            "version": GRAPH_SNAPSHOT_FORMAT_VERSION,
+            "node_columns": node_columns,
+            "edge_columns": edge_columns,
+        }
+        arrays["header"] = np.frombuffer(
+            json.dumps(header).encode("utf-8"), dtype=np.uint8
+        )
+
+        tmp_file = file_name + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, file_name)
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -52,21 +207,165 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._snapshot_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.snapshot.npz"
+        )
+        self._journal_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.journal.jsonl"
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
+        self._load_graph()
+
+    def _load_graph(self):
+        """Load the snapshot (or import GraphML) and replay the change journal."""
+        # Nodes and edges changed since the last save
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
+        self._journal_entries = 0
+        self._needs_snapshot = False
+
+        graph = NetworkXStorage.load_graph_snapshot(self._snapshot_file)
+        if graph is not None:
+            source = self._snapshot_file
+        else:
+            graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+            source = self._graphml_xml_file
+            # Convert imported GraphML to a snapshot on the next save
+            self._needs_snapshot = graph is not None
+
+        if graph is None:
+            graph = nx.Graph()
+            source = None
+
+        self._journal_entries = self._replay_journal(graph)
+        if source is not None or self._journal_entries:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {source or self._journal_file} with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges ({self._journal_entries} journal entries)"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph file: {self._snapshot_file}"
+            )
+        self._graph = graph
+
+    def _replay_journal(self, graph: nx.Graph) -> int:
+        """Apply the change journal to graph, returning the number of entries."""
+        if not os.path.exists(self._journal_file):
+            return 0
+        entries = 0
+        with open(self._journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only a torn trailing write can be malformed
+                    logger.warning(
+                        f"[{self.workspace}] Ignoring incomplete graph journal entry in {self._journal_file}"
+                    )
+                    break
+                op = entry["op"]
+                if op == "node":
+                    if graph.has_node(entry["id"]):
+                        attrs = graph.nodes[entry["id"]]
+                        attrs.clear()
+                        attrs.update(entry["data"])
+                    else:
+                        graph.add_node(entry["id"], **entry["data"])
+                elif op == "edge":
+                    if graph.has_edge(entry["src"], entry["tgt"]):
+                        attrs = graph.edges[entry["src"], entry["tgt"]]
+                        attrs.clear()
+                        attrs.update(entry["data"])
+                    else:
+                        graph.add_edge(entry["src"], entry["tgt"], **entry["data"])
+                elif op == "del_node":
+                    if graph.has_node(entry["id"]):
+                        graph.remove_node(entry["id"])
+                elif op == "del_edge":
+                    if graph.has_edge(entry["src"], entry["tgt"]):
+                        graph.remove_edge(entry["src"], entry["tgt"])
+                entries += 1
+        return entries
+
+    def _journal_changes(self) -> list[dict[str, Any]]:
+        """Collect the current state of every node and edge changed since the last save."""
+        graph = self._graph
+        deletions = []
+        upserts = []
+        for src, tgt in self._dirty_edges:
+            if not graph.has_edge(src, tgt):
+                deletions.append({"op": "del_edge", "src": src, "tgt": tgt})
+        for node_id in self._dirty_nodes:
+            if graph.has_node(node_id):
+                upserts.append(
+                    {"op": "node", "id": node_id, "data": dict(graph.nodes[node_id])}
+                )
+            else:
+                deletions.append({"op": "del_node", "id": node_id})
+        for src, tgt in self._dirty_edges:
+            if graph.has_edge(src, tgt):
+                upserts.append(
+                    {
+                        "op": "edge",
+                        "src": src,
+                        "tgt": tgt,
+                        "data": dict(graph.edges[src, tgt]),
+                    }
+                )
+        # Deletions first so that re-created nodes and edges survive replay
+        return deletions + upserts
+
+    def _persist_graph(self):
+        """Append pending changes to the journal, or fold everything into a new snapshot."""
+        changes = self._journal_changes()
+        graph_size = self._graph.number_of_nodes() + self._graph.number_of_edges()
+        journal_entries = self._journal_entries + len(changes)
+        if (
+            self._needs_snapshot
+            or not os.path.exists(self._snapshot_file)
+            or journal_entries
+            > max(
+                GRAPH_JOURNAL_MIN_COMPACT_ENTRIES,
+                graph_size * GRAPH_JOURNAL_COMPACT_RATIO,
+            )
+        ):
+            NetworkXStorage.write_graph_snapshot(
+                self._graph, self._snapshot_file, self.workspace
+            )
+            if os.path.exists(self._journal_file):
+                os.remove(self._journal_file)
+            self._journal_entries = 0
+            self._needs_snapshot = False
+        elif changes:
+            with open(self._journal_file, "a", encoding="utf-8") as f:
+                f.write(
+                    "".join(
+                        json.dumps(change, ensure_ascii=False) + "\n"
+                        for change in changes
+                    )
+                )
+            self._journal_entries = journal_entries
+            logger.debug(
+                f"[{self.workspace}] Appended {len(changes)} graph changes to {self._journal_file}"
             )
-        self._graph = preloaded_graph or nx.Graph()
+        self._dirty_nodes = set()
+        self._dirty_edges = set()
+
+    def _mark_node_removed(self, graph: nx.Graph, node_id: str):
+        """Track a node and its incident edges before the node is removed."""
+        self._dirty_nodes.add(node_id)
+        self._dirty_edges.update(graph.edges(node_id))
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the current graph as GraphML (defaults to graph_<namespace>.graphml)"""
+        file_name = file_name or self._graphml_xml_file
+        graph = await self._get_graph()
+        NetworkXStorage.write_nx_graph(graph, file_name, self.workspace)
+        return file_name
 
     async def initialize(self):
         """Initialize storage data"""
@@ -85,9 +384,7 @@ class NetworkXStorage(BaseGraphStorage):
                     f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._load_graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -127,6 +424,64 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Get multiple nodes with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        result = {}
+        for node_id in node_ids:
+            node = graph.nodes.get(node_id)
+            if node is not None:
+                result[node_id] = node
+        return result
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Get degrees of multiple nodes with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        return {
+            node_id: graph.degree(node_id) if graph.has_node(node_id) else 0
+            for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Get degrees of multiple edges with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        degrees: dict[str, int] = {}
+        result = {}
+        for src_id, tgt_id in edge_pairs:
+            for node_id in (src_id, tgt_id):
+                if node_id not in degrees:
+                    degrees[node_id] = (
+                        graph.degree(node_id) if graph.has_node(node_id) else 0
+                    )
+            result[(src_id, tgt_id)] = degrees[src_id] + degrees[tgt_id]
+        return result
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Get multiple edges with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        result = {}
+        for pair in pairs:
+            src_id = pair["src"]
+            tgt_id = pair["tgt"]
+            edge = graph.edges.get((src_id, tgt_id))
+            if edge is not None:
+                result[(src_id, tgt_id)] = edge
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get edges of multiple nodes with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        return {
+            node_id: list(graph.edges(node_id)) if graph.has_node(node_id) else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -136,6 +491,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._dirty_nodes.add(node_id)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -148,6 +504,23 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._dirty_edges.add((source_node_id, target_node_id))
+
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]]
+    ) -> None:
+        """Upsert multiple nodes with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        graph.add_nodes_from(nodes)
+        self._dirty_nodes.update(node_id for node_id, _ in nodes)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Upsert multiple edges with a single storage lock acquisition"""
+        graph = await self._get_graph()
+        graph.add_edges_from(edges)
+        self._dirty_edges.update((src, tgt) for src, tgt, _ in edges)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -158,6 +531,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            self._mark_node_removed(graph, node_id)
             graph.remove_node(node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
@@ -179,6 +553,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
+                self._mark_node_removed(graph, node)
                 graph.remove_node(node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
@@ -196,6 +571,7 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._dirty_edges.add((source, target))
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -507,9 +883,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._load_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -518,9 +892,7 @@ class NetworkXStorage(BaseGraphStorage):
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                self._persist_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -536,7 +908,7 @@ class NetworkXStorage(BaseGraphStorage):
         """Drop all graph data from storage and clean up resources
 
         This method will:
-        1. Remove the graph storage file if it exists
+        1. Remove the graph snapshot, journal and GraphML files if they exist
         2. Reset the graph to an empty state
         3. Update flags to notify other processes
         4. Changes is persisted to disk immediately
@@ -549,9 +921,14 @@ class NetworkXStorage(BaseGraphStorage):
         try:
             async with self._storage_lock:
                 # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
-                self._graph = nx.Graph()
+                for file_name in (
+                    self._snapshot_file,
+                    self._journal_file,
+                    self._graphml_xml_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._load_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
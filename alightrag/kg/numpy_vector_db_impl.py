@@ -0,0 +1,656 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, final
+from dataclasses import dataclass
+import numpy as np
+
+from alightrag.utils import (
+    logger,
+    compute_mdhash_id,
+)
+
+from alightrag.base import BaseVectorStorage
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# Version tag of the segment manifest
+NUMPY_VDB_FORMAT_VERSION = 1
+# Minimum in-memory matrix capacity, grown by doubling
+NUMPY_VDB_MIN_CAPACITY = 1024
+# Compact segment files once there are more than this many
+NUMPY_VDB_MAX_SEGMENTS = 8
+# Compact in memory and on disk once this fraction of rows is stale
+NUMPY_VDB_COMPACT_DEAD_RATIO = 0.25
+
+
+@final
+@dataclass
+class NumpyVectorDBStorage(BaseVectorStorage):
+    """
+    Local vector storage backed by a contiguous NumPy matrix.
+
+    Vectors are L2-normalized float32 rows of one matrix with an id -> row dict, so search is
+    a single matmul followed by an argpartition top-k. Deleted or replaced rows are only marked
+    dead and are squeezed out once they make up NUMPY_VDB_COMPACT_DEAD_RATIO of the matrix.
+
+    Persistence is append-only: every index_done_callback writes the rows changed since the
+    previous save as a new segment (`.npy` vectors + JSON metadata and deleted ids) and updates
+    a small manifest. Segments are merged into one file once there are too many of them or too
+    much of their content is stale. A single-segment store is memory-mapped on load and only
+    copied into memory on the first write.
+    """
+
+    def __post_init__(self):
+        # Initialize basic attributes
+        self._storage_lock = None
+        self.storage_updated = None
+
+        # Use global config value if specified, otherwise use default
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            self.workspace = "_"
+            workspace_dir = working_dir
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._workspace_dir = workspace_dir
+        self._file_prefix = f"numpy_vdb_{self.namespace}"
+        self._manifest_file = os.path.join(
+            workspace_dir, f"{self._file_prefix}.manifest.json"
+        )
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._reset()
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.final_namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(enable_logging=False)
+
+    # --------------------------------------------------------------------------------
+    # In-memory matrix
+    # --------------------------------------------------------------------------------
+
+    def _reset(self):
+        """Reset the in-memory matrix and all bookkeeping."""
+        self._vectors = np.empty((0, self._dim), dtype=np.float32)
+        # Whether _vectors is a read-only memory map that must be copied before writing
+        self._vectors_mapped = False
+        self._alive = np.zeros(0, dtype=bool)
+        self._metas: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._count = 0
+        # Persistence state
+        self._segments: list[dict[str, Any]] = []
+        self._next_segment = 0
+        self._persisted_rows = 0
+        self._dirty_ids: set[str] = set()
+        self._deleted_ids: set[str] = set()
+
+    def _reserve(self, extra_rows: int):
+        """Make room for extra_rows appended rows, copying a memory map into memory first."""
+        needed = self._count + extra_rows
+        if not self._vectors_mapped and needed <= len(self._vectors):
+            return
+        capacity = max(NUMPY_VDB_MIN_CAPACITY, len(self._vectors))
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.empty((capacity, self._dim), dtype=np.float32)
+        vectors[: self._count] = self._vectors[: self._count]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._count] = self._alive[: self._count]
+        self._vectors = vectors
+        self._vectors_mapped = False
+        self._alive = alive
+
+    def _remove_rows(self, ids) -> int:
+        """Mark the rows of the given ids dead, returning how many existed."""
+        removed = 0
+        for id in ids:
+            row = self._id_to_row.pop(id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._metas[row] = None
+            removed += 1
+        return removed
+
+    def _append_rows(self, metas: list[dict[str, Any]], vectors: np.ndarray):
+        """Append rows, replacing any existing rows with the same ids."""
+        self._remove_rows([meta["__id__"] for meta in metas])
+        self._reserve(len(metas))
+        start, end = self._count, self._count + len(metas)
+        self._vectors[start:end] = vectors
+        self._alive[start:end] = True
+        self._metas.extend(metas)
+        for row, meta in enumerate(metas, start):
+            self._id_to_row[meta["__id__"]] = row
+        self._count = end
+
+    def _live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._alive[: self._count])
+
+    def _maybe_compact_memory(self):
+        """Drop dead rows from the matrix once they take up too much of it."""
+        dead = self._count - len(self._id_to_row)
+        if dead == 0 or dead < self._count * NUMPY_VDB_COMPACT_DEAD_RATIO:
+            return
+        self._compact_memory()
+
+    def _compact_memory(self):
+        """Copy the live rows into a fresh contiguous in-memory matrix."""
+        rows = self._live_rows()
+        metas = [self._metas[row] for row in rows.tolist()]
+        vectors = np.array(self._vectors[rows], dtype=np.float32)
+        self._vectors = vectors
+        self._vectors_mapped = False
+        self._alive = np.ones(len(rows), dtype=bool)
+        self._metas = metas
+        self._id_to_row = {meta["__id__"]: row for row, meta in enumerate(metas)}
+        self._count = len(rows)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _to_record(meta: dict[str, Any]) -> dict[str, Any]:
+        return {
+            **meta,
+            "id": meta.get("__id__"),
+            "created_at": meta.get("__created_at__"),
+        }
+
+    # --------------------------------------------------------------------------------
+    # Segment persistence
+    # --------------------------------------------------------------------------------
+
+    def _segment_paths(self, name: str) -> tuple[str, str]:
+        base = os.path.join(self._workspace_dir, f"{self._file_prefix}.{name}")
+        return base + ".npy", base + ".meta.json"
+
+    def _write_segment(
+        self, rows: np.ndarray, deleted_ids: list[str]
+    ) -> dict[str, Any]:
+        """Write the given rows and deleted ids as a new segment."""
+        name = f"seg{self._next_segment:06d}"
+        self._next_segment += 1
+        vectors_path, meta_path = self._segment_paths(name)
+        with open(vectors_path, "wb") as f:
+            np.save(f, np.asarray(self._vectors[rows], dtype=np.float32))
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rows": [self._metas[row] for row in rows.tolist()],
+                    "deleted": deleted_ids,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        return {"name": name, "rows": len(rows)}
+
+    def _write_manifest(self):
+        tmp_file = self._manifest_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": NUMPY_VDB_FORMAT_VERSION,
+                    "dim": self._dim,
+                    "next_segment": self._next_segment,
+                    "segments": self._segments,
+                },
+                f,
+            )
+        os.replace(tmp_file, self._manifest_file)
+
+    def _remove_segment_files(self, segments: list[dict[str, Any]]):
+        for segment in segments:
+            for path in self._segment_paths(segment["name"]):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _save(self):
+        """Append the pending changes as a segment, compacting segment files when needed."""
+        if not self._dirty_ids and not self._deleted_ids:
+            return
+
+        live = len(self._id_to_row)
+        stale = self._persisted_rows + len(self._dirty_ids) - live
+        if (
+            len(self._segments) + 1 > NUMPY_VDB_MAX_SEGMENTS
+            or stale > max(live, 1) * NUMPY_VDB_COMPACT_DEAD_RATIO
+        ):
+            # Rewrite everything into one segment, releasing any memory map of the old files
+            self._compact_memory()
+            old_segments = self._segments
+            self._segments = [self._write_segment(self._live_rows(), [])]
+            self._persisted_rows = live
+            self._write_manifest()
+            self._remove_segment_files(old_segments)
+            logger.debug(
+                f"[{self.workspace}] Compacted {len(old_segments)} segments of {self.namespace} into one with {live} vectors"
+            )
+        else:
+            rows = np.array(
+                sorted(
+                    self._id_to_row[id] for id in self._dirty_ids if id in self._id_to_row
+                ),
+                dtype=np.int64,
+            )
+            self._segments.append(
+                self._write_segment(rows, sorted(self._deleted_ids))
+            )
+            self._persisted_rows += len(rows)
+            self._write_manifest()
+
+        self._dirty_ids = set()
+        self._deleted_ids = set()
+
+    def _load(self):
+        """Replay all segments listed in the manifest."""
+        if not os.path.exists(self._manifest_file):
+            logger.info(
+                f"[{self.workspace}] No existing vector segments found for {self.namespace}"
+            )
+            return
+
+        try:
+            with open(self._manifest_file, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("dim") != self._dim:
+                raise ValueError(
+                    f"embedding dim {self._dim} does not match stored dim {manifest.get('dim')}"
+                )
+            segments = manifest["segments"]
+
+            for position, segment in enumerate(segments):
+                vectors_path, meta_path = self._segment_paths(segment["name"])
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    segment_data = json.load(f)
+                vectors = np.load(vectors_path, mmap_mode="r")
+                if position == 0 and len(segments) == 1:
+                    # Serve a fully compacted store straight from the memory map
+                    self._vectors = vectors
+                    self._vectors_mapped = True
+                    self._alive = np.ones(len(vectors), dtype=bool)
+                    self._metas = segment_data["rows"]
+                    self._id_to_row = {
+                        meta["__id__"]: row
+                        for row, meta in enumerate(segment_data["rows"])
+                    }
+                    self._count = len(vectors)
+                else:
+                    self._remove_rows(segment_data["deleted"])
+                    if segment_data["rows"]:
+                        self._append_rows(segment_data["rows"], vectors)
+
+            self._segments = segments
+            self._next_segment = manifest["next_segment"]
+            self._persisted_rows = sum(segment["rows"] for segment in segments)
+            self._maybe_compact_memory()
+            logger.info(
+                f"[{self.workspace}] Loaded {len(self._id_to_row)} vectors from {len(segments)} segments for {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Failed to load vector segments for {self.namespace}: {e}"
+            )
+            logger.warning(f"[{self.workspace}] Starting with an empty vector storage.")
+            self._reset()
+
+    async def _get_storage(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            # Check if data needs to be reloaded
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._reset()
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+
+    # --------------------------------------------------------------------------------
+    # BaseVectorStorage API
+    # --------------------------------------------------------------------------------
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+
+        await self._get_storage()
+        async with self._storage_lock:
+            self._append_rows(list_data, self._normalize(embeddings))
+            self._dirty_ids.update(data.keys())
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = query_embedding
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = embedding[0]
+        embedding = self._normalize(np.asarray(embedding).reshape(-1))
+
+        await self._get_storage()
+        if self._count == 0 or top_k <= 0:
+            return []
+
+        scores = self._vectors[: self._count] @ embedding
+        scores = np.where(self._alive[: self._count], scores, -np.inf)
+        k = min(top_k, self._count)
+        top_rows = np.argpartition(-scores, k - 1)[:k]
+        top_rows = top_rows[np.argsort(-scores[top_rows], kind="stable")]
+
+        results = []
+        for row in top_rows.tolist():
+            score = float(scores[row])
+            if score < self.cosine_better_than_threshold:
+                break
+            results.append({**self._to_record(self._metas[row]), "distance": score})
+        return results
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Score all queries against the vector matrix with a single matrix product"""
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        if not embeddings:
+            return []
+        query_matrix = self._normalize(
+            np.asarray(embeddings).reshape(len(embeddings), -1)
+        )
+
+        await self._get_storage()
+        if self._count == 0 or top_k <= 0:
+            return [[] for _ in embeddings]
+
+        scores = query_matrix @ self._vectors[: self._count].T
+        scores = np.where(self._alive[: self._count], scores, -np.inf)
+        k = min(top_k, self._count)
+        top_rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top_rows, axis=1)
+        top_rows = np.take_along_axis(
+            top_rows, np.argsort(-top_scores, axis=1, kind="stable"), axis=1
+        )
+
+        batch_results = []
+        for row_scores, rows in zip(scores, top_rows):
+            results = []
+            for row in rows.tolist():
+                score = float(row_scores[row])
+                if score < self.cosine_better_than_threshold:
+                    break
+                results.append(
+                    {**self._to_record(self._metas[row]), "distance": score}
+                )
+            batch_results.append(results)
+        return batch_results
+
+    @property
+    async def client_storage(self):
+        await self._get_storage()
+        return {
+            "data": [self._metas[row] for row in self._live_rows().tolist()],
+        }
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        await self._get_storage()
+        async with self._storage_lock:
+            deleted_count = self._remove_rows(ids)
+            self._deleted_ids.update(ids)
+            self._maybe_compact_memory()
+        logger.debug(
+            f"[{self.workspace}] Successfully deleted {deleted_count} vectors from {self.namespace}"
+        )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(
+            f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+        )
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        await self._get_storage()
+        ids_to_delete = [
+            id
+            for id, row in self._id_to_row.items()
+            if self._metas[row].get("src_id") == entity_name
+            or self._metas[row].get("tgt_id") == entity_name
+        ]
+        logger.debug(
+            f"[{self.workspace}] Found {len(ids_to_delete)} relations for entity {entity_name}"
+        )
+        if ids_to_delete:
+            await self.delete(ids_to_delete)
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._reset()
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                # Save data to disk
+                self._save()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._get_storage()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        return self._to_record(self._metas[row])
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._get_storage()
+        results: list[dict[str, Any] | None] = []
+        for id in ids:
+            row = self._id_to_row.get(id)
+            results.append(None if row is None else self._to_record(self._metas[row]))
+        return results
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        await self._get_storage()
+        found_ids = [id for id in ids if id in self._id_to_row]
+        if not found_ids:
+            return {}
+        rows = np.fromiter(
+            (self._id_to_row[id] for id in found_ids),
+            dtype=np.int64,
+            count=len(found_ids),
+        )
+        # Gather all requested rows with one fancy-indexing operation
+        return dict(zip(found_ids, self._vectors[rows].tolist()))
+
+    async def get_vectors_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as a (n, dim) float32 matrix in found-ID order"""
+        await self._get_storage()
+        found_ids = [id for id in ids if id in self._id_to_row]
+        rows = np.fromiter(
+            (self._id_to_row[id] for id in found_ids),
+            dtype=np.int64,
+            count=len(found_ids),
+        )
+        return found_ids, np.asarray(self._vectors[rows], dtype=np.float32)
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove all segment files and the manifest
+        2. Reset the in-memory matrix
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        This method is intended for use in scenarios where all data needs to be removed,
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                segments = self._segments
+                self._reset()
+                if os.path.exists(self._manifest_file):
+                    os.remove(self._manifest_file)
+                self._remove_segment_files(segments)
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._manifest_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
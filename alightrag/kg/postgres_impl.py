@@ -3639,18 +3639,7 @@ class PGGraphStorage(BaseGraphStorage):
                 "PostgreSQL: node properties must contain an 'entity_id' field"
             )
 
-        label = self._normalize_node_id(node_id)
-        properties = self._format_properties(node_data)
-
-        query = """SELECT * FROM cypher('%s', $$
-                     MERGE (n:base {entity_id: "%s"})
-                     SET n += %s
-                     RETURN n
-                   $$) AS (n agtype)""" % (
-            self.graph_name,
-            label,
-            properties,
-        )
+        query = self._upsert_node_query(node_id, node_data)
 
         try:
             await self._query(query, readonly=False, upsert=True)
@@ -3677,11 +3666,39 @@ class PGGraphStorage(BaseGraphStorage):
             target_node_id (str): Label of the target node (used as identifier)
             edge_data (dict): dictionary of properties to set on the edge
         """
+        query = self._upsert_edge_query(source_node_id, target_node_id, edge_data)
+
+        try:
+            await self._query(query, readonly=False, upsert=True)
+
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
+            )
+            raise
+
+    def _upsert_node_query(self, node_id: str, node_data: dict[str, str]) -> str:
+        label = self._normalize_node_id(node_id)
+        properties = self._format_properties(node_data)
+
+        return """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype)""" % (
+            self.graph_name,
+            label,
+            properties,
+        )
+
+    def _upsert_edge_query(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> str:
         src_label = self._normalize_node_id(source_node_id)
         tgt_label = self._normalize_node_id(target_node_id)
         edge_properties = self._format_properties(edge_data)
 
-        query = """SELECT * FROM cypher('%s', $$
+        return """SELECT * FROM cypher('%s', $$
                      MATCH (source:base {entity_id: "%s"})
                      WITH source
                      MATCH (target:base {entity_id: "%s"})
@@ -3697,14 +3714,67 @@ class PGGraphStorage(BaseGraphStorage):
             edge_properties,  # https://github.com/HKUDS/LightRAG/issues/1438#issuecomment-2826000195
         )
 
-        try:
-            await self._query(query, readonly=False, upsert=True)
+    async def upsert_nodes_batch(
+        self, nodes: list[tuple[str, dict[str, str]]], batch_size: int = 500
+    ) -> None:
+        """
+        Upsert multiple nodes, sending the Cypher MERGE statements of each batch in one round-trip.
 
-        except Exception:
-            logger.error(
-                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
+        The statements of a batch run in one implicit transaction. If a batch fails
+        (e.g. on a concurrent insert of the same node), its nodes are upserted one by one.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+            batch_size: Number of nodes per round-trip
+        """
+        for _, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "PostgreSQL: node properties must contain an 'entity_id' field"
+                )
+
+        for i in range(0, len(nodes), batch_size):
+            batch = nodes[i : i + batch_size]
+            query = ";\n".join(
+                self._upsert_node_query(node_id, node_data)
+                for node_id, node_data in batch
             )
-            raise
+            try:
+                await self._query(query, readonly=False)
+            except PGGraphQueryException as e:
+                logger.warning(
+                    f"[{self.workspace}] POSTGRES, batch node upsert failed, upserting {len(batch)} nodes one by one: {e}"
+                )
+                for node_id, node_data in batch:
+                    await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]], batch_size: int = 500
+    ) -> None:
+        """
+        Upsert multiple edges, sending the Cypher MERGE statements of each batch in one round-trip.
+
+        The statements of a batch run in one implicit transaction. If a batch fails,
+        its edges are upserted one by one.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+            batch_size: Number of edges per round-trip
+        """
+        for i in range(0, len(edges), batch_size):
+            batch = edges[i : i + batch_size]
+            query = ";\n".join(
+                self._upsert_edge_query(src, tgt, edge_data)
+                for src, tgt, edge_data in batch
+            )
+            try:
+                await self._query(query, readonly=False)
+            except PGGraphQueryException as e:
+                logger.warning(
+                    f"[{self.workspace}] POSTGRES, batch edge upsert failed, upserting {len(batch)} edges one by one: {e}"
+                )
+                for src, tgt, edge_data in batch:
+                    await self.upsert_edge(src, tgt, edge_data)
 
     async def delete_node(self, node_id: str) -> None:
         """
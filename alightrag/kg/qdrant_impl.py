@@ -441,6 +441,46 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             for dp in results
         ]
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Run all query vectors as one server-side batch query"""
+        embeddings = await self._embed_queries(queries, query_embeddings)
+        if not embeddings:
+            return []
+
+        query_filter = models.Filter(
+            must=[workspace_filter_condition(self.effective_workspace)]
+        )
+        responses = self._client.query_batch_points(
+            collection_name=self.final_namespace,
+            requests=[
+                models.QueryRequest(
+                    query=list(embedding),
+                    limit=top_k,
+                    with_payload=True,
+                    score_threshold=self.cosine_better_than_threshold,
+                    filter=query_filter,
+                )
+                for embedding in embeddings
+            ],
+        )
+
+        return [
+            [
+                {
+                    **dp.payload,
+                    "distance": dp.score,
+                    CREATED_AT_FIELD: dp.payload.get(CREATED_AT_FIELD),
+                }
+                for dp in response.points
+            ]
+            for response in responses
+        ]
+
     async def index_done_callback(self) -> None:
         # Qdrant handles persistence automatically
         pass
@@ -1296,6 +1296,10 @@ async def initialize_pipeline_status():
                 "request_pending": False,  # Flag for pending request for processing
                 "latest_message": "",  # Latest message from pipeline processing
                 "history_messages": history_messages,  # 使用共享列表对象
+                "chunks_extracted": 0,  # Chunks extracted in the current job
+                "chunks_per_minute": 0.0,  # Chunk extraction throughput
+                "stages": {},  # Per-stage queue depth and latency
+                "bulk_merge_conflicts": 0,  # Bulk merges that raced with another merge
             }
         )
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
@@ -11,6 +11,7 @@ from openai import (
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
+    DefaultAsyncHttpxClient,
 )
 from openai.types.chat import ChatCompletionMessageParam
 
@@ -25,11 +26,39 @@ from alightrag.utils import (
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
     logger,
+    create_pooled_httpx_client,
+    get_shared_http_client,
 )
 
 import numpy as np
 
 
+def get_azure_openai_async_client(
+    base_url: str | None,
+    deployment: str | None,
+    api_key: str | None,
+    api_version: str | None,
+) -> AsyncAzureOpenAI:
+    """Return the shared AsyncAzureOpenAI client for the endpoint and deployment.
+
+    The client keeps a pooled connection to the endpoint across calls and is closed
+    by `release_shared_http_clients` when the last AlightRAG instance is finalized.
+    """
+    return get_shared_http_client(
+        "azure_openai",
+        base_url,
+        api_key,
+        {"deployment": deployment, "api_version": api_version},
+        lambda: AsyncAzureOpenAI(
+            azure_endpoint=base_url,
+            azure_deployment=deployment,
+            api_key=api_key,
+            api_version=api_version,
+            http_client=create_pooled_httpx_client(DefaultAsyncHttpxClient),
+        ),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -67,14 +96,12 @@ async def azure_openai_complete_if_cache(
 
     kwargs.pop("hashing_kv", None)
     kwargs.pop("keyword_extraction", None)
-    timeout = kwargs.pop("timeout", None)
-
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
-        timeout=timeout,
+    # Timeout is applied per request, the client is shared
+    if kwargs.get("timeout") is None:
+        kwargs.pop("timeout", None)
+
+    openai_async_client = get_azure_openai_async_client(
+        base_url, deployment, api_key, api_version
     )
     messages = []
     if system_prompt:
@@ -165,11 +192,8 @@ async def azure_openai_embed(
         or os.getenv("OPENAI_API_VERSION")
     )
 
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
+    openai_async_client = get_azure_openai_async_client(
+        base_url, deployment, api_key, api_version
     )
 
     response = await openai_async_client.embeddings.create(
@@ -14,6 +14,7 @@ from openai import (
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
+    DefaultAsyncHttpxClient,
 )
 from tenacity import (
     retry,
@@ -25,6 +26,8 @@ from alightrag.utils import (
     wrap_embedding_func_with_attrs,
     safe_unicode_decode,
     logger,
+    create_pooled_httpx_client,
+    get_shared_http_client,
 )
 
 from alightrag.types import GPTKeywordExtractionFormat
@@ -120,6 +123,43 @@ def create_openai_async_client(
     return AsyncOpenAI(**merged_configs)
 
 
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    client_configs: dict[str, Any] | None = None,
+) -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client for the given configuration.
+
+    The client is created once per (base_url, api_key, client_configs) and event loop
+    by `create_openai_async_client`, with a connection pool sized by the HTTP_* settings
+    unless client_configs provides its own http_client. It is kept open for later calls
+    so that connections are reused, and closed by `release_shared_http_clients`
+    when the last AlightRAG instance is finalized.
+
+    Args:
+        api_key: OpenAI API key. If None, uses the OPENAI_API_KEY environment variable.
+        base_url: Base URL for the OpenAI API. If None, uses the default OpenAI API URL.
+        client_configs: Additional configuration options for the AsyncOpenAI client.
+
+    Returns:
+        A shared AsyncOpenAI client instance. Callers must not close it.
+    """
+    client_configs = client_configs or {}
+
+    def factory() -> AsyncOpenAI:
+        configs = client_configs
+        if "http_client" not in configs:
+            configs = {
+                **configs,
+                "http_client": create_pooled_httpx_client(DefaultAsyncHttpxClient),
+            }
+        return create_openai_async_client(
+            api_key=api_key, base_url=base_url, client_configs=configs
+        )
+
+    return get_shared_http_client("openai", base_url, api_key, client_configs, factory)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -179,7 +219,8 @@ async def openai_complete_if_cache(
             Special kwargs:
             - openai_client_configs: Dict of configuration options for the AsyncOpenAI client.
                 These will be passed to the client constructor but will be overridden by
-                explicit parameters (api_key, base_url).
+                explicit parameters (api_key, base_url). Calls with the same base_url,
+                api_key and client configs share one pooled client.
 
     Returns:
         The completed text (with integrated COT content if available) or an async iterator
@@ -204,8 +245,8 @@ async def openai_complete_if_cache(
     # Extract client configuration options
     client_configs = kwargs.pop("openai_client_configs", {})
 
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         client_configs=client_configs,
@@ -247,21 +288,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -392,8 +429,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -425,93 +460,74 @@ async def openai_complete_if_cache(
                                 f"Unexpected error during stream response cleanup: {close_error}"
                             )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-            content = getattr(message, "content", None)
-            reasoning_content = getattr(message, "reasoning_content", "")
-
-            # Handle COT logic for non-streaming responses (only if enabled)
-            final_content = ""
-
-            if enable_cot:
-                # Check if we should include reasoning content
-                should_include_reasoning = False
-                if reasoning_content and reasoning_content.strip():
-                    if not content or content.strip() == "":
-                        # Case 1: Only reasoning content, should include COT
-                        should_include_reasoning = True
-                        final_content = (
-                            content or ""
-                        )  # Use empty string if content is None
-                    else:
-                        # Case 3: Both content and reasoning_content present, ignore reasoning
-                        should_include_reasoning = False
-                        final_content = content
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+        content = getattr(message, "content", None)
+        reasoning_content = getattr(message, "reasoning_content", "")
+
+        # Handle COT logic for non-streaming responses (only if enabled)
+        final_content = ""
+
+        if enable_cot:
+            # Check if we should include reasoning content
+            should_include_reasoning = False
+            if reasoning_content and reasoning_content.strip():
+                if not content or content.strip() == "":
+                    # Case 1: Only reasoning content, should include COT
+                    should_include_reasoning = True
+                    final_content = (
+                        content or ""
+                    )  # Use empty string if content is None
                 else:
-                    # No reasoning content, use regular content
-                    final_content = content or ""
-
-                # Apply COT wrapping if needed
-                if should_include_reasoning:
-                    if r"\u" in reasoning_content:
-                        reasoning_content = safe_unicode_decode(
-                            reasoning_content.encode("utf-8")
-                        )
-                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+                    # Case 3: Both content and reasoning_content present, ignore reasoning
+                    should_include_reasoning = False
+                    final_content = content
             else:
-                # COT disabled, only use regular content
+                # No reasoning content, use regular content
                 final_content = content or ""
 
-            # Validate final content
-            if not final_content or final_content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
+            # Apply COT wrapping if needed
+            if should_include_reasoning:
+                if r"\u" in reasoning_content:
+                    reasoning_content = safe_unicode_decode(
+                        reasoning_content.encode("utf-8")
+                    )
+                final_content = f"<think>{reasoning_content}</think>{final_content}"
+        else:
+            # COT disabled, only use regular content
+            final_content = content or ""
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+        # Validate final content
+        if not final_content or final_content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
+
+        return final_content
 
 
 async def openai_complete(
@@ -650,38 +666,37 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Get the shared OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
-        # Prepare API call parameters
-        api_params = {
-            "model": model,
-            "input": texts,
-            "encoding_format": "base64",
-        }
-
-        # Add dimensions parameter only if embedding_dim is provided
-        if embedding_dim is not None:
-            api_params["dimensions"] = embedding_dim
+    # Prepare API call parameters
+    api_params = {
+        "model": model,
+        "input": texts,
+        "encoding_format": "base64",
+    }
 
-        # Make API call
-        response = await openai_async_client.embeddings.create(**api_params)
+    # Add dimensions parameter only if embedding_dim is provided
+    if embedding_dim is not None:
+        api_params["dimensions"] = embedding_dim
 
-        if token_tracker and hasattr(response, "usage"):
-            token_counts = {
-                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                "total_tokens": getattr(response.usage, "total_tokens", 0),
-            }
-            token_tracker.add_usage(token_counts)
+    # Make API call
+    response = await openai_async_client.embeddings.create(**api_params)
 
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    if token_tracker and hasattr(response, "usage"):
+        token_counts = {
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+            "total_tokens": getattr(response.usage, "total_tokens", 0),
+        }
+        token_tracker.add_usage(token_counts)
+
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
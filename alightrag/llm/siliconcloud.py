@@ -24,10 +24,11 @@ from tenacity import (
 
 
 import numpy as np
-import aiohttp
 import base64
 import struct
 
+from alightrag.utils import get_shared_aiohttp_session
+
 
 @retry(
     stop=stop_after_attempt(3),
@@ -53,12 +54,12 @@ async def siliconcloud_embedding(
     payload = {"model": model, "input": truncate_texts, "encoding_format": "base64"}
 
     base64_strings = []
-    async with aiohttp.ClientSession() as session:
-        async with session.post(base_url, headers=headers, json=payload) as response:
-            content = await response.json()
-            if "code" in content:
-                raise ValueError(content)
-            base64_strings = [item["embedding"] for item in content["data"]]
+    session = get_shared_aiohttp_session(base_url)
+    async with session.post(base_url, headers=headers, json=payload) as response:
+        content = await response.json()
+        if "code" in content:
+            raise ValueError(content)
+        base64_strings = [item["embedding"] for item in content["data"]]
 
     embeddings = []
     for string in base64_strings:
@@ -3,10 +3,13 @@ from functools import partial
 from pathlib import Path
 
 import asyncio
+import copy
 import json
+from contextlib import nullcontext
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal, Callable
-from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Iterator, overload, Literal, Callable
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
 
 from alightrag.exceptions import PipelineCancelledException
 from alightrag.utils import (
@@ -17,9 +20,13 @@ from alightrag.utils import (
     sanitize_and_normalize_extracted_text,
     pack_user_ass_to_openai_messages,
     split_string_by_multi_markers,
-    truncate_list_by_token_size,
+    atruncate_list_by_token_size,
+    count_tokens_batch,
+    run_cpu_bound,
+    PipelineStage,
     compute_args_hash,
     handle_cache,
+    get_kg_version,
     save_to_cache,
     CacheData,
     use_llm_func_with_cache,
@@ -94,59 +101,121 @@ def _truncate_entity_identifier(
     return display_value
 
 
-def chunking_by_token_size(
+def _iter_split(content: str, separator: str) -> Iterator[str]:
+    """Lazy equivalent of content.split(separator)."""
+    start = 0
+    while True:
+        end = content.find(separator, start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + len(separator)
+
+
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    text: str,
+    overlap_token_size: int,
+    max_token_size: int,
+    split_by_character: bool,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, text) for overlapping windows of max_token_size tokens.
+
+    With token byte offsets the window text is sliced from the UTF-8 encoded text;
+    otherwise the token window is decoded. When splitting by character, text that
+    already fits into one window is returned as is.
+    """
+    encode_with_byte_offsets = getattr(tokenizer, "encode_with_byte_offsets", None)
+    encoded = encode_with_byte_offsets(text) if encode_with_byte_offsets else None
+    text_bytes = None
+    if encoded is None:
+        tokens, offsets = tokenizer.encode(text), None
+    else:
+        tokens, offsets = encoded
+        text_bytes = text.encode("utf-8", errors="surrogatepass")
+        if offsets[-1] != len(text_bytes):
+            # Offsets only map onto text if encoding round-trips byte for byte
+            tokens, offsets = tokenizer.encode(text), None
+
+    total = len(tokens)
+    if offsets is not None:
+        # Windows are sliced by offset, the token ids themselves are no longer needed
+        del tokens
+    if split_by_character and total <= max_token_size:
+        yield total, text
+        return
+    for start in range(0, total, max_token_size - overlap_token_size):
+        end = start + max_token_size
+        if offsets is None:
+            window = tokenizer.decode(tokens[start:end])
+        else:
+            # Same as tokenizer.decode: partial characters at window edges become U+FFFD
+            window = text_bytes[offsets[start] : offsets[min(end, total)]].decode(
+                "utf-8", errors="replace"
+            )
+        yield min(max_token_size, total - start), window
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Lazily yield the chunks of chunking_by_token_size, one at a time.
+
+    Each piece of text is tokenized once, and chunk text is sliced from the input
+    using token byte offsets where the tokenizer provides them, so large documents can
+    be chunked incrementally (e.g. from a worker thread) while earlier chunks are
+    already being processed.
+    """
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
+        pieces = _iter_split(content, split_by_character)
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
+        pieces = iter([content])
+
+    index = 0
+    for piece in pieces:
+        if split_by_character and split_by_character_only:
+            windows = [(len(tokenizer.encode(piece)), piece)]
+        else:
+            windows = _iter_token_windows(
+                tokenizer,
+                piece,
+                overlap_token_size,
+                max_token_size,
+                bool(split_by_character),
             )
-    return results
+        for token_count, chunk in windows:
+            yield {
+                "tokens": token_count,
+                "content": chunk.strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
 
 
 async def _handle_entity_relation_summary(
@@ -166,6 +235,9 @@ async def _handle_entity_relation_summary(
     4. Summarize each chunk, then recursively process the summaries
     5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge
 
+    All groups of a map round are summarized concurrently (bounded by the LLM limiter), and each
+    description is tokenized only once across all rounds.
+
     Args:
         entity_or_relation_name: Name of the entity or relation being summarized
         description_list: List of description strings to summarize
@@ -192,10 +264,28 @@ async def _handle_entity_relation_summary(
     current_list = description_list[:]  # Copy the list to avoid modifying original
     llm_was_used = False  # Track whether LLM was used during the entire process
 
+    # Token length per description, shared by all rounds of this call
+    token_lengths: dict[str, int] = {}
+
+    def token_len(desc: str) -> int:
+        length = token_lengths.get(desc)
+        if length is None:
+            length = token_lengths[desc] = len(tokenizer.encode(desc))
+        return length
+
     # Iterative map-reduce process
     while True:
+        # Tokenize new descriptions in one batch off the event loop
+        new_descs = list(
+            {desc: None for desc in current_list if desc not in token_lengths}
+        )
+        if new_descs:
+            token_lengths.update(
+                zip(new_descs, await count_tokens_batch(tokenizer, new_descs))
+            )
+
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(token_len(desc) for desc in current_list)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -229,7 +319,7 @@ async def _handle_entity_relation_summary(
 
         # Currently least 3 descriptions in current_list
         for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
+            desc_tokens = token_len(desc)
 
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
@@ -259,26 +349,27 @@ async def _handle_entity_relation_summary(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
         )
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
+        # Reduce phase: summarize all multi-description groups concurrently
+        async def summarize_chunk(chunk: list[str]) -> str:
             if len(chunk) == 1:
                 # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
-                )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+                return chunk[0]
+            return await _summarize_descriptions(
+                description_type,
+                entity_or_relation_name,
+                chunk,
+                global_config,
+                llm_response_cache,
+            )
+
+        new_summaries = await asyncio.gather(
+            *(summarize_chunk(chunk) for chunk in chunks)
+        )
+        if any(len(chunk) > 1 for chunk in chunks):
+            llm_was_used = True  # Mark that LLM was used in reduce phase
 
         # Update current list with new summaries for next iteration
-        current_list = new_summaries
+        current_list = list(new_summaries)
 
 
 async def _summarize_descriptions(
@@ -316,8 +407,8 @@ async def _summarize_descriptions(
     # Create list of JSON objects with "Description" field
     json_descriptions = [{"Description": desc} for desc in description_list]
 
-    # Use truncate_list_by_token_size for length truncation
-    truncated_json_descriptions = truncate_list_by_token_size(
+    # Use atruncate_list_by_token_size for length truncation
+    truncated_json_descriptions = await atruncate_list_by_token_size(
         json_descriptions,
         key=lambda x: json.dumps(x, ensure_ascii=False),
         max_token_size=summary_context_size,
@@ -349,7 +440,7 @@ async def _summarize_descriptions(
     return summary
 
 
-async def _handle_single_entity_extraction(
+def _handle_single_entity_extraction(
     record_attributes: list[str],
     chunk_key: str,
     timestamp: int,
@@ -421,7 +512,7 @@ async def _handle_single_entity_extraction(
         return None
 
 
-async def _handle_single_relationship_extraction(
+def _handle_single_relationship_extraction(
     record_attributes: list[str],
     chunk_key: str,
     timestamp: int,
@@ -887,6 +978,27 @@ async def _process_extraction_result(
     file_path: str = "unknown_source",
     tuple_delimiter: str = "<|#|>",
     completion_delimiter: str = "<|COMPLETE|>",
+) -> tuple[dict, dict]:
+    """Process a single extraction result on the CPU executor (see _parse_extraction_result)"""
+    return await run_cpu_bound(
+        _parse_extraction_result,
+        result,
+        chunk_key,
+        timestamp,
+        file_path,
+        tuple_delimiter,
+        completion_delimiter,
+        size=len(result),
+    )
+
+
+def _parse_extraction_result(
+    result: str,
+    chunk_key: str,
+    timestamp: int,
+    file_path: str = "unknown_source",
+    tuple_delimiter: str = "<|#|>",
+    completion_delimiter: str = "<|COMPLETE|>",
 ) -> tuple[dict, dict]:
     """Process a single extraction result (either initial or gleaning)
     Args:
@@ -967,7 +1079,7 @@ async def _process_extraction_result(
         record_attributes = split_string_by_multi_markers(record, [tuple_delimiter])
 
         # Try to parse as entity
-        entity_data = await _handle_single_entity_extraction(
+        entity_data = _handle_single_entity_extraction(
             record_attributes, chunk_key, timestamp, file_path
         )
         if entity_data is not None:
@@ -982,7 +1094,7 @@ async def _process_extraction_result(
             continue
 
         # Try to parse as relationship
-        relationship_data = await _handle_single_relationship_extraction(
+        relationship_data = _handle_single_relationship_extraction(
             record_attributes, chunk_key, timestamp, file_path
         )
         if relationship_data is not None:
@@ -2368,6 +2480,260 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+def _undirected_edge_key(src_id: str, tgt_id: str) -> tuple[str, str]:
+    return (src_id, tgt_id) if src_id <= tgt_id else (tgt_id, src_id)
+
+
+def _reset_entry(data: dict, key: Any, value: Any) -> None:
+    if value is None:
+        data.pop(key, None)
+    else:
+        data[key] = value
+
+
+class _BufferedGraphView:
+    """Graph reads served from prefetched data, writes buffered for one flush"""
+
+    def __init__(self, nodes: dict[str, dict], edges: dict[tuple[str, str], dict]):
+        self._nodes = nodes
+        self._edges = edges
+        self.node_writes: dict[str, dict] = {}
+        self.edge_writes: dict[tuple[str, str], tuple[str, str, dict]] = {}
+
+    async def get_node(self, node_id: str) -> dict | None:
+        return self._nodes.get(node_id)
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        return _undirected_edge_key(source_node_id, target_node_id) in self._edges
+
+    async def get_edge(self, source_node_id: str, target_node_id: str) -> dict | None:
+        return self._edges.get(_undirected_edge_key(source_node_id, target_node_id))
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        # Storages merge upserted properties into an existing node
+        merged = {**(self._nodes.get(node_id) or {}), **node_data}
+        self._nodes[node_id] = self.node_writes[node_id] = merged
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        key = _undirected_edge_key(source_node_id, target_node_id)
+        merged = {**(self._edges.get(key) or {}), **edge_data}
+        self._edges[key] = merged
+        self.edge_writes[key] = (source_node_id, target_node_id, merged)
+
+    def reset_node(self, node_id: str, node_data: dict | None) -> None:
+        """Replace a node with reloaded data and drop its buffered write"""
+        _reset_entry(self._nodes, node_id, node_data)
+        self.node_writes.pop(node_id, None)
+
+    def reset_edge(self, key: tuple[str, str], edge_data: dict | None) -> None:
+        """Replace an edge with reloaded data and drop its buffered write"""
+        _reset_entry(self._edges, key, edge_data)
+        self.edge_writes.pop(key, None)
+
+
+class _BufferedKVView:
+    """KV reads served from prefetched records, writes buffered for one flush"""
+
+    def __init__(self, records: dict[str, dict]):
+        self._records = records
+        self.writes: dict[str, dict] = {}
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        return self._records.get(id)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        self._records.update(data)
+        self.writes.update(data)
+
+    def reset(self, id: str, record: dict | None) -> None:
+        """Replace a record with reloaded data and drop its buffered write"""
+        _reset_entry(self._records, id, record)
+        self.writes.pop(id, None)
+
+
+class _BufferedVectorView:
+    """Vector writes buffered for one flush"""
+
+    def __init__(self):
+        self.writes: dict[str, dict] = {}
+        self.deletes: set[str] = set()
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        self.writes.update(data)
+
+    async def delete(self, ids: list[str]) -> None:
+        self.deletes.update(ids)
+
+
+class _BulkMergeBuffer:
+    """Prefetched storage state and buffered writes for a bulk merge.
+
+    The views expose the storage methods used by _merge_nodes_then_upsert and
+    _merge_edges_then_upsert, so the per-item merge logic runs unchanged on in-memory
+    data (later merges see earlier writes) and each storage gets batched writes in flush().
+    """
+
+    def __init__(
+        self,
+        knowledge_graph_inst: BaseGraphStorage,
+        entity_vdb: BaseVectorStorage | None,
+        relationships_vdb: BaseVectorStorage | None,
+        entity_chunks_storage: BaseKVStorage | None,
+        relation_chunks_storage: BaseKVStorage | None,
+    ):
+        self._graph = knowledge_graph_inst
+        self._entity_vdb = entity_vdb
+        self._relationships_vdb = relationships_vdb
+        self._entity_chunks = entity_chunks_storage
+        self._relation_chunks = relation_chunks_storage
+        self.graph: _BufferedGraphView | None = None
+        self.entity_vdb = _BufferedVectorView() if entity_vdb is not None else None
+        self.relationships_vdb = (
+            _BufferedVectorView() if relationships_vdb is not None else None
+        )
+        self.entity_chunks: _BufferedKVView | None = None
+        self.relation_chunks: _BufferedKVView | None = None
+        self.node_ids: list[str] = []
+
+    async def prefetch(
+        self, all_nodes: dict[str, list], all_edges: dict[tuple[str, str], list]
+    ) -> None:
+        """Load every node, edge and chunk-tracking record the merge can touch"""
+        self.node_ids = list(
+            dict.fromkeys(
+                [*all_nodes, *(node_id for edge in all_edges for node_id in edge)]
+            )
+        )
+        self._edge_keys = [_undirected_edge_key(*edge) for edge in all_edges]
+        # Storages may return their live records, which later merges update in place
+        self._snapshot = copy.deepcopy(await self._read())
+        nodes, edges, entity_chunks, relation_chunks = copy.deepcopy(self._snapshot)
+        self.graph = _BufferedGraphView(nodes, edges)
+        if self._entity_chunks is not None:
+            self.entity_chunks = _BufferedKVView(entity_chunks)
+        if self._relation_chunks is not None:
+            self.relation_chunks = _BufferedKVView(relation_chunks)
+
+    async def reload_changed(self) -> tuple[list[str], list[tuple[str, str]]]:
+        """Reload the records that another merge changed since the prefetch.
+
+        Callers hold the keyed locks of node_ids. Changed nodes, changed edges and the
+        edges of changed nodes are reset to the reloaded data and their buffered writes
+        are dropped, so that they can be merged again. Returns their node ids and edge
+        keys.
+        """
+        nodes, edges, entity_chunks, relation_chunks = copy.deepcopy(
+            await self._read()
+        )
+        old_nodes, old_edges, old_entity_chunks, old_relation_chunks = self._snapshot
+        changed_nodes = [
+            node_id
+            for node_id in self.node_ids
+            if nodes.get(node_id) != old_nodes.get(node_id)
+            or entity_chunks.get(node_id) != old_entity_chunks.get(node_id)
+        ]
+        changed_node_set = set(changed_nodes)
+        changed_edges = []
+        for edge in self._edge_keys:
+            chunk_key = make_relation_chunk_key(*edge)
+            if (
+                edge[0] in changed_node_set
+                or edge[1] in changed_node_set
+                or edges.get(edge) != old_edges.get(edge)
+                or relation_chunks.get(chunk_key) != old_relation_chunks.get(chunk_key)
+            ):
+                changed_edges.append(edge)
+
+        for node_id in changed_nodes:
+            self.graph.reset_node(node_id, nodes.get(node_id))
+            if self.entity_chunks is not None:
+                self.entity_chunks.reset(node_id, entity_chunks.get(node_id))
+        for edge in changed_edges:
+            self.graph.reset_edge(edge, edges.get(edge))
+            if self.relation_chunks is not None:
+                chunk_key = make_relation_chunk_key(*edge)
+                self.relation_chunks.reset(chunk_key, relation_chunks.get(chunk_key))
+        return changed_nodes, changed_edges
+
+    async def _read(self) -> tuple[dict, dict, dict, dict]:
+        relation_chunk_keys = [
+            make_relation_chunk_key(*edge) for edge in self._edge_keys
+        ]
+
+        async def get_records(storage: BaseKVStorage | None, ids: list[str]):
+            if storage is None or not ids:
+                return {}
+            return {
+                id: record
+                for id, record in zip(ids, await storage.get_by_ids(ids))
+                if record
+            }
+
+        nodes, edges, entity_chunks, relation_chunks = await asyncio.gather(
+            self._graph.get_nodes_batch(self.node_ids),
+            self._graph.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in self._edge_keys]
+            ),
+            get_records(self._entity_chunks, self.node_ids),
+            get_records(self._relation_chunks, relation_chunk_keys),
+        )
+        return (
+            dict(nodes),
+            {_undirected_edge_key(*key): edge for key, edge in edges.items()},
+            entity_chunks,
+            relation_chunks,
+        )
+
+    async def flush(self) -> None:
+        """Write buffered changes with one batched call per storage"""
+
+        async def flush_graph():
+            # Nodes first, since edges need both of their nodes
+            await self._graph.upsert_nodes_batch(list(self.graph.node_writes.items()))
+            await self._graph.upsert_edges_batch(list(self.graph.edge_writes.values()))
+
+        async def flush_kv(storage: BaseKVStorage | None, view: _BufferedKVView):
+            if storage is not None and view.writes:
+                await storage.upsert(view.writes)
+
+        async def flush_vdb(
+            storage: BaseVectorStorage | None,
+            view: _BufferedVectorView | None,
+            operation_name: str,
+        ):
+            if storage is None:
+                return
+            # Upserts replace records, only ids that are not rewritten need deleting
+            stale_ids = list(view.deletes - view.writes.keys())
+            if stale_ids:
+                try:
+                    await storage.delete(stale_ids)
+                except Exception as e:
+                    logger.debug(f"Could not delete old vector records: {e}")
+            if view.writes:
+                await safe_vdb_operation_with_exception(
+                    operation=lambda payload=view.writes: storage.upsert(payload),
+                    operation_name=operation_name,
+                    entity_name=f"{len(view.writes)} records",
+                    max_retries=3,
+                    retry_delay=0.2,
+                )
+
+        await asyncio.gather(
+            flush_graph(),
+            flush_kv(self._entity_chunks, self.entity_chunks),
+            flush_kv(self._relation_chunks, self.relation_chunks),
+            flush_vdb(self._entity_vdb, self.entity_vdb, "bulk_entity_upsert"),
+            flush_vdb(
+                self._relationships_vdb,
+                self.relationships_vdb,
+                "bulk_relationship_upsert",
+            ),
+        )
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -2393,6 +2759,11 @@ async def merge_nodes_and_edges(
     2. Phase 2: Process all relationships concurrently (may add missing entities)
     3. Phase 3: Update full_entities and full_relations storage with final results
 
+    With enable_bulk_merge, the nodes, edges and chunk-tracking records are prefetched
+    with batch reads, phases 1 and 2 merge in memory and every storage is written with
+    batched upserts before phase 3. The affected keys are locked only for the write-back;
+    nodes and edges that another merge changed in the meantime are merged again first.
+
     Args:
         chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
         knowledge_graph_inst: Knowledge graph storage
@@ -2445,6 +2816,29 @@ async def merge_nodes_and_edges(
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    # Storages the merge works on: buffered views over prefetched data in bulk mode
+    bulk_merge = global_config.get("enable_bulk_merge", False)
+    bulk_buffer = None
+    merge_graph = knowledge_graph_inst
+    merge_entity_vdb = entity_vdb
+    merge_relationships_vdb = relationships_vdb
+    merge_entity_chunks = entity_chunks_storage
+    merge_relation_chunks = relation_chunks_storage
+    if bulk_merge:
+        bulk_buffer = _BulkMergeBuffer(
+            knowledge_graph_inst,
+            entity_vdb,
+            relationships_vdb,
+            entity_chunks_storage,
+            relation_chunks_storage,
+        )
+        await bulk_buffer.prefetch(all_nodes, all_edges)
+        merge_graph = bulk_buffer.graph
+        merge_entity_vdb = bulk_buffer.entity_vdb
+        merge_relationships_vdb = bulk_buffer.relationships_vdb
+        merge_entity_chunks = bulk_buffer.entity_chunks
+        merge_relation_chunks = bulk_buffer.relation_chunks
+
     # ===== Phase 1: Process all entities concurrently =====
     log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -2464,21 +2858,25 @@ async def merge_nodes_and_edges(
 
             workspace = global_config.get("workspace", "")
             namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
+            async with (
+                nullcontext()
+                if bulk_merge  # Bulk views are private until the locked flush
+                else get_storage_keyed_lock(
+                    [entity_name], namespace=namespace, enable_logging=False
+                )
             ):
                 try:
                     logger.debug(f"Processing entity {entity_name}")
                     entity_data = await _merge_nodes_then_upsert(
                         entity_name,
                         entities,
-                        knowledge_graph_inst,
-                        entity_vdb,
+                        merge_graph,
+                        merge_entity_vdb,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
                         llm_response_cache,
-                        entity_chunks_storage,
+                        merge_entity_chunks,
                     )
 
                     return entity_data
@@ -2567,10 +2965,14 @@ async def merge_nodes_and_edges(
             namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
             sorted_edge_key = sorted([edge_key[0], edge_key[1]])
 
-            async with get_storage_keyed_lock(
-                sorted_edge_key,
-                namespace=namespace,
-                enable_logging=False,
+            async with (
+                nullcontext()
+                if bulk_merge  # Bulk views are private until the locked flush
+                else get_storage_keyed_lock(
+                    sorted_edge_key,
+                    namespace=namespace,
+                    enable_logging=False,
+                )
             ):
                 try:
                     added_entities = []  # Track entities added during edge processing
@@ -2580,16 +2982,16 @@ async def merge_nodes_and_edges(
                         edge_key[0],
                         edge_key[1],
                         edges,
-                        knowledge_graph_inst,
-                        relationships_vdb,
-                        entity_vdb,
+                        merge_graph,
+                        merge_relationships_vdb,
+                        merge_entity_vdb,
                         global_config,
                         pipeline_status,
                         pipeline_status_lock,
                         llm_response_cache,
                         added_entities,  # Pass list to collect added entities
-                        relation_chunks_storage,
-                        entity_chunks_storage,  # Add entity_chunks_storage parameter
+                        merge_relation_chunks,
+                        merge_entity_chunks,  # Add entity_chunks_storage parameter
                     )
 
                     if edge_data is None:
@@ -2666,6 +3068,47 @@ async def merge_nodes_and_edges(
         if first_exception is not None:
             raise first_exception
 
+    if bulk_buffer is not None:
+        # Keys are locked only for the write-back; nodes and edges that another merge
+        # changed since the prefetch are merged again on the reloaded data first
+        workspace = global_config.get("workspace", "")
+        namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+        async with get_storage_keyed_lock(
+            bulk_buffer.node_ids, namespace=namespace, enable_logging=False
+        ):
+            changed_nodes, changed_edges = await bulk_buffer.reload_changed()
+            if changed_nodes or changed_edges:
+                log_message = f"Bulk merge of {doc_id} raced with another merge, re-merging {len(changed_nodes)} entities and {len(changed_edges)} relations"
+                logger.info(log_message)
+                async with pipeline_status_lock:
+                    pipeline_status["bulk_merge_conflicts"] = (
+                        pipeline_status.get("bulk_merge_conflicts", 0) + 1
+                    )
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
+
+                # Entities first, as for the whole document
+                await asyncio.gather(
+                    *(
+                        _locked_process_entity_name(entity_name, all_nodes[entity_name])
+                        for entity_name in changed_nodes
+                        if entity_name in all_nodes
+                    )
+                )
+                await asyncio.gather(
+                    *(
+                        _locked_process_edges(edge_key, all_edges[edge_key])
+                        for edge_key in changed_edges
+                    )
+                )
+            await bulk_buffer.flush()
+
+        log_message = f"Bulk merge written: {len(bulk_buffer.graph.node_writes)} nodes, {len(bulk_buffer.graph.edge_writes)} edges"
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
         try:
@@ -2738,6 +3181,45 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+class ChunkExtractionScheduler:
+    """One queue of chunk extraction jobs shared by all documents of a pipeline run.
+
+    At most ``max_async`` chunks are extracted at a time, and free slots go to the
+    documents in turn, so the chunks of a few large documents cannot hold back small
+    documents. Producers ``stage.put`` chunks before extracting them and wait once
+    ``queue_size`` chunks are queued. Also tracks extraction throughput for the
+    pipeline status.
+    """
+
+    def __init__(self, max_async: int, queue_size: int, window: float = 60.0):
+        self.stage = PipelineStage("extract", max_async, queue_size)
+        self._window = window
+        self._started_at = time.monotonic()
+        self._completions: deque[float] = deque()
+        self.chunks_extracted = 0
+
+    def slot(self, doc_id: str):
+        """Async context manager holding one extraction slot for a chunk of ``doc_id``"""
+        return self.stage.slot(doc_id)
+
+    def record_chunk(self) -> None:
+        now = time.monotonic()
+        self.chunks_extracted += 1
+        self._completions.append(now)
+        while self._completions[0] < now - self._window:
+            self._completions.popleft()
+
+    def chunks_per_minute(self) -> float:
+        """Chunks extracted per minute over the recent window"""
+        now = time.monotonic()
+        while self._completions and self._completions[0] < now - self._window:
+            self._completions.popleft()
+        elapsed = min(self._window, now - self._started_at)
+        if elapsed <= 0:
+            return 0.0
+        return len(self._completions) * 60.0 / elapsed
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -2745,6 +3227,7 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    chunk_scheduler: ChunkExtractionScheduler | None = None,
 ) -> list:
     # Check for cancellation at the start of entity extraction
     if pipeline_status is not None and pipeline_status_lock is not None:
@@ -2907,10 +3390,19 @@ async def extract_entities(
         relations_count = len(maybe_edges)
         log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
         logger.info(log_message)
+        if chunk_scheduler is not None:
+            chunk_scheduler.record_chunk()
         if pipeline_status is not None:
             async with pipeline_status_lock:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
+                if chunk_scheduler is not None:
+                    pipeline_status["chunks_extracted"] = (
+                        chunk_scheduler.chunks_extracted
+                    )
+                    pipeline_status["chunks_per_minute"] = round(
+                        chunk_scheduler.chunks_per_minute(), 1
+                    )
 
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
@@ -2919,8 +3411,14 @@ async def extract_entities(
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
+    def _extraction_slot(chunk):
+        # Chunks share the pipeline-wide queue when a scheduler is given
+        if chunk_scheduler is not None:
+            return chunk_scheduler.slot(chunk[1].get("full_doc_id", ""))
+        return semaphore
+
     async def _process_with_semaphore(chunk):
-        async with semaphore:
+        async with _extraction_slot(chunk):
             # Check for cancellation before processing chunk
             if pipeline_status is not None and pipeline_status_lock is not None:
                 async with pipeline_status_lock:
@@ -2996,6 +3494,7 @@ async def kg_query(
     chunks_vdb: BaseVectorStorage = None,
     use_reasoning: bool = True,
     use_reflection: bool = False,
+    need_raw_data: bool = True,
 ) -> QueryResult | None:
     """
     Execute knowledge graph query and return unified QueryResult object.
@@ -3011,6 +3510,10 @@ async def kg_query(
         hashing_kv: Cache storage
         system_prompt: System prompt
         chunks_vdb: Document chunks vector database
+        use_reasoning: Whether alightrag mode runs reasoning over the retrieved context
+        use_reflection: Whether alightrag mode runs reflection over the retrieved context
+        need_raw_data: Whether the caller uses raw_data; if not, a query cache hit is
+            returned before any context is built
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -3059,6 +3562,43 @@ async def kg_query(
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
+    # Query cache fast path: the cache key only depends on the query, its keywords,
+    # QueryParam and the knowledge graph version, so a hit is served before retrieval
+    args_hash = None
+    queryparam_dict = None
+    cached_response = None
+    if not (query_param.only_need_context or query_param.only_need_prompt):
+        kg_version = await get_kg_version(hashing_kv)
+        queryparam_dict = {
+            "mode": query_param.mode,
+            "response_type": query_param.response_type,
+            "top_k": query_param.top_k,
+            "chunk_top_k": query_param.chunk_top_k,
+            "max_entity_tokens": query_param.max_entity_tokens,
+            "max_relation_tokens": query_param.max_relation_tokens,
+            "max_total_tokens": query_param.max_total_tokens,
+            "hl_keywords": hl_keywords_str,
+            "ll_keywords": ll_keywords_str,
+            "user_prompt": query_param.user_prompt or "",
+            "enable_rerank": query_param.enable_rerank,
+            "kg_version": kg_version,
+        }
+        if query_param.mode == "alightrag":
+            queryparam_dict["use_reasoning"] = use_reasoning
+            queryparam_dict["use_reflection"] = use_reflection
+        args_hash = compute_args_hash(query, *queryparam_dict.values())
+
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, query, query_param.mode, cache_type="query"
+        )
+        if cached_result is not None:
+            cached_response, _ = cached_result  # Extract content, ignore timestamp
+            logger.info(
+                " == LLM cache == Query cache hit, using cached response as query result"
+            )
+            if not need_raw_data:
+                return QueryResult(content=cached_response)
+
     # Build query context (unified interface)
     # alightrag-insert TODO
     if query_param.mode == "alightrag":
@@ -3075,6 +3615,7 @@ async def kg_query(
             use_model_func,
             use_reasoning,
             use_reflection,
+            hashing_kv,
         )
     else:
         context_result = await _build_query_context(
@@ -3093,6 +3634,10 @@ async def kg_query(
         logger.info("[kg_query] No query context could be built; returning no-result.")
         return None
 
+    # Context was only built to provide raw_data for the cached answer
+    if cached_response is not None:
+        return QueryResult(content=cached_response, raw_data=context_result.raw_data)
+
     # Return different content based on query parameters
     if query_param.only_need_context and not query_param.only_need_prompt:
         return QueryResult(
@@ -3132,90 +3677,39 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
-    logger.info(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+    len_of_prompts, query_tokens, sys_prompt_tokens = await count_tokens_batch(
+        tokenizer, [query + sys_prompt, query, sys_prompt]
     )
-
-    # Handle cache
-    args_hash = compute_args_hash(
-        query_param.mode,
-        query,
-        query_param.response_type,
-        query_param.top_k,
-        query_param.chunk_top_k,
-        query_param.max_entity_tokens,
-        query_param.max_relation_tokens,
-        query_param.max_total_tokens,
-        hl_keywords_str,
-        ll_keywords_str,
-        query_param.user_prompt or "",
-        query_param.enable_rerank,
+    logger.info(
+        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
     )
 
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
+    # response call
+    # alightrag-insert TODO
+    logger.info(
+        f"[kg_query] response started"
     )
-
-    if cached_result is not None:
-        cached_response, _ = cached_result  # Extract content, ignore timestamp
-        logger.info(
-            " == LLM cache == Query cache hit, using cached response as query result"
+    if query_param.mode == "alightrag":
+        response_query=context_result.context
+        response = await use_model_func(
+            response_query,
+            system_prompt=sys_prompt,
+            history_messages=query_param.conversation_history,
+            enable_cot=True,
+            stream=query_param.stream,
         )
-        response = cached_response
     else:
-        # response call
-        # alightrag-insert TODO
-        logger.info(
-            f"[kg_query] response started"
-        )
-        if query_param.mode == "alightrag":
-            response_query=context_result.context
-            response = await use_model_func(
-                response_query,
-                system_prompt=sys_prompt,
-                history_messages=query_param.conversation_history,
-                enable_cot=True,
-                stream=query_param.stream,
-            )
-        else:
-            response = await use_model_func(
-                user_query,
-                system_prompt=sys_prompt,
-                history_messages=query_param.conversation_history,
-                enable_cot=True,
-                stream=query_param.stream,
-            )
-        logger.info(f"response -> {response}")
-        logger.info(
-            f"[kg_query] response completed"
+        response = await use_model_func(
+            user_query,
+            system_prompt=sys_prompt,
+            history_messages=query_param.conversation_history,
+            enable_cot=True,
+            stream=query_param.stream,
         )
-
-        if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
-            queryparam_dict = {
-                "mode": query_param.mode,
-                "response_type": query_param.response_type,
-                "top_k": query_param.top_k,
-                "chunk_top_k": query_param.chunk_top_k,
-                "max_entity_tokens": query_param.max_entity_tokens,
-                "max_relation_tokens": query_param.max_relation_tokens,
-                "max_total_tokens": query_param.max_total_tokens,
-                "hl_keywords": hl_keywords_str,
-                "ll_keywords": ll_keywords_str,
-                "user_prompt": query_param.user_prompt or "",
-                "enable_rerank": query_param.enable_rerank,
-            }
-            await save_to_cache(
-                hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=response,
-                    prompt=query,
-                    mode=query_param.mode,
-                    cache_type="query",
-                    queryparam=queryparam_dict,
-                ),
-            )
+    logger.info(f"response -> {response}")
+    logger.info(
+        f"[kg_query] response completed"
+    )
 
     # Return unified result based on actual response type
     if isinstance(response, str):
@@ -3231,6 +3725,20 @@ async def kg_query(
                 .strip()
             )
 
+        # Cache the cleaned answer so the fast path can return it without the prompt
+        if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
+            await save_to_cache(
+                hashing_kv,
+                CacheData(
+                    args_hash=args_hash,
+                    content=response,
+                    prompt=query,
+                    mode=query_param.mode,
+                    cache_type="query",
+                    queryparam=queryparam_dict,
+                ),
+            )
+
         return QueryResult(content=response, raw_data=context_result.raw_data)
     else:
         # Streaming response (AsyncIterator)
@@ -3318,7 +3826,7 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    (len_of_prompts,) = await count_tokens_batch(tokenizer, [kw_prompt])
     logger.info(
         f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
     )
@@ -3439,6 +3947,53 @@ async def _get_vector_context(
         return []
 
 
+async def _get_search_embeddings(
+    query: str,
+    ll_keywords: str,
+    hl_keywords: str,
+    text_chunks_db: BaseKVStorage,
+    query_param: QueryParam,
+    chunks_vdb: BaseVectorStorage = None,
+) -> tuple[list[float] | None, list[float] | None, list[float] | None]:
+    """
+    Embed the query and the keywords of a search with a single embedding call.
+
+    The query is embedded only when a vector operation needs it (vector chunk
+    picking or chunks_vdb); the keywords only when the search mode queries the
+    matching vector store. Texts that are not needed, and all texts when the
+    embedding call fails, get None and are embedded by the vector storage instead.
+
+    Returns:
+        Tuple of (query_embedding, ll_embedding, hl_embedding)
+    """
+    kg_chunk_pick_method = text_chunks_db.global_config.get(
+        "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
+    )
+    texts = [
+        query if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb) else "",
+        ll_keywords if query_param.mode != "global" else "",
+        hl_keywords if query_param.mode != "local" else "",
+    ]
+    unique_texts = list(dict.fromkeys(t for t in texts if t))
+    actual_embedding_func = text_chunks_db.embedding_func
+    if not unique_texts or not actual_embedding_func:
+        return None, None, None
+
+    try:
+        embeddings = await actual_embedding_func(unique_texts)
+    except Exception as e:
+        logger.warning(f"Failed to pre-compute query embeddings: {e}")
+        return None, None, None
+    logger.info(
+        f"Pre-computed {len(unique_texts)} query embeddings for all vector operations"
+    )
+    embedding_of = dict(zip(unique_texts, embeddings))
+    query_embedding, ll_embedding, hl_embedding = (
+        embedding_of.get(t) if t else None for t in texts
+    )
+    return query_embedding, ll_embedding, hl_embedding
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -3468,23 +4023,10 @@ async def _perform_kg_search(
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
-    # Pre-compute query embedding once for all vector operations
-    kg_chunk_pick_method = text_chunks_db.global_config.get(
-        "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
+    # Pre-compute the query and keyword embeddings once for all vector operations
+    query_embedding, ll_embedding, hl_embedding = await _get_search_embeddings(
+        query, ll_keywords, hl_keywords, text_chunks_db, query_param, chunks_vdb
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
-        actual_embedding_func = text_chunks_db.embedding_func
-        if actual_embedding_func:
-            try:
-                query_embedding = await actual_embedding_func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.info("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
 
     # Handle local and global modes
     if query_param.mode == "local" and len(ll_keywords) > 0:
@@ -3493,6 +4035,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            ll_embedding,
         )
 
     elif query_param.mode == "global" and len(hl_keywords) > 0:
@@ -3501,6 +4044,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            hl_embedding,
         )
 
     else:  # hybrid or mix mode
@@ -3510,6 +4054,7 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 entities_vdb,
                 query_param,
+                ll_embedding,
             )
         if len(hl_keywords) > 0:
             global_relations, global_entities = await _get_edge_data(
@@ -3517,6 +4062,7 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 relationships_vdb,
                 query_param,
+                hl_embedding,
             )
 
         # Get vector chunks for mix mode
@@ -3608,6 +4154,392 @@ async def _perform_kg_search(
     }
 
 
+def _relation_key(relation: dict) -> tuple:
+    """Direction-independent identifier of a relation returned by KG search."""
+    if "src_tgt" in relation:
+        return tuple(sorted(relation["src_tgt"]))
+    return tuple(sorted([relation.get("src_id"), relation.get("tgt_id")]))
+
+
+@dataclass
+class KGRetrievalSession:
+    """
+    Incremental KG retrieval state shared by the iterations of one alightrag query.
+
+    The first search returns the same entities and relations as `_perform_kg_search`.
+    Later searches reuse the memoized keyword lookups, embed the new retrieval texts
+    in a single call, fetch graph data only for nodes and edges not seen before and
+    return only the entities, relations and chunks that were not returned yet.
+    Per-iteration cost counters are collected in `iteration_costs`.
+    """
+
+    knowledge_graph_inst: BaseGraphStorage
+    entities_vdb: BaseVectorStorage
+    relationships_vdb: BaseVectorStorage
+    text_chunks_db: BaseKVStorage
+    query_param: QueryParam
+    chunks_vdb: BaseVectorStorage | None = None
+
+    seen_entities: set[str] = field(default_factory=set)
+    seen_relations: set[tuple] = field(default_factory=set)
+    seen_chunks: set[str] = field(default_factory=set)
+    iteration_costs: list[dict[str, int]] = field(default_factory=list)
+
+    _embeddings: dict[str, list[float]] = field(default_factory=dict, repr=False)
+    _vdb_results: dict[tuple[str, str], list[dict]] = field(
+        default_factory=dict, repr=False
+    )
+    _nodes: dict[str, dict | None] = field(default_factory=dict, repr=False)
+    _node_degrees: dict[str, int] = field(default_factory=dict, repr=False)
+    _node_edges: dict[str, list[tuple]] = field(default_factory=dict, repr=False)
+    _edges: dict[tuple, dict | None] = field(default_factory=dict, repr=False)
+    _edge_degrees: dict[tuple, int] = field(default_factory=dict, repr=False)
+    _costs: dict[str, int] = field(default_factory=dict, repr=False)
+
+    @property
+    def total_costs(self) -> dict[str, int]:
+        """Cost counters summed over all iterations."""
+        totals: dict[str, int] = defaultdict(int)
+        for costs in self.iteration_costs:
+            for key, value in costs.items():
+                if key != "iteration":
+                    totals[key] += value
+        return dict(totals)
+
+    async def search(
+        self,
+        query: str,
+        ll_keywords: str,
+        hl_keywords: str,
+        extra_query: str = "",
+    ) -> dict[str, Any]:
+        """
+        Run one retrieval iteration and return only results not returned before.
+
+        Args:
+            query: Retrieval query, embedded for vector chunk picking
+            ll_keywords: Low-level keywords for the entity vector search
+            hl_keywords: High-level keywords for the relationship vector search
+            extra_query: Additional retrieval text (e.g. supplementary questions)
+                searched against both entity and relationship vector stores
+
+        Returns:
+            Search result in the `_perform_kg_search` format
+        """
+        self._costs = {
+            "iteration": len(self.iteration_costs) + 1,
+            "embedding_calls": 0,
+            "vdb_queries": 0,
+            "vdb_queries_reused": 0,
+            "nodes_fetched": 0,
+            "nodes_reused": 0,
+            "edges_fetched": 0,
+            "edges_reused": 0,
+            "new_entities": 0,
+            "new_relations": 0,
+            "new_chunks": 0,
+        }
+        mode = self.query_param.mode
+
+        kg_chunk_pick_method = self.text_chunks_db.global_config.get(
+            "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
+        )
+        need_query_embedding = bool(query) and (
+            kg_chunk_pick_method == "VECTOR" or self.chunks_vdb is not None
+        )
+        entity_queries = []
+        relation_queries = []
+        if mode != "global" and ll_keywords:
+            entity_queries.append(ll_keywords)
+        if mode != "local" and hl_keywords:
+            relation_queries.append(hl_keywords)
+        if extra_query:
+            if mode != "global":
+                entity_queries.append(extra_query)
+            if mode != "local":
+                relation_queries.append(extra_query)
+
+        await self._embed(
+            [query if need_query_embedding else ""] + entity_queries + relation_queries
+        )
+        query_embedding = self._embeddings.get(query) if need_query_embedding else None
+
+        local_entities, local_relations = [], []
+        entity_results = await self._query_vdb(
+            "entities", self.entities_vdb, entity_queries
+        )
+        for results in entity_results:
+            entities, relations = await self._local_search(results)
+            local_entities.extend(entities)
+            local_relations.extend(relations)
+
+        global_entities, global_relations = [], []
+        relation_results = await self._query_vdb(
+            "relationships", self.relationships_vdb, relation_queries
+        )
+        for results in relation_results:
+            relations, entities = await self._global_search(results)
+            global_relations.extend(relations)
+            global_entities.extend(entities)
+
+        vector_chunks = []
+        chunk_tracking = {}
+        if mode == "mix" and self.chunks_vdb:
+            cache_key = ("chunks", query)
+            if cache_key in self._vdb_results:
+                self._costs["vdb_queries_reused"] += 1
+            else:
+                self._costs["vdb_queries"] += 1
+                self._vdb_results[cache_key] = await _get_vector_context(
+                    query, self.chunks_vdb, self.query_param, query_embedding
+                )
+            for i, chunk in enumerate(self._vdb_results[cache_key]):
+                chunk_id = chunk.get("chunk_id") or chunk.get("id")
+                if not chunk_id or chunk_id in self.seen_chunks:
+                    continue
+                self.seen_chunks.add(chunk_id)
+                vector_chunks.append(chunk)
+                chunk_tracking[chunk_id] = {
+                    "source": "C",
+                    "frequency": 1,  # Vector chunks always have frequency 1
+                    "order": i + 1,  # 1-based order in vector search results
+                }
+
+        # Round-robin merge, keeping only items not returned by earlier iterations
+        final_entities = []
+        for i in range(max(len(local_entities), len(global_entities))):
+            for source in (local_entities, global_entities):
+                if i < len(source):
+                    entity_name = source[i].get("entity_name")
+                    if entity_name and entity_name not in self.seen_entities:
+                        final_entities.append(source[i])
+                        self.seen_entities.add(entity_name)
+
+        final_relations = []
+        for i in range(max(len(local_relations), len(global_relations))):
+            for source in (local_relations, global_relations):
+                if i < len(source):
+                    rel_key = _relation_key(source[i])
+                    if rel_key not in self.seen_relations:
+                        final_relations.append(source[i])
+                        self.seen_relations.add(rel_key)
+
+        self._costs["new_entities"] = len(final_entities)
+        self._costs["new_relations"] = len(final_relations)
+        self._costs["new_chunks"] = len(vector_chunks)
+        self.iteration_costs.append(self._costs)
+        logger.info(f"[KGRetrievalSession] Iteration costs: {self._costs}")
+
+        return {
+            "final_entities": final_entities,
+            "final_relations": final_relations,
+            "vector_chunks": vector_chunks,
+            "chunk_tracking": chunk_tracking,
+            "query_embedding": query_embedding,
+        }
+
+    async def _embed(self, texts: list[str]) -> None:
+        """Embed all texts not embedded yet with a single embedding call."""
+        missing = [t for t in dict.fromkeys(texts) if t and t not in self._embeddings]
+        embedding_func = self.text_chunks_db.embedding_func
+        if not missing or not embedding_func:
+            return
+        try:
+            self._costs["embedding_calls"] += 1
+            embeddings = await embedding_func(missing)
+            for text, embedding in zip(missing, embeddings):
+                self._embeddings[text] = embedding
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embedding: {e}")
+
+    async def _query_vdb(
+        self, store: str, vdb: BaseVectorStorage, texts: list[str]
+    ) -> list[list[dict]]:
+        """Query texts not queried before with one batch search, in text order."""
+        missing = [
+            t for t in dict.fromkeys(texts) if (store, t) not in self._vdb_results
+        ]
+        self._costs["vdb_queries_reused"] += len(texts) - len(missing)
+        if missing:
+            logger.info(
+                f"Query {store}: {missing} (top_k:{self.query_param.top_k}, cosine:{vdb.cosine_better_than_threshold})"
+            )
+            self._costs["vdb_queries"] += len(missing)
+            embeddings = [self._embeddings.get(t) for t in missing]
+            if any(e is None for e in embeddings):
+                embeddings = None
+                self._costs["embedding_calls"] += 1  # Embedded inside the vector storage
+            batch_results = await vdb.query_batch(
+                missing, top_k=self.query_param.top_k, query_embeddings=embeddings
+            )
+            for text, results in zip(missing, batch_results):
+                self._vdb_results[(store, text)] = results
+        return [self._vdb_results[(store, t)] for t in texts]
+
+    async def _fetch_nodes(self, names: list[str], with_degrees: bool) -> None:
+        unique_names = list(dict.fromkeys(names))
+        missing_nodes = [n for n in unique_names if n not in self._nodes]
+        missing_degrees = (
+            [n for n in unique_names if n not in self._node_degrees]
+            if with_degrees
+            else []
+        )
+        self._costs["nodes_fetched"] += len(missing_nodes)
+        self._costs["nodes_reused"] += len(unique_names) - len(missing_nodes)
+        if not missing_nodes and not missing_degrees:
+            return
+
+        nodes_dict, degrees_dict = await asyncio.gather(
+            self.knowledge_graph_inst.get_nodes_batch(missing_nodes)
+            if missing_nodes
+            else asyncio.sleep(0, result={}),
+            self.knowledge_graph_inst.node_degrees_batch(missing_degrees)
+            if missing_degrees
+            else asyncio.sleep(0, result={}),
+        )
+        for name in missing_nodes:
+            self._nodes[name] = nodes_dict.get(name)
+        for name in missing_degrees:
+            self._node_degrees[name] = degrees_dict.get(name, 0)
+
+    async def _fetch_edges(self, pairs: list[tuple], with_degrees: bool) -> None:
+        unique_pairs = list(dict.fromkeys(pairs))
+        missing_edges = [p for p in unique_pairs if p not in self._edges]
+        missing_degrees = (
+            [p for p in unique_pairs if p not in self._edge_degrees]
+            if with_degrees
+            else []
+        )
+        self._costs["edges_fetched"] += len(missing_edges)
+        self._costs["edges_reused"] += len(unique_pairs) - len(missing_edges)
+        if not missing_edges and not missing_degrees:
+            return
+
+        edge_data_dict, edge_degrees_dict = await asyncio.gather(
+            self.knowledge_graph_inst.get_edges_batch(
+                [{"src": p[0], "tgt": p[1]} for p in missing_edges]
+            )
+            if missing_edges
+            else asyncio.sleep(0, result={}),
+            self.knowledge_graph_inst.edge_degrees_batch(missing_degrees)
+            if missing_degrees
+            else asyncio.sleep(0, result={}),
+        )
+        for pair in missing_edges:
+            edge_props = edge_data_dict.get(pair)
+            if edge_props is not None and "weight" not in edge_props:
+                logger.warning(
+                    f"Edge {pair} missing 'weight' attribute, using default value 1.0"
+                )
+                edge_props["weight"] = 1.0
+            self._edges[pair] = edge_props
+        for pair in missing_degrees:
+            self._edge_degrees[pair] = edge_degrees_dict.get(pair, 0)
+
+    async def _local_search(self, results: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Incremental counterpart of `_get_node_data` for entity vector results."""
+        if not results:
+            return [], []
+
+        node_ids = [r["entity_name"] for r in results]
+        await self._fetch_nodes(node_ids, with_degrees=True)
+        if not all(self._nodes.get(nid) is not None for nid in node_ids):
+            logger.warning("Some nodes are missing, maybe the storage is damaged")
+
+        node_datas = [
+            {
+                **self._nodes[k["entity_name"]],
+                "entity_name": k["entity_name"],
+                "rank": self._node_degrees.get(k["entity_name"], 0),
+                "created_at": k.get("created_at"),
+            }
+            for k in results
+            if self._nodes.get(k["entity_name"]) is not None
+        ]
+
+        # Edges of the retrieved entities, see `_find_most_related_edges_from_entities`
+        node_names = [dp["entity_name"] for dp in node_datas]
+        missing_names = [n for n in node_names if n not in self._node_edges]
+        if missing_names:
+            batch_edges_dict = (
+                await self.knowledge_graph_inst.get_nodes_edges_batch(missing_names)
+            )
+            for name in missing_names:
+                self._node_edges[name] = batch_edges_dict.get(name) or []
+
+        all_edges = []
+        seen = set()
+        for node_name in node_names:
+            for e in self._node_edges[node_name]:
+                sorted_edge = tuple(sorted(e))
+                if sorted_edge not in seen:
+                    seen.add(sorted_edge)
+                    all_edges.append(sorted_edge)
+
+        await self._fetch_edges(all_edges, with_degrees=True)
+        use_relations = [
+            {
+                "src_tgt": pair,
+                "rank": self._edge_degrees.get(pair, 0),
+                **self._edges[pair],
+            }
+            for pair in all_edges
+            if self._edges.get(pair) is not None
+        ]
+        use_relations = sorted(
+            use_relations, key=lambda x: (x["rank"], x["weight"]), reverse=True
+        )
+
+        logger.info(
+            f"Local query: {len(node_datas)} entites, {len(use_relations)} relations"
+        )
+        return node_datas, use_relations
+
+    async def _global_search(
+        self, results: list[dict]
+    ) -> tuple[list[dict], list[dict]]:
+        """Incremental counterpart of `_get_edge_data` for relation vector results."""
+        if not results:
+            return [], []
+
+        await self._fetch_edges(
+            [(r["src_id"], r["tgt_id"]) for r in results], with_degrees=False
+        )
+        edge_datas = []
+        for k in results:
+            edge_props = self._edges.get((k["src_id"], k["tgt_id"]))
+            if edge_props is not None:
+                edge_datas.append(
+                    {
+                        "src_id": k["src_id"],
+                        "tgt_id": k["tgt_id"],
+                        "created_at": k.get("created_at", None),
+                        **edge_props,
+                    }
+                )
+
+        # Entities of the retrieved relations, see
+        # `_find_most_related_entities_from_relationships`
+        entity_names = list(
+            dict.fromkeys(
+                name for e in edge_datas for name in (e["src_id"], e["tgt_id"])
+            )
+        )
+        await self._fetch_nodes(entity_names, with_degrees=False)
+        use_entities = []
+        for entity_name in entity_names:
+            node = self._nodes.get(entity_name)
+            if node is None:
+                logger.warning(f"Node '{entity_name}' not found in batch retrieval.")
+                continue
+            use_entities.append({**node, "entity_name": entity_name})
+
+        logger.info(
+            f"Global query: {len(use_entities)} entites, {len(edge_datas)} relations"
+        )
+        return edge_datas, use_entities
+
+
 async def _apply_token_truncation(
     search_result: dict[str, Any],
     query_param: QueryParam,
@@ -3709,7 +4641,7 @@ async def _apply_token_truncation(
             entity_copy.pop("created_at", None)
             entities_context_for_truncation.append(entity_copy)
 
-        entities_context = truncate_list_by_token_size(
+        entities_context = await atruncate_list_by_token_size(
             entities_context_for_truncation,
             key=lambda x: "\n".join(
                 json.dumps(item, ensure_ascii=False) for item in [x]
@@ -3727,7 +4659,7 @@ async def _apply_token_truncation(
             relation_copy.pop("created_at", None)
             relations_context_for_truncation.append(relation_copy)
 
-        relations_context = truncate_list_by_token_size(
+        relations_context = await atruncate_list_by_token_size(
             relations_context_for_truncation,
             key=lambda x: "\n".join(
                 json.dumps(item, ensure_ascii=False) for item in [x]
@@ -3945,18 +4877,18 @@ async def _build_context_str(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
 
-    # Calculate preliminary system prompt tokens
+    # Preliminary system prompt for overhead calculation
     pre_sys_prompt = sys_prompt_template.format(
         context_data="",  # Empty for overhead calculation
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    kg_context_tokens, sys_prompt_tokens, query_tokens = await count_tokens_batch(
+        tokenizer, [pre_kg_context, pre_sys_prompt, query]
+    )
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -4176,14 +5108,14 @@ async def _alightrag_build_context_str(
         reference_list_str="",
         question=query,
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
 
-    # Calculate preliminary system prompt tokens
+    # Preliminary system prompt for overhead calculation
     pre_sys_prompt = sys_prompt_template
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    kg_context_tokens, sys_prompt_tokens, query_tokens = await count_tokens_batch(
+        tokenizer, [pre_kg_context, pre_sys_prompt, query]
+    )
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
             sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -4473,6 +5405,17 @@ async def _build_query_context(
     # combined <prompt-templated context + detailed/formatted data>
 
 
+async def _cancel_speculative_task(task: asyncio.Task) -> None:
+    """Cancel a speculative task that is no longer needed and wait for it to unwind."""
+    if task.done():
+        # Retrieve the outcome so a failed speculation is not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
 # alightrag-insert TODO
 async def _alightrag_build_query_context(
         query: str,
@@ -4487,6 +5430,7 @@ async def _alightrag_build_query_context(
         use_model_func: Callable[..., object] = None,
         use_reasoning: bool = True,
         use_reflection: bool = True,
+        hashing_kv: BaseKVStorage | None = None,
 ) -> QueryContextResult | None:
     """
     Main query context building function using AlightRAG architecture:
@@ -4495,12 +5439,55 @@ async def _alightrag_build_query_context(
     1.2. Reasoning
     1.3. Reflection
 
+    Reasoning and reflection responses are cached in hashing_kv (cache types
+    "reasoning" and "reflection"), keyed on the formatted prompt.
+
     Returns unified QueryContextResult containing both context and raw_data.
     """
     if not query:
         logger.warning("Query is empty, skipping context building")
         return None
 
+    llm_cache_stats = {
+        "reasoning": {"hits": 0, "misses": 0},
+        "reflection": {"hits": 0, "misses": 0},
+    }
+
+    async def cached_model_call(cache_type: str, prompt: str, system_prompt: str):
+        """Call use_model_func through the query cache, keyed on the formatted prompt."""
+        history = query_param.conversation_history or []
+        args_hash = compute_args_hash(
+            system_prompt, prompt, json.dumps(history, ensure_ascii=False)
+        )
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, prompt, query_param.mode, cache_type=cache_type
+        )
+        if cached_result is not None:
+            llm_cache_stats[cache_type]["hits"] += 1
+            logger.info(f"[AlightRAG] {cache_type} cache hit")
+            return cached_result[0]
+
+        llm_cache_stats[cache_type]["misses"] += 1
+        response = await use_model_func(
+            prompt,
+            system_prompt=system_prompt,
+            history_messages=query_param.conversation_history,
+            enable_cot=True,
+            stream=query_param.stream,
+        )
+        if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
+            await save_to_cache(
+                hashing_kv,
+                CacheData(
+                    args_hash=args_hash,
+                    content=response,
+                    prompt=prompt,
+                    mode=query_param.mode,
+                    cache_type=cache_type,
+                ),
+            )
+        return response
+
     # Helper function to format entities and relationships for prompts
     def format_for_prompts(entities_list, relations_list):
         """Convert structured entities/relations to prompt-compatible strings."""
@@ -4658,6 +5645,31 @@ async def _alightrag_build_query_context(
             return {}
 
 
+    async def prefetch_context(entities, relations, chunk_tracking, query_embedding):
+        """Run stage 2 and stage 3 on a snapshot of the accumulated search result."""
+        snapshot = {
+            "final_entities": entities,
+            "final_relations": relations,
+        }
+        truncation = await _apply_token_truncation(
+            snapshot,
+            query_param,
+            text_chunks_db.global_config,
+        )
+        chunks = await _merge_all_chunks(
+            filtered_entities=truncation.get("filtered_entities", []),
+            filtered_relations=truncation.get("filtered_relations", []),
+            vector_chunks=search_result.get("vector_chunks", []),
+            query=query,  # Use original query for merging
+            knowledge_graph_inst=knowledge_graph_inst,
+            text_chunks_db=text_chunks_db,
+            query_param=query_param,
+            chunks_vdb=chunks_vdb,
+            chunk_tracking=chunk_tracking,
+            query_embedding=query_embedding,
+        )
+        return truncation, chunks, chunk_tracking
+
     # Stage 1: Pure search
     user_query = query
     max_iterations = 3  # Default
@@ -4667,6 +5679,26 @@ async def _alightrag_build_query_context(
     retrieval_query = query
     path_result = {}
 
+    # Later iterations only fetch the delta driven by the supplementary questions
+    retrieval_session = KGRetrievalSession(
+        knowledge_graph_inst=knowledge_graph_inst,
+        entities_vdb=entities_vdb,
+        relationships_vdb=relationships_vdb,
+        text_chunks_db=text_chunks_db,
+        query_param=query_param,
+        chunks_vdb=chunks_vdb,
+    )
+
+    # Speculative execution: work that may turn out to be unnecessary is started
+    # alongside the reasoning/reflection LLM calls and cancelled if not needed.
+    speculate = query_param.enable_speculation and (use_reasoning or use_reflection)
+    speculative_context_task: asyncio.Task | None = None
+    prefetched_context = None
+    speculation_stats = {
+        "context_hits": 0,
+        "context_discarded": 0,
+    }
+
     # Initialize with empty search result
     search_result = {
         "final_entities": [],
@@ -4677,236 +5709,252 @@ async def _alightrag_build_query_context(
         "final_paths": []
     }
 
-    while current_iteration < max_iterations:
-        current_iteration += 1
-        logger.info(f"[AlightRAG] Starting iteration {current_iteration}/{max_iterations}")
-
-        # Phase 1: Retrieval
-        logger.info("[AlightRAG] Retrieval started")
-        iteration_search_result = await _perform_kg_search(
-            retrieval_query,
-            ll_keywords,
-            hl_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            relationships_vdb,
-            text_chunks_db,
-            query_param,
-            chunks_vdb,
-        )
-
-        logger.info(f"[AlightRAG] Retrieval completed: {len(iteration_search_result['final_entities'])} entities, "
-                     f"{len(iteration_search_result['final_relations'])} relations")
-
-        # Store original data before filtering
-        iteration_search_result["original_entities"] = iteration_search_result["final_entities"][:] if iteration_search_result[
-            "final_entities"] else []
-        iteration_search_result["original_relations"] = iteration_search_result["final_relations"][:] if iteration_search_result[
-            "final_relations"] else []
-
-        # Combine entities from this iteration with accumulated ones
-        seen_entities = set()
-        combined_entities = []
-        for entity in iteration_search_result["final_entities"] + search_result["final_entities"]:
-            entity_name = entity.get("entity_name")
-            if entity_name and entity_name not in seen_entities:
-                combined_entities.append(entity)
-                seen_entities.add(entity_name)
-        # Combine relations from this iteration with accumulated ones
-        seen_relations = set()
-        combined_relations = []
-        for rel in iteration_search_result["final_relations"] + search_result["final_relations"]:
-            rel_key = (rel.get("src_id"), rel.get("tgt_id"))
-            if rel_key not in seen_relations:
-                combined_relations.append(rel)
-                seen_relations.add(rel_key)
+    try:
+        while current_iteration < max_iterations:
+            current_iteration += 1
+            logger.info(f"[AlightRAG] Starting iteration {current_iteration}/{max_iterations}")
+
+            # Phase 1: Retrieval
+            logger.info("[AlightRAG] Retrieval started")
+            iteration_search_result = await retrieval_session.search(
+                retrieval_query,
+                ll_keywords,
+                hl_keywords,
+                extra_query="; ".join(supplementary_questions),
+            )
 
-        # Update search_result with UNION of all entities/relations
-        search_result["final_entities"] = combined_entities
-        search_result["final_relations"] = combined_relations
-        search_result["vector_chunks"] = search_result.get("vector_chunks", []) + iteration_search_result.get("vector_chunks", [])
-        search_result["chunk_tracking"].update(iteration_search_result.get("chunk_tracking", {}))
-        search_result["query_embedding"] = iteration_search_result.get("query_embedding")
+            logger.info(f"[AlightRAG] Retrieval completed: {len(iteration_search_result['final_entities'])} entities, "
+                         f"{len(iteration_search_result['final_relations'])} relations")
+
+            # Store original data before filtering
+            iteration_search_result["original_entities"] = iteration_search_result["final_entities"][:] if iteration_search_result[
+                "final_entities"] else []
+            iteration_search_result["original_relations"] = iteration_search_result["final_relations"][:] if iteration_search_result[
+                "final_relations"] else []
+
+            # Combine entities from this iteration with accumulated ones. The session
+            # only returns items not returned before, so they are appended to keep the
+            # accumulated items (and their truncation priority) in retrieval order.
+            seen_entities = set()
+            combined_entities = []
+            for entity in search_result["final_entities"] + iteration_search_result["final_entities"]:
+                entity_name = entity.get("entity_name")
+                if entity_name and entity_name not in seen_entities:
+                    combined_entities.append(entity)
+                    seen_entities.add(entity_name)
+            # Combine relations from this iteration with accumulated ones
+            seen_relations = set()
+            combined_relations = []
+            for rel in search_result["final_relations"] + iteration_search_result["final_relations"]:
+                rel_key = (rel.get("src_id"), rel.get("tgt_id"))
+                if rel_key not in seen_relations:
+                    combined_relations.append(rel)
+                    seen_relations.add(rel_key)
+
+            # Update search_result with UNION of all entities/relations
+            search_result["final_entities"] = combined_entities
+            search_result["final_relations"] = combined_relations
+            search_result["vector_chunks"] = search_result.get("vector_chunks", []) + iteration_search_result.get("vector_chunks", [])
+            search_result["chunk_tracking"].update(iteration_search_result.get("chunk_tracking", {}))
+            search_result["query_embedding"] = iteration_search_result.get("query_embedding")
+
+            # # Store this entities/relations of this iteration for tracking
+            search_result[f"iteration_{current_iteration}_entities"] = iteration_search_result["final_entities"]
+            search_result[f"iteration_{current_iteration}_relations"] = iteration_search_result["final_relations"]
+
+            # Format entities and relationships for prompts
+            entities_str, relations_str = format_for_prompts(
+                search_result["final_entities"],
+                search_result["final_relations"]
+            )
 
-        # # Store this entities/relations of this iteration for tracking
-        search_result[f"iteration_{current_iteration}_entities"] = iteration_search_result["final_entities"]
-        search_result[f"iteration_{current_iteration}_relations"] = iteration_search_result["final_relations"]
+            # Log the formatted strings for debugging
+            logger.info(f"[AlightRAG] Formatted entities: {entities_str[:100]}...")
+            logger.info(f"[AlightRAG] Formatted relations: {relations_str[:100]}...")
+
+            if speculate:
+                # The accumulated entities/relations are final unless reflection asks
+                # for another iteration, so truncation and chunk merging can overlap
+                # with the LLM calls below.
+                speculative_context_task = asyncio.create_task(
+                    prefetch_context(
+                        search_result["final_entities"],
+                        search_result["final_relations"],
+                        dict(search_result["chunk_tracking"]),
+                        search_result["query_embedding"],
+                    )
+                )
 
-        # Format entities and relationships for prompts
-        entities_str, relations_str = format_for_prompts(
-            search_result["final_entities"],
-            search_result["final_relations"]
-        )
+            # Phase 2: Reasoning
+            if use_reasoning:
+                logger.info("[AlightRAG] Reasoning started")
+                try:
+                    reasoning_prompt = PROMPTS["alightrag_reasoning"]
 
-        # Log the formatted strings for debugging
-        logger.info(f"[AlightRAG] Formatted entities: {entities_str[:100]}...")
-        logger.info(f"[AlightRAG] Formatted relations: {relations_str[:100]}...")
+                    reasoning_query = PROMPTS["alightrag_reasoning_query"].format(
+                        entities=entities_str,
+                        relationships=relations_str,
+                        question=user_query,
+                    )
 
-        # Phase 2: Reasoning
-        if use_reasoning:
-            logger.info("[AlightRAG] Reasoning started")
-            try:
-                reasoning_prompt = PROMPTS["alightrag_reasoning"]
+                    reasoning_response = await cached_model_call(
+                        "reasoning", reasoning_query, reasoning_prompt
+                    )
 
-                reasoning_query = PROMPTS["alightrag_reasoning_query"].format(
-                    entities=entities_str,
-                    relationships=relations_str,
-                    question=user_query,
-                )
+                    logger.info(f"[AlightRAG] reasoning_response -> {reasoning_response}")
 
-                reasoning_response = await use_model_func(
-                    reasoning_query,
-                    system_prompt=reasoning_prompt,
-                    history_messages=query_param.conversation_history,
-                    enable_cot=True,
-                    stream=query_param.stream,
-                )
+                    # Parse JSON response
+                    path_result = extract_json_from_response(reasoning_response)
+                    if not path_result:
+                        path_result = {"paths": [], "explanation": "Reasoning failed"}
 
-                logger.info(f"[AlightRAG] reasoning_response -> {reasoning_response}")
+                    logger.info(f"[AlightRAG] Reasoning completed: {len(path_result.get('paths', []))} paths found")
 
-                # Parse JSON response
-                path_result = extract_json_from_response(reasoning_response)
-                if not path_result:
+                except (json.JSONDecodeError, KeyError) as e:
+                    logger.error(f"[AlightRAG] Reasoning failed: {e}")
                     path_result = {"paths": [], "explanation": "Reasoning failed"}
 
-                logger.info(f"[AlightRAG] Reasoning completed: {len(path_result.get('paths', []))} paths found")
-
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.error(f"[AlightRAG] Reasoning failed: {e}")
-                path_result = {"paths": [], "explanation": "Reasoning failed"}
+                if not use_reflection:
+                    search_result["final_paths"].extend(path_result.get("paths", []))
 
-            if not use_reflection:
-                search_result["final_paths"].extend(path_result.get("paths", []))
+            # Phase 3: Reflection
+            if use_reflection:
+                logger.info("[AlightRAG] Reflection started")
+                try:
+                    reflection_prompt = PROMPTS["alightrag_reflection"]
 
-        # Phase 3: Reflection
-        if use_reflection:
-            logger.info("[AlightRAG] Reflection started")
-            try:
-                reflection_prompt = PROMPTS["alightrag_reflection"]
+                    reflection_query = PROMPTS["alightrag_reflection_query"].format(
+                        entities=entities_str,
+                        relationships=relations_str,
+                        paths=json.dumps(path_result.get("paths", [])),
+                        question=user_query,
+                    )
 
-                reflection_query = PROMPTS["alightrag_reflection_query"].format(
-                    entities=entities_str,
-                    relationships=relations_str,
-                    paths=json.dumps(path_result.get("paths", [])),
-                    question=user_query,
-                )
+                    reflection_response = await cached_model_call(
+                        "reflection", reflection_query, reflection_prompt
+                    )
 
-                reflection_response = await use_model_func(
-                    reflection_query,
-                    system_prompt=reflection_prompt,
-                    history_messages=query_param.conversation_history,
-                    enable_cot=True,
-                    stream=query_param.stream,
-                )
+                    logger.info(f"[AlightRAG] reflection_response -> {reflection_response}")
+
+                    # Parse JSON response
+                    validation_result = extract_json_from_response(reflection_response)
+                    # Ensure required keys exist
+                    if not validation_result:
+                        validation_result = {
+                            "validated_paths": [],
+                            "filtered_entities": "",
+                            "filtered_relationships": "",
+                            "overall_explanation": "Failed to parse reflection response"
+                        }
 
-                logger.info(f"[AlightRAG] reflection_response -> {reflection_response}")
+                    logger.info(f"[AlightRAG] Reflection completed: "
+                                 f"{sum(1 for p in validation_result.get('validated_paths', []) if p.get('is_valid'))} valid paths")
 
-                # Parse JSON response
-                validation_result = extract_json_from_response(reflection_response)
-                # Ensure required keys exist
-                if not validation_result:
+                except (json.JSONDecodeError, KeyError) as e:
+                    logger.error(f"[AlightRAG] Reflection failed: {e}")
                     validation_result = {
                         "validated_paths": [],
                         "filtered_entities": "",
                         "filtered_relationships": "",
-                        "overall_explanation": "Failed to parse reflection response"
+                        "overall_explanation": "Reflection failed"
                     }
 
-                logger.info(f"[AlightRAG] Reflection completed: "
-                             f"{sum(1 for p in validation_result.get('validated_paths', []) if p.get('is_valid'))} valid paths")
-
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.error(f"[AlightRAG] Reflection failed: {e}")
-                validation_result = {
-                    "validated_paths": [],
-                    "filtered_entities": "",
-                    "filtered_relationships": "",
-                    "overall_explanation": "Reflection failed"
-                }
-
-            # -----------------------------------------------------------
-            # # TODO when no filtered ent or rel, the corresponding search_res would be emptied
-            # # Update search result with filtered data
-            # filtered_entities = validation_result.get("filtered_entities", "")
-            # filtered_relations = validation_result.get("filtered_relationships", "")
-            #
-            # # Convert comma-separated strings back to lists
-            # filtered_entity_names = [e.strip() for e in filtered_entities.split(",")
-            #                          if e.strip()] if filtered_entities else []
-            #
-            # # Parse relationship triples
-            # filtered_relation_tuples = []
-            # if filtered_relations:
-            #     for triple_str in filtered_relations.split(";"):
-            #         triple_str = triple_str.strip()
-            #         if triple_str.startswith("(") and triple_str.endswith(")"):
-            #             triple_str = triple_str[1:-1]  # Remove parentheses
-            #             parts = [p.strip() for p in triple_str.split(",")]
-            #             if len(parts) == 3:
-            #                 filtered_relation_tuples.append(tuple(parts))
-            #
-            # # Use your helper function to reconstruct in correct format!
-            # formatted_filtered_result = reconstruct_search_result(
-            #     filtered_entities=filtered_entity_names,
-            #     filtered_relations=filtered_relation_tuples,
-            #     original_search_result=iteration_search_result  # Use iteration data as original
-            # )
-            #
-            #
-            # # Now update search_result with the properly formatted data
-            # search_result["final_entities"] = formatted_filtered_result["final_entities"]
-            # search_result["final_relations"] = formatted_filtered_result["final_relations"]
-            # -----------------------------------------------------------
-
-            # non-path filtering
-            # iteration_search_result["final_paths"] = validation_result.get("validated_paths", [])
-
-            # path fitering
-            # Get all validated paths from reflection
-            validated_paths = validation_result.get("validated_paths", [])
-
-            # Filter to keep only valid paths
-            valid_paths_this_iteration = []
-            for path_info in validated_paths:
-                if path_info.get("is_valid", False):
-                    # valid_paths_this_iteration.append(path_info)
-                    # Add iteration info to path for tracking
-                    path_info_with_iteration = path_info.copy()
-                    path_info_with_iteration["iteration"] = current_iteration
-                    valid_paths_this_iteration.append(path_info_with_iteration)
-                else:
-                    logger.info(f"[AlightRAG] Discarding invalid path: {path_info.get('path')} - Reason: {path_info.get('reason', 'No reason provided')}")
-
-            # Store only valid paths
-            iteration_search_result["final_paths"] = valid_paths_this_iteration
-
-            # UNION: Add this iteration's valid paths to accumulated paths
-            search_result["final_paths"].extend(valid_paths_this_iteration)
-
-            # Log the filtering result
-            logger.info(f"[AlightRAG] Iteration {current_iteration}: Found {len(validated_paths)} paths")
-            logger.info(f"[AlightRAG] After path filtering: {len(valid_paths_this_iteration)}/{len(validated_paths)} paths are valid")
-            logger.info(f"[AlightRAG] Total accumulated paths: {len(search_result['final_paths'])}")
-
-            # Check if we should continue iterating
-            supplementary_questions = validation_result.get("supplementary_questions", [])
-            is_sufficient = not supplementary_questions
-
-        if is_sufficient:
-            logger.info("[AlightRAG] Paths are sufficient, stopping iteration")
-            break
-        elif supplementary_questions and current_iteration < max_iterations:
-            # Combine original query with ALL supplementary questions
-            combined_query = f"""
-                Main question: {user_query}
-                To fully answer this, also consider:
-                {'; '.join(supplementary_questions)}
-                """
-            retrieval_query = combined_query
-            logger.info(f"[AlightRAG] Continuing to iteration {current_iteration + 1} with supplementary question: {retrieval_query}")
-        else:
-            logger.info(f"[AlightRAG] Maximum iterations reached or no supplementary questions after {current_iteration} iterations")
-            break
+                # -----------------------------------------------------------
+                # # TODO when no filtered ent or rel, the corresponding search_res would be emptied
+                # # Update search result with filtered data
+                # filtered_entities = validation_result.get("filtered_entities", "")
+                # filtered_relations = validation_result.get("filtered_relationships", "")
+                #
+                # # Convert comma-separated strings back to lists
+                # filtered_entity_names = [e.strip() for e in filtered_entities.split(",")
+                #                          if e.strip()] if filtered_entities else []
+                #
+                # # Parse relationship triples
+                # filtered_relation_tuples = []
+                # if filtered_relations:
+                #     for triple_str in filtered_relations.split(";"):
+                #         triple_str = triple_str.strip()
+                #         if triple_str.startswith("(") and triple_str.endswith(")"):
+                #             triple_str = triple_str[1:-1]  # Remove parentheses
+                #             parts = [p.strip() for p in triple_str.split(",")]
+                #             if len(parts) == 3:
+                #                 filtered_relation_tuples.append(tuple(parts))
+                #
+                # # Use your helper function to reconstruct in correct format!
+                # formatted_filtered_result = reconstruct_search_result(
+                #     filtered_entities=filtered_entity_names,
+                #     filtered_relations=filtered_relation_tuples,
+                #     original_search_result=iteration_search_result  # Use iteration data as original
+                # )
+                #
+                #
+                # # Now update search_result with the properly formatted data
+                # search_result["final_entities"] = formatted_filtered_result["final_entities"]
+                # search_result["final_relations"] = formatted_filtered_result["final_relations"]
+                # -----------------------------------------------------------
+
+                # non-path filtering
+                # iteration_search_result["final_paths"] = validation_result.get("validated_paths", [])
+
+                # path fitering
+                # Get all validated paths from reflection
+                validated_paths = validation_result.get("validated_paths", [])
+
+                # Filter to keep only valid paths
+                valid_paths_this_iteration = []
+                for path_info in validated_paths:
+                    if path_info.get("is_valid", False):
+                        # valid_paths_this_iteration.append(path_info)
+                        # Add iteration info to path for tracking
+                        path_info_with_iteration = path_info.copy()
+                        path_info_with_iteration["iteration"] = current_iteration
+                        valid_paths_this_iteration.append(path_info_with_iteration)
+                    else:
+                        logger.info(f"[AlightRAG] Discarding invalid path: {path_info.get('path')} - Reason: {path_info.get('reason', 'No reason provided')}")
+
+                # Store only valid paths
+                iteration_search_result["final_paths"] = valid_paths_this_iteration
+
+                # UNION: Add this iteration's valid paths to accumulated paths
+                search_result["final_paths"].extend(valid_paths_this_iteration)
+
+                # Log the filtering result
+                logger.info(f"[AlightRAG] Iteration {current_iteration}: Found {len(validated_paths)} paths")
+                logger.info(f"[AlightRAG] After path filtering: {len(valid_paths_this_iteration)}/{len(validated_paths)} paths are valid")
+                logger.info(f"[AlightRAG] Total accumulated paths: {len(search_result['final_paths'])}")
+
+                # Check if we should continue iterating
+                supplementary_questions = validation_result.get("supplementary_questions", [])
+                is_sufficient = not supplementary_questions
+
+            if is_sufficient:
+                logger.info("[AlightRAG] Paths are sufficient, stopping iteration")
+                break
+            elif supplementary_questions and current_iteration < max_iterations:
+                # Combine original query with ALL supplementary questions
+                combined_query = f"""
+                    Main question: {user_query}
+                    To fully answer this, also consider:
+                    {'; '.join(supplementary_questions)}
+                    """
+                retrieval_query = combined_query
+                logger.info(f"[AlightRAG] Continuing to iteration {current_iteration + 1} with supplementary question: {retrieval_query}")
+                if speculative_context_task is not None:
+                    await _cancel_speculative_task(speculative_context_task)
+                    speculative_context_task = None
+                    speculation_stats["context_discarded"] += 1
+            else:
+                logger.info(f"[AlightRAG] Maximum iterations reached or no supplementary questions after {current_iteration} iterations")
+                break
+
+        if speculative_context_task is not None:
+            prefetched_context = await speculative_context_task
+            speculative_context_task = None
+            speculation_stats["context_hits"] += 1
+    finally:
+        if speculative_context_task is not None:
+            await _cancel_speculative_task(speculative_context_task)
+            speculation_stats["context_discarded"] += 1
 
     # After all iterations, log summary
     logger.info(f"[AlightRAG] Final summary: {len(search_result['final_entities'])} accumulated entities, "
@@ -4921,27 +5969,19 @@ async def _alightrag_build_query_context(
         elif not search_result["chunk_tracking"]:
             return None
 
-    # Stage 2: Apply token truncation for LLM efficiency
-    truncation_result = await _apply_token_truncation(
-        search_result,
-        query_param,
-        text_chunks_db.global_config,
-    )
-
-
-    # Stage 3: Merge chunks using filtered entities/relations
-    merged_chunks = await _merge_all_chunks(
-        filtered_entities=truncation_result.get("filtered_entities", []),
-        filtered_relations=truncation_result.get("filtered_relations", []),
-        vector_chunks=search_result.get("vector_chunks", []),
-        query=query,  # Use original query for merging
-        knowledge_graph_inst=knowledge_graph_inst,
-        text_chunks_db=text_chunks_db,
-        query_param=query_param,
-        chunks_vdb=chunks_vdb,
-        chunk_tracking=search_result.get("chunk_tracking", {}),
-        query_embedding=search_result.get("query_embedding"),
-    )
+    if prefetched_context is not None:
+        # Stage 2 and 3 already ran speculatively on the final search result
+        truncation_result, merged_chunks, chunk_tracking = prefetched_context
+        search_result["chunk_tracking"] = chunk_tracking
+    else:
+        # Stage 2: Apply token truncation for LLM efficiency
+        # Stage 3: Merge chunks using filtered entities/relations
+        truncation_result, merged_chunks, _ = await prefetch_context(
+            search_result["final_entities"],
+            search_result["final_relations"],
+            search_result.get("chunk_tracking", {}),
+            search_result.get("query_embedding"),
+        )
 
     if (
             not merged_chunks
@@ -4986,6 +6026,21 @@ async def _alightrag_build_query_context(
         "merged_chunks_count": len(merged_chunks),
         "final_chunks_count": len(raw_data.get("data", {}).get("chunks", [])),
     }
+    raw_data["metadata"]["processing_info"]["retrieval_costs"] = {
+        "iterations": retrieval_session.iteration_costs,
+        "total": retrieval_session.total_costs,
+    }
+    if speculate:
+        raw_data["metadata"]["processing_info"]["speculation"] = speculation_stats
+    raw_data["metadata"]["llm_cache"] = {
+        cache_type: {
+            **counts,
+            "hit_rate": counts["hits"] / (counts["hits"] + counts["misses"])
+            if counts["hits"] + counts["misses"]
+            else 0.0,
+        }
+        for cache_type, counts in llm_cache_stats.items()
+    }
 
     logger.info(
         f"[AlightRAG] Final context: {context}, "
@@ -5008,13 +6063,16 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -5281,12 +6339,15 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -5672,8 +6733,9 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens, query_tokens = await count_tokens_batch(
+        tokenizer, [pre_sys_prompt, query]
+    )
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
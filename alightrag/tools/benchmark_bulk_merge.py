@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the bulk merge path of merge_nodes_and_edges.
+
+Builds a knowledge graph from a seed document, then merges a large extraction result
+(half of its entities already exist in the graph) once with the per-item merge and once
+with ENABLE_BULK_MERGE, using the default local storages and a fake embedding function
+with a fixed per-call latency. Reports the merge time of each mode and checks that both
+produce the same graph.
+
+Usage:
+    python -m alightrag.tools.benchmark_bulk_merge --entities 2000 --relations 4000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from alightrag import AlightRAG
+from alightrag.kg.shared_storage import (
+    get_namespace_data,
+    get_pipeline_status_lock,
+    initialize_pipeline_status,
+)
+from alightrag.operate import merge_nodes_and_edges
+from alightrag.utils import EmbeddingFunc
+
+
+async def fake_llm(prompt, system_prompt=None, history_messages=[], **kwargs):
+    return "summary"
+
+
+def extraction_result(args, doc: str, first_entity: int) -> list:
+    """One chunk result per 10 entities, each with descriptions and relations"""
+    chunk_results = []
+    names = [f"Entity {i}" for i in range(first_entity, first_entity + args.entities)]
+    relations_per_chunk = args.relations * 10 // args.entities
+    for start in range(0, len(names), 10):
+        chunk_id = f"chunk-{doc}-{start}"
+        nodes = {
+            name: [
+                {
+                    "entity_name": name,
+                    "entity_type": "concept",
+                    "description": f"{name} as described in {chunk_id}",
+                    "source_id": chunk_id,
+                    "file_path": f"{doc}.txt",
+                    "timestamp": 0,
+                }
+            ]
+            for name in names[start : start + 10]
+        }
+        edges = {}
+        for _ in range(relations_per_chunk):
+            src, tgt = random.sample(names, 2)
+            edges[(src, tgt)] = [
+                {
+                    "src_id": src,
+                    "tgt_id": tgt,
+                    "weight": 1.0,
+                    "description": f"{src} relates to {tgt} in {chunk_id}",
+                    "keywords": "related",
+                    "source_id": chunk_id,
+                    "file_path": f"{doc}.txt",
+                    "timestamp": 0,
+                }
+            ]
+        chunk_results.append((nodes, edges))
+    return chunk_results
+
+
+async def merge(rag: AlightRAG, chunk_results: list, doc_id: str):
+    await merge_nodes_and_edges(
+        chunk_results=chunk_results,
+        knowledge_graph_inst=rag.chunk_entity_relation_graph,
+        entity_vdb=rag.entities_vdb,
+        relationships_vdb=rag.relationships_vdb,
+        global_config=asdict(rag),
+        full_entities_storage=rag.full_entities,
+        full_relations_storage=rag.full_relations,
+        doc_id=doc_id,
+        pipeline_status=await get_namespace_data("pipeline_status"),
+        pipeline_status_lock=get_pipeline_status_lock(),
+        llm_response_cache=rag.llm_response_cache,
+        entity_chunks_storage=rag.entity_chunks,
+        relation_chunks_storage=rag.relation_chunks,
+    )
+
+
+async def run(bulk: bool, args, working_dir: str) -> tuple[float, dict]:
+    async def fake_embedding(texts, **kwargs):
+        await asyncio.sleep(args.embed_latency_ms / 1000)
+        return np.random.rand(len(texts), 32)
+
+    rag = AlightRAG(
+        working_dir=working_dir,
+        llm_model_func=fake_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=32, func=fake_embedding),
+        enable_bulk_merge=bulk,
+        embedding_batch_num=args.embedding_batch_num,
+    )
+    await rag.initialize_storages()
+    await initialize_pipeline_status()
+
+    random.seed(args.seed)
+    await merge(rag, extraction_result(args, "seed", 0), "doc-seed")
+    chunk_results = extraction_result(args, "new", args.entities // 2)
+
+    start = time.perf_counter()
+    await merge(rag, chunk_results, "doc-new")
+    elapsed = time.perf_counter() - start
+
+    graph = await rag.chunk_entity_relation_graph._get_graph()
+    snapshot = {
+        "nodes": {
+            node: {k: v for k, v in data.items() if k != "created_at"}
+            for node, data in graph.nodes(data=True)
+        },
+        "edges": {
+            tuple(sorted(edge)): {k: v for k, v in data.items() if k != "created_at"}
+            for *edge, data in graph.edges(data=True)
+        },
+    }
+    await rag.finalize_storages()
+    return elapsed, snapshot
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as per_item_dir:
+        per_item, per_item_graph = await run(False, args, per_item_dir)
+    with tempfile.TemporaryDirectory() as bulk_dir:
+        bulk, bulk_graph = await run(True, args, bulk_dir)
+
+    print(
+        f"Merging {args.entities} entities and {args.relations} relations "
+        f"(embedding latency {args.embed_latency_ms} ms)"
+    )
+    print(f"Per-item merge : {per_item:8.2f} s")
+    print(f"Bulk merge     : {bulk:8.2f} s")
+    print(f"Speedup        : {per_item / bulk:8.1f}x")
+    print(f"Same graph     : {per_item_graph == bulk_graph}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--relations", type=int, default=4000)
+    parser.add_argument("--embed-latency-ms", type=float, default=20)
+    parser.add_argument("--embedding-batch-num", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
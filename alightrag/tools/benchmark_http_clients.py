@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared pooled HTTP clients of the LLM, embedding and rerank bindings.
+
+Starts a local mock server with OpenAI compatible chat completion and embedding
+endpoints and a rerank endpoint, then calls the bindings concurrently twice: once with
+a new client per call (the behaviour before client pooling) and once with the shared
+clients. Reports throughput, latency and the number of TCP connections the server saw.
+
+Usage:
+    python -m alightrag.tools.benchmark_http_clients --bindings rerank openai_embed --requests 500
+"""
+
+import argparse
+import asyncio
+import base64
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from aiohttp import web
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from alightrag import utils
+from alightrag.utils import close_shared_http_clients
+
+EMBEDDING_DIM = 32
+
+
+class MockServer:
+    """OpenAI compatible and rerank endpoints that count client connections"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.connections: set = set()
+        self.requests = 0
+
+    async def _track(self, request: web.Request) -> dict:
+        # A connection is identified by the client's address and ephemeral port
+        self.connections.add(request.transport.get_extra_info("peername"))
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return await request.json()
+
+    async def chat(self, request: web.Request) -> web.Response:
+        await self._track(request)
+        return web.json_response(
+            {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "mock",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "mock answer"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 2,
+                    "total_tokens": 3,
+                },
+            }
+        )
+
+    async def embeddings(self, request: web.Request) -> web.Response:
+        body = await self._track(request)
+        vector = base64.b64encode(np.ones(EMBEDDING_DIM, dtype=np.float32).tobytes())
+        return web.json_response(
+            {
+                "object": "list",
+                "model": "mock",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": vector.decode()}
+                    for i in range(len(body["input"]))
+                ],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        )
+
+    async def rerank(self, request: web.Request) -> web.Response:
+        body = await self._track(request)
+        return web.json_response(
+            {
+                "results": [
+                    {"index": i, "relevance_score": 1.0 / (i + 1)}
+                    for i in range(len(body["documents"]))
+                ]
+            }
+        )
+
+    async def start(self) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat)
+        app.router.add_post("/v1/embeddings", self.embeddings)
+        app.router.add_post("/v1/rerank", self.rerank)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return runner
+
+
+class PerCallClients(dict):
+    """Registry stand-in that never reuses a client, like the bindings before pooling"""
+
+    def __init__(self):
+        super().__init__()
+        self.created: dict[asyncio.Task, list] = {}
+
+    def get(self, key, default=None):
+        return default
+
+    def __setitem__(self, key, value):
+        self.created.setdefault(asyncio.current_task(), []).append(value[1])
+
+    async def close_created(self):
+        for client in self.created.pop(asyncio.current_task(), []):
+            await utils._close_http_client(client)
+
+
+def make_call(binding: str, base_url: str):
+    if binding == "rerank":
+        from alightrag.rerank import generic_rerank_api
+
+        documents = [f"document {i}" for i in range(20)]
+        return lambda: generic_rerank_api(
+            "query", documents, "mock", f"{base_url}/rerank", "key"
+        )
+    if binding == "openai_embed":
+        from alightrag.llm.openai import openai_embed
+
+        return lambda: openai_embed.func(
+            ["text one", "text two"], model="mock", base_url=base_url, api_key="key"
+        )
+    if binding == "openai_complete":
+        from alightrag.llm.openai import openai_complete_if_cache
+
+        return lambda: openai_complete_if_cache(
+            "mock", "prompt", base_url=base_url, api_key="key"
+        )
+    raise ValueError(f"Unknown binding: {binding}")
+
+
+async def run(binding: str, pooled: bool, server: MockServer, base_url: str, args):
+    call = make_call(binding, base_url)
+    registry = utils._shared_http_clients
+    per_call = None if pooled else PerCallClients()
+    if per_call is not None:
+        utils._shared_http_clients = per_call
+    server.connections.clear()
+    server.requests = 0
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+            if per_call is not None:
+                await per_call.close_created()
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        utils._shared_http_clients = registry
+        await close_shared_http_clients()
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int((len(latencies) - 1) * 0.95)] * 1000,
+        "connections": len(server.connections),
+    }
+
+
+async def main(args):
+    server = MockServer(args.server_latency_ms)
+    runner = await server.start()
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}/v1"
+    print(
+        f"{args.requests} requests per binding, concurrency {args.concurrency}, "
+        f"server latency {args.server_latency_ms} ms"
+    )
+    try:
+        for binding in args.bindings:
+            for pooled in (False, True):
+                stats = await run(binding, pooled, server, base_url, args)
+                label = "shared" if pooled else "per-call"
+                print(
+                    f"{binding:<16} {label:<8}: {stats['rps']:8.1f} req/s | "
+                    f"p50 {stats['p50_ms']:6.2f} ms | p95 {stats['p95_ms']:6.2f} ms | "
+                    f"{stats['connections']:5d} connections"
+                )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--bindings",
+        nargs="+",
+        default=["rerank", "openai_embed", "openai_complete"],
+        choices=["rerank", "openai_embed", "openai_complete"],
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--server-latency-ms", type=float, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for JsonKVStorage reads.
+
+Runs many concurrent readers (the get_by_ids / filter_keys calls made by aquery) against a
+populated JsonKVStorage while a writer keeps upserting and persisting, and while another
+storage holds the shared storage lock for short periods (as NetworkX / vector storages do
+when they write). Reports read throughput and latency with reads under the storage lock and
+with the lock-free read path.
+
+Usage:
+    python -m alightrag.tools.benchmark_kv_concurrency --records 20000 --readers 64
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from alightrag.kg import json_kv_impl
+from alightrag.kg.json_kv_impl import JsonKVStorage
+from alightrag.kg.shared_storage import (
+    finalize_share_data,
+    get_storage_lock,
+    initialize_share_data,
+)
+
+
+async def reader(storage: JsonKVStorage, keys: list[str], args, latencies: list):
+    for _ in range(args.reads):
+        batch = random.sample(keys, args.batch)
+        start = time.perf_counter()
+        await storage.get_by_ids(batch)
+        await storage.filter_keys(set(batch))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+
+async def writer(storage: JsonKVStorage, stop: asyncio.Event, args):
+    i = 0
+    while not stop.is_set():
+        await storage.upsert(
+            {f"new-{i}-{j}": {"content": "w" * args.value_size} for j in range(50)}
+        )
+        await storage.index_done_callback()
+        i += 1
+        await asyncio.sleep(0.005)
+
+
+async def other_storage_writer(stop: asyncio.Event, args):
+    """Hold the shared storage lock the way other storages do while writing."""
+    lock = get_storage_lock()
+    while not stop.is_set():
+        async with lock:
+            await asyncio.sleep(args.hold_ms / 1000)
+        await asyncio.sleep(0.002)
+
+
+async def run(lock_free: bool, args) -> tuple[float, list[float]]:
+    finalize_share_data()
+    initialize_share_data()
+    with tempfile.TemporaryDirectory() as working_dir:
+        storage = JsonKVStorage(
+            namespace="text_chunks",
+            workspace="",
+            global_config={"working_dir": working_dir},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        keys = [f"chunk-{i}" for i in range(args.records)]
+        await storage.upsert(
+            {key: {"content": "c" * args.value_size} for key in keys}
+        )
+        await storage.index_done_callback()
+        storage._lock_free_reads = lock_free
+
+        stop = asyncio.Event()
+        background = [
+            asyncio.create_task(writer(storage, stop, args)),
+            asyncio.create_task(other_storage_writer(stop, args)),
+        ]
+        latencies: list[float] = []
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(reader(storage, keys, args, latencies) for _ in range(args.readers))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*background)
+        await storage.finalize()
+    return elapsed, latencies
+
+
+def report(name: str, elapsed: float, latencies: list[float]):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<18}: {len(latencies) / elapsed:10.0f} reads/s | "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms | p99 {p99 * 1000:7.2f} ms"
+    )
+
+
+async def main(args):
+    random.seed(args.seed)
+    # Compact often so readers also overlap with snapshot writes
+    json_kv_impl.KV_JOURNAL_MIN_COMPACT_BYTES = args.compact_bytes
+
+    locked = await run(False, args)
+    lock_free = await run(True, args)
+
+    print(
+        f"{args.records} records, {args.readers} readers x {args.reads} reads of {args.batch} ids"
+    )
+    report("Storage lock", *locked)
+    report("Lock-free reads", *lock_free)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--value-size", type=int, default=1000)
+    parser.add_argument("--readers", type=int, default=64)
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--hold-ms", type=float, default=2.0)
+    parser.add_argument("--compact-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
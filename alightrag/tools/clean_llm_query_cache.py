@@ -2,8 +2,10 @@
 """
 LLM Query Cache Cleanup Tool for AlightRAG
 
-This tool cleans up LLM query cache (mix:*, hybrid:*, local:*, global:*)
-from KV storage implementations while preserving workspace isolation.
+This tool cleans up LLM query cache (mix:*, hybrid:*, local:*, global:*, alightrag:*)
+from KV storage implementations while preserving workspace isolation. Besides query
+and keywords caches it also manages the reasoning and reflection caches written by
+alightrag mode.
 
 Usage:
     python -m alightrag.tools.clean_llm_query_cache
@@ -31,7 +33,6 @@ sys.path.insert(
 )
 
 from alightrag.kg import STORAGE_ENV_REQUIREMENTS
-from alightrag.kg.shared_storage import set_all_update_flags
 from alightrag.namespace import NameSpace
 from alightrag.utils import setup_logger
 
@@ -57,10 +58,19 @@ WORKSPACE_ENV_MAP = {
 }
 
 # Query cache modes
-QUERY_MODES = ["mix", "hybrid", "local", "global"]
+QUERY_MODES = ["mix", "hybrid", "local", "global", "alightrag"]
 
 # Query cache types
-CACHE_TYPES = ["query", "keywords"]
+CACHE_TYPES = ["query", "keywords", "reasoning", "reflection"]
+
+# Cleanup menu options: option -> cleanup type ('all' or a single cache type)
+CLEANUP_OPTIONS = {
+    "1": "all",
+    "2": "query",
+    "3": "keywords",
+    "4": "reasoning",
+    "5": "reflection",
+}
 
 # Default batch size for deletion
 DEFAULT_BATCH_SIZE = 1000
@@ -109,9 +119,18 @@ class CleanupStats:
 
     def initialize_counts(self):
         """Initialize count dictionaries"""
-        for mode in QUERY_MODES:
-            self.counts_before[mode] = {"query": 0, "keywords": 0}
-            self.counts_after[mode] = {"query": 0, "keywords": 0}
+        self.counts_before = empty_counts()
+        self.counts_after = empty_counts()
+
+
+def empty_counts() -> Dict[str, Dict[str, int]]:
+    """Return zeroed counts for every mode and cache_type"""
+    return {mode: {cache_type: 0 for cache_type in CACHE_TYPES} for mode in QUERY_MODES}
+
+
+def cache_types_for(cleanup_type: str) -> List[str]:
+    """Return the cache types removed by a cleanup type ('all' or a cache type)"""
+    return CACHE_TYPES if cleanup_type == "all" else [cleanup_type]
 
 
 class CleanupTool:
@@ -280,15 +299,14 @@ class CleanupTool:
         Returns:
             Dictionary with counts for each mode and cache_type
         """
-        counts = {mode: {"query": 0, "keywords": 0} for mode in QUERY_MODES}
+        counts = empty_counts()
 
         async with storage._storage_lock:
             for key in storage._data.keys():
-                for mode in QUERY_MODES:
-                    if key.startswith(f"{mode}:query:"):
-                        counts[mode]["query"] += 1
-                    elif key.startswith(f"{mode}:keywords:"):
-                        counts[mode]["keywords"] += 1
+                mode, _, rest = key.partition(":")
+                cache_type = rest.partition(":")[0]
+                if mode in counts and cache_type in counts[mode]:
+                    counts[mode][cache_type] += 1
 
         return counts
 
@@ -301,7 +319,7 @@ class CleanupTool:
         Returns:
             Dictionary with counts for each mode and cache_type
         """
-        counts = {mode: {"query": 0, "keywords": 0} for mode in QUERY_MODES}
+        counts = empty_counts()
 
         print("Scanning Redis keys...", end="", flush=True)
 
@@ -335,7 +353,7 @@ class CleanupTool:
         """
         from alightrag.kg.postgres_impl import namespace_to_table_name
 
-        counts = {mode: {"query": 0, "keywords": 0} for mode in QUERY_MODES}
+        counts = empty_counts()
         table_name = namespace_to_table_name(storage.namespace)
 
         print("Counting PostgreSQL records...", end="", flush=True)
@@ -369,7 +387,7 @@ class CleanupTool:
         Returns:
             Dictionary with counts for each mode and cache_type
         """
-        counts = {mode: {"query": 0, "keywords": 0} for mode in QUERY_MODES}
+        counts = empty_counts()
 
         print("Counting MongoDB documents...", end="", flush=True)
         start_time = time.time()
@@ -418,29 +436,19 @@ class CleanupTool:
 
         Args:
             storage: JsonKVStorage instance
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
             stats: CleanupStats object to track progress
         """
         # Collect keys to delete
         async with storage._storage_lock:
-            keys_to_delete = []
-            for key in storage._data.keys():
-                should_delete = False
-                for mode in QUERY_MODES:
-                    if cleanup_type == "all":
-                        if key.startswith(f"{mode}:query:") or key.startswith(
-                            f"{mode}:keywords:"
-                        ):
-                            should_delete = True
-                    elif cleanup_type == "query":
-                        if key.startswith(f"{mode}:query:"):
-                            should_delete = True
-                    elif cleanup_type == "keywords":
-                        if key.startswith(f"{mode}:keywords:"):
-                            should_delete = True
-
-                if should_delete:
-                    keys_to_delete.append(key)
+            prefixes = tuple(
+                f"{mode}:{cache_type}:"
+                for mode in QUERY_MODES
+                for cache_type in cache_types_for(cleanup_type)
+            )
+            keys_to_delete = [
+                key for key in storage._data.keys() if key.startswith(prefixes)
+            ]
 
         # Delete in batches
         total_keys = len(keys_to_delete)
@@ -457,13 +465,9 @@ class CleanupTool:
             batch_keys = keys_to_delete[start_idx:end_idx]
 
             try:
-                async with storage._storage_lock:
-                    for key in batch_keys:
-                        del storage._data[key]
-
-                # CRITICAL: Set update flag so changes persist to disk
-                # Without this, deletions remain in-memory only and are lost on exit
-                await set_all_update_flags(storage.final_namespace)
+                # delete() records the keys in the storage journal and sets the
+                # update flag, so the deletions are persisted on exit
+                await storage.delete(batch_keys)
 
                 # Success
                 stats.successful_batches += 1
@@ -496,19 +500,15 @@ class CleanupTool:
 
         Args:
             storage: RedisKVStorage instance
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
             stats: CleanupStats object to track progress
         """
         # Build patterns to delete
-        patterns = []
-        for mode in QUERY_MODES:
-            if cleanup_type == "all":
-                patterns.append(f"{mode}:query:*")
-                patterns.append(f"{mode}:keywords:*")
-            elif cleanup_type == "query":
-                patterns.append(f"{mode}:query:*")
-            elif cleanup_type == "keywords":
-                patterns.append(f"{mode}:keywords:*")
+        patterns = [
+            f"{mode}:{cache_type}:*"
+            for mode in QUERY_MODES
+            for cache_type in cache_types_for(cleanup_type)
+        ]
 
         print("\n=== Starting Cleanup ===")
         print(f"💡 Processing Redis keys in batches of {self.batch_size:,}\n")
@@ -567,7 +567,7 @@ class CleanupTool:
 
         Args:
             storage: PGKVStorage instance
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
             stats: CleanupStats object to track progress
         """
         from alightrag.kg.postgres_impl import namespace_to_table_name
@@ -575,15 +575,11 @@ class CleanupTool:
         table_name = namespace_to_table_name(storage.namespace)
 
         # Build WHERE conditions
-        conditions = []
-        for mode in QUERY_MODES:
-            if cleanup_type == "all":
-                conditions.append(f"id LIKE '{mode}:query:%'")
-                conditions.append(f"id LIKE '{mode}:keywords:%'")
-            elif cleanup_type == "query":
-                conditions.append(f"id LIKE '{mode}:query:%'")
-            elif cleanup_type == "keywords":
-                conditions.append(f"id LIKE '{mode}:keywords:%'")
+        conditions = [
+            f"id LIKE '{mode}:{cache_type}:%'"
+            for mode in QUERY_MODES
+            for cache_type in cache_types_for(cleanup_type)
+        ]
 
         where_clause = " OR ".join(conditions)
 
@@ -620,19 +616,15 @@ class CleanupTool:
 
         Args:
             storage: MongoKVStorage instance
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
             stats: CleanupStats object to track progress
         """
         # Build regex patterns
-        patterns = []
-        for mode in QUERY_MODES:
-            if cleanup_type == "all":
-                patterns.append(f"^{mode}:query:")
-                patterns.append(f"^{mode}:keywords:")
-            elif cleanup_type == "query":
-                patterns.append(f"^{mode}:query:")
-            elif cleanup_type == "keywords":
-                patterns.append(f"^{mode}:keywords:")
+        patterns = [
+            f"^{mode}:{cache_type}:"
+            for mode in QUERY_MODES
+            for cache_type in cache_types_for(cleanup_type)
+        ]
 
         print("\n=== Starting Cleanup ===")
         print("💡 Executing MongoDB deleteMany operations\n")
@@ -670,7 +662,7 @@ class CleanupTool:
         Args:
             storage: Storage instance
             storage_name: Storage type name
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
             stats: CleanupStats object to track progress
         """
         if storage_name == "JsonKVStorage":
@@ -717,32 +709,34 @@ class CleanupTool:
             counts: Dictionary with counts for each mode and cache_type
             title: Title for the statistics display
         """
-        print(f"\n{title}")
-        print("┌" + "─" * 12 + "┬" + "─" * 12 + "┬" + "─" * 12 + "┬" + "─" * 12 + "┐")
-        print(f"│ {'Mode':<10} │ {'Query':>10} │ {'Keywords':>10} │ {'Total':>10} │")
-        print("├" + "─" * 12 + "┼" + "─" * 12 + "┼" + "─" * 12 + "┼" + "─" * 12 + "┤")
+        columns = [cache_type.capitalize() for cache_type in CACHE_TYPES] + ["Total"]
 
-        total_query = 0
-        total_keywords = 0
+        def border(left: str, middle: str, right: str) -> str:
+            return left + middle.join("─" * 12 for _ in range(len(columns) + 1)) + right
 
-        for mode in QUERY_MODES:
-            query_count = counts[mode]["query"]
-            keywords_count = counts[mode]["keywords"]
-            mode_total = query_count + keywords_count
+        def row(label: str, values: list) -> str:
+            cells = [f" {label:<10} "] + [
+                f" {value:>10,} " if isinstance(value, int) else f" {value:>10} "
+                for value in values
+            ]
+            return "│" + "│".join(cells) + "│"
 
-            total_query += query_count
-            total_keywords += keywords_count
+        print(f"\n{title}")
+        print(border("┌", "┬", "┐"))
+        print(row("Mode", columns))
+        print(border("├", "┼", "┤"))
 
-            print(
-                f"│ {mode:<10} │ {query_count:>10,} │ {keywords_count:>10,} │ {mode_total:>10,} │"
-            )
+        totals = {cache_type: 0 for cache_type in CACHE_TYPES}
+        for mode in QUERY_MODES:
+            mode_counts = [counts[mode][cache_type] for cache_type in CACHE_TYPES]
+            for cache_type, count in zip(CACHE_TYPES, mode_counts):
+                totals[cache_type] += count
+            print(row(mode, mode_counts + [sum(mode_counts)]))
 
-        print("├" + "─" * 12 + "┼" + "─" * 12 + "┼" + "─" * 12 + "┼" + "─" * 12 + "┤")
-        grand_total = total_query + total_keywords
-        print(
-            f"│ {'Total':<10} │ {total_query:>10,} │ {total_keywords:>10,} │ {grand_total:>10,} │"
-        )
-        print("└" + "─" * 12 + "┴" + "─" * 12 + "┴" + "─" * 12 + "┴" + "─" * 12 + "┘")
+        print(border("├", "┼", "┤"))
+        total_counts = [totals[cache_type] for cache_type in CACHE_TYPES]
+        print(row("Total", total_counts + [sum(total_counts)]))
+        print(border("└", "┴", "┘"))
 
     def calculate_total_to_delete(
         self, counts: Dict[str, Dict[str, int]], cleanup_type: str
@@ -751,20 +745,16 @@ class CleanupTool:
 
         Args:
             counts: Dictionary with counts for each mode and cache_type
-            cleanup_type: 'all', 'query', or 'keywords'
+            cleanup_type: 'all' or a single cache type from CACHE_TYPES
 
         Returns:
             Total number of records to delete
         """
-        total = 0
-        for mode in QUERY_MODES:
-            if cleanup_type == "all":
-                total += counts[mode]["query"] + counts[mode]["keywords"]
-            elif cleanup_type == "query":
-                total += counts[mode]["query"]
-            elif cleanup_type == "keywords":
-                total += counts[mode]["keywords"]
-        return total
+        return sum(
+            counts[mode][cache_type]
+            for mode in QUERY_MODES
+            for cache_type in cache_types_for(cleanup_type)
+        )
 
     def print_cleanup_report(self, stats: CleanupStats):
         """Print comprehensive cleanup report
@@ -796,12 +786,10 @@ class CleanupTool:
         # Before/After comparison
         print("\n📈 Before/After Comparison:")
         total_before = sum(
-            counts["query"] + counts["keywords"]
-            for counts in stats.counts_before.values()
+            sum(counts.values()) for counts in stats.counts_before.values()
         )
         total_after = sum(
-            counts["query"] + counts["keywords"]
-            for counts in stats.counts_after.values()
+            sum(counts.values()) for counts in stats.counts_after.values()
         )
         print(f"  Total caches before:      {total_before:,}")
         print(f"  Total caches after:       {total_after:,}")
@@ -981,9 +969,7 @@ class CleanupTool:
             )
 
             # Calculate total
-            total_caches = sum(
-                counts[mode]["query"] + counts[mode]["keywords"] for mode in QUERY_MODES
-            )
+            total_caches = self.calculate_total_to_delete(counts, "all")
 
             if total_caches == 0:
                 print("\n⚠️  No query caches found in storage")
@@ -992,26 +978,24 @@ class CleanupTool:
 
             # Select cleanup type
             print("\n=== Cleanup Options ===")
-            print("[1] Delete all query caches (both query and keywords)")
-            print("[2] Delete query caches only (keep keywords)")
-            print("[3] Delete keywords caches only (keep query)")
+            print("[1] Delete all query caches (all cache types)")
+            print("[2] Delete query caches only")
+            print("[3] Delete keywords caches only")
+            print("[4] Delete reasoning caches only")
+            print("[5] Delete reflection caches only")
             print("[0] Cancel")
 
             while True:
-                choice = input("\nSelect cleanup option (0-3): ").strip()
+                choice = input("\nSelect cleanup option (0-5): ").strip()
 
                 if choice == "0" or choice == "":
                     print("\n✓ Cleanup cancelled")
                     await self.storage.finalize()
                     return
-                elif choice == "1":
-                    cleanup_type = "all"
-                elif choice == "2":
-                    cleanup_type = "query"
-                elif choice == "3":
-                    cleanup_type = "keywords"
+                elif choice in CLEANUP_OPTIONS:
+                    cleanup_type = CLEANUP_OPTIONS[choice]
                 else:
-                    print("✗ Invalid choice. Please enter 0, 1, 2, or 3")
+                    print("✗ Invalid choice. Please enter a number from 0 to 5")
                     continue
 
                 # Calculate total to delete for the selected type
@@ -1023,13 +1007,9 @@ class CleanupTool:
                 if stats.total_to_delete == 0:
                     if cleanup_type == "all":
                         print(f"\n{BOLD_RED}⚠️  No query caches found to delete!{RESET}")
-                    elif cleanup_type == "query":
-                        print(
-                            f"\n{BOLD_RED}⚠️  No query caches found to delete! (Only keywords exist){RESET}"
-                        )
-                    elif cleanup_type == "keywords":
+                    else:
                         print(
-                            f"\n{BOLD_RED}⚠️  No keywords caches found to delete! (Only query caches exist){RESET}"
+                            f"\n{BOLD_RED}⚠️  No {cleanup_type} caches found to delete!{RESET}"
                         )
                     print("   Please select a different cleanup option.\n")
                     continue
@@ -1054,10 +1034,10 @@ class CleanupTool:
                 print(
                     f"\n{BOLD_RED}⚠️  WARNING: This will delete ALL query caches across all modes!{RESET}"
                 )
-            elif cleanup_type == "query":
-                print("\n⚠️  This will delete query caches only (keywords will be kept)")
-            elif cleanup_type == "keywords":
-                print("\n⚠️  This will delete keywords caches only (query will be kept)")
+            else:
+                print(
+                    f"\n⚠️  This will delete {cleanup_type} caches only (other cache types will be kept)"
+                )
 
             confirm = input("\nContinue with deletion? (y/n): ").strip().lower()
             if confirm != "y":
@@ -1088,9 +1068,7 @@ class CleanupTool:
             except Exception as e:
                 print(f"⚠️  Verification failed: {e}")
                 # Use zero counts if verification fails
-                stats.counts_after = {
-                    mode: {"query": 0, "keywords": 0} for mode in QUERY_MODES
-                }
+                stats.counts_after = empty_counts()
 
             # Print final report
             self.print_cleanup_report(stats)
@@ -3,20 +3,28 @@ import weakref
 
 import asyncio
 import html
+import itertools
 import csv
+import importlib.util
 import json
 import logging
 import logging.handlers
+import multiprocessing
 import os
 import re
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
 from hashlib import md5
+from urllib.parse import urlsplit
 from typing import (
     Any,
+    Awaitable,
     Protocol,
     Callable,
     TYPE_CHECKING,
@@ -38,6 +46,17 @@ from alightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    CPU_EXECUTOR_NONE,
+    CPU_EXECUTOR_THREAD,
+    CPU_EXECUTOR_PROCESS,
+    VALID_CPU_EXECUTOR_MODES,
+    DEFAULT_CPU_OFFLOAD_MIN_CHARS,
+    DEFAULT_EVENT_LOOP_LAG_INTERVAL,
+    DEFAULT_EVENT_LOOP_LAG_WINDOW,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP2_ENABLED,
 )
 
 # Initialize logger with basic configuration
@@ -339,6 +358,307 @@ class UnlimitedSemaphore:
         pass
 
 
+class RoundRobinSemaphore:
+    """A semaphore that hands free slots to groups of waiters in turn.
+
+    Waiters of a group are served in FIFO order and groups take turns, so a group
+    with many waiters cannot starve groups that start waiting later.
+    """
+
+    def __init__(self, value: int):
+        if value < 1:
+            raise ValueError(f"RoundRobinSemaphore value must be >= 1, got {value}")
+        self._value = value
+        # Insertion order of the groups is the round-robin order
+        self._waiters: dict[Any, deque[asyncio.Future]] = {}
+
+    async def acquire(self, group: Any) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(group, deque()).append(fut)
+        self._wake_next()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was granted just before cancellation, pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._value += 1
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._value > 0 and self._waiters:
+            group = next(iter(self._waiters))
+            waiters = self._waiters.pop(group)
+            fut = waiters.popleft()
+            if waiters:
+                self._waiters[group] = waiters  # Move the group to the back
+            if not fut.done():  # Skip waiters cancelled while queued
+                self._value -= 1
+                fut.set_result(None)
+
+    def slot(self, group: Any) -> "_RoundRobinSlot":
+        """Async context manager holding one slot for ``group``"""
+        return _RoundRobinSlot(self, group)
+
+
+class _RoundRobinSlot:
+    def __init__(self, semaphore: RoundRobinSemaphore, group: Any):
+        self._semaphore = semaphore
+        self._group = group
+
+    async def __aenter__(self):
+        await self._semaphore.acquire(self._group)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+class PipelineStage:
+    """One stage of a staged pipeline: a bounded queue in front of a pool of workers.
+
+    Producers ``put`` work items for a group (e.g. a document) and wait while the
+    queue is full, so a slow stage pushes back on the stages before it. Each item
+    then takes a worker with ``slot(group)``; workers are handed out round-robin
+    across groups. Queue depth, queue wait and processing latency are reported by
+    ``get_stats()``.
+    """
+
+    def __init__(
+        self, name: str, concurrency: int, queue_size: int, window: int = 256
+    ):
+        if queue_size < 1:
+            raise ValueError(
+                f"PipelineStage queue_size must be >= 1, got {queue_size}"
+            )
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._workers = RoundRobinSemaphore(concurrency)
+        self._queued: dict[Any, int] = {}
+        self._put_waiters: list[asyncio.Future] = []
+        self._wait_times: deque[float] = deque(maxlen=window)
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._blocked_time = 0.0
+        self.active = 0
+        self.completed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self._queued.values())
+
+    async def put(self, group: Any, count: int = 1) -> None:
+        """Queue ``count`` items of ``group``, waiting while the queue is full.
+
+        A batch larger than the whole queue is admitted once the queue is empty.
+        """
+        start = time.perf_counter()
+        while self._queued and self.queue_depth + count > self.queue_size:
+            fut = asyncio.get_running_loop().create_future()
+            self._put_waiters.append(fut)
+            try:
+                await fut
+            finally:
+                if fut in self._put_waiters:
+                    self._put_waiters.remove(fut)
+        self._queued[group] = self._queued.get(group, 0) + count
+        self._blocked_time += time.perf_counter() - start
+
+    def discard(self, group: Any) -> None:
+        """Drop the queued items of ``group`` that will never take a worker (e.g. after a failure)"""
+        if self._queued.pop(group, None):
+            self._wake_putters()
+
+    def _dequeue(self, group: Any) -> None:
+        queued = self._queued.get(group, 0)
+        if queued > 1:
+            self._queued[group] = queued - 1
+        elif queued:
+            del self._queued[group]
+        else:
+            return
+        self._wake_putters()
+
+    def _wake_putters(self) -> None:
+        waiters, self._put_waiters = self._put_waiters, []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(None)
+
+    def slot(self, group: Any) -> "_StageSlot":
+        """Async context manager taking one queued item of ``group`` and holding a worker for it"""
+        return _StageSlot(self, group)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Queue and latency statistics, latencies in milliseconds over the recent window"""
+        latencies = sorted(self._latencies)
+        waits = self._wait_times
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "avg_wait_ms": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            "avg_latency_ms": (
+                round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0
+            ),
+            "p95_latency_ms": (
+                round(latencies[int((len(latencies) - 1) * 0.95)] * 1000, 2)
+                if latencies
+                else 0.0
+            ),
+            "blocked_ms": round(self._blocked_time * 1000, 2),
+        }
+
+
+class _StageSlot:
+    def __init__(self, stage: PipelineStage, group: Any):
+        self._stage = stage
+        self._group = group
+        self._started = 0.0
+
+    async def __aenter__(self):
+        stage = self._stage
+        start = time.perf_counter()
+        try:
+            await stage._workers.acquire(self._group)
+        finally:
+            # The item leaves the queue whether it got a worker or was cancelled
+            stage._dequeue(self._group)
+        self._started = time.perf_counter()
+        stage._wait_times.append(self._started - start)
+        stage.active += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        stage = self._stage
+        stage.active -= 1
+        stage.completed += 1
+        stage._latencies.append(time.perf_counter() - self._started)
+        stage._workers.release()
+
+
+class GroupCommitter:
+    """Persist processed documents in groups instead of one by one.
+
+    Documents are added to an open group, which is committed once it is ``interval``
+    seconds old, once its documents reach ``max_bytes`` of content, or on ``flush()``.
+    A commit first journals the document ids of the group to ``journal_path``, then
+    persists all storages with ``persist_func``, and only then calls
+    ``complete_func(records, None)`` so the documents are marked processed. If
+    persisting fails, ``complete_func(records, error)`` is called instead. The
+    journal is removed after the commit, so a journal left behind names documents
+    whose commit was interrupted (see ``recover_journal``). If ``complete_func``
+    raises, the journal is kept and the group is retried with the next commit.
+    Failures of a commit started by the interval timer are logged, since no caller
+    awaits it.
+    """
+
+    def __init__(
+        self,
+        persist_func: Callable[[], Awaitable[None]],
+        complete_func: Callable[[dict[str, Any], Exception | None], Awaitable[None]],
+        journal_path: str,
+        interval: float,
+        max_bytes: int,
+    ):
+        self._persist_func = persist_func
+        self._complete_func = complete_func
+        self.journal_path = journal_path
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._group: dict[str, Any] = {}
+        self._group_bytes = 0
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self.commits = 0
+
+    async def add(self, doc_id: str, record: Any, size: int = 0) -> None:
+        """Add a processed document to the open group; commits it when it is full"""
+        self._group[doc_id] = record
+        self._group_bytes += size
+        if self._group_bytes >= self.max_bytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._commit_after_interval())
+            self._timer.add_done_callback(self._log_timer_failure)
+
+    async def _commit_after_interval(self) -> None:
+        await asyncio.sleep(self.interval)
+        # Detach first so that flush() does not cancel the commit in progress
+        self._timer = None
+        await self.flush()
+
+    @staticmethod
+    def _log_timer_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Timed group commit failed: {task.exception()}")
+
+    async def flush(self) -> None:
+        """Commit the open group now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self._group:
+                return
+            group, self._group = self._group, {}
+            self._group_bytes = 0
+
+            error = None
+            try:
+                await asyncio.to_thread(self._write_journal, list(group))
+                await self._persist_func()
+            except Exception as e:
+                logger.error(f"Group commit of {len(group)} document(s) failed: {e}")
+                error = e
+            try:
+                await self._complete_func(group, error)
+            except Exception:
+                # The journal is kept; the next commit journals and retries these too
+                self._group = {**group, **self._group}
+                raise
+            if error is None:
+                self.commits += 1
+            await asyncio.to_thread(self._remove_journal)
+
+    def _write_journal(self, doc_ids: list[str]) -> None:
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            json.dump({"docs": doc_ids, "started_at": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remove_journal(self) -> None:
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    @staticmethod
+    async def recover_journal(
+        journal_path: str, reset_func: Callable[[list[str]], Awaitable[None]]
+    ) -> list[str]:
+        """Replay a commit interrupted by a crash.
+
+        Passes the document ids of the journal to ``reset_func``, which queues them
+        for processing again, and removes the journal once that succeeded.
+        Returns the replayed document ids.
+        """
+        if not os.path.exists(journal_path):
+            return []
+        try:
+            with open(journal_path, encoding="utf-8") as f:
+                doc_ids = json.load(f).get("docs", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable group commit journal {journal_path}: {e}")
+            doc_ids = []
+        if doc_ids:
+            await reset_func(doc_ids)
+        os.remove(journal_path)
+        return doc_ids
+
+
 @dataclass
 class TaskState:
     """Task state tracking for priority queue management"""
@@ -913,6 +1233,153 @@ def priority_limit_async_func_call(
     return final_decro
 
 
+def coalesce_embedding_func_call(
+    max_batch_size: int,
+    max_wait_time: float = 0.005,
+    queue_name: str = "Embedding coalescer",
+):
+    """
+    Coalescing decorator for embedding functions
+
+    Concurrent calls made with the same keyword arguments are gathered within a short
+    time/size window and sent to the decorated function as one batched call. Each caller
+    gets back the slice of embeddings for its own texts. Calls that already fill a batch
+    are passed through unchanged.
+
+    Args:
+        max_batch_size: Maximum number of texts sent in one batched call
+        max_wait_time: Maximum time (in seconds) a request waits for more requests to join its batch
+        queue_name: Optional name for logging identification
+
+    Returns:
+        Decorator function. The decorated function exposes `get_stats()` returning
+        batch-fill statistics.
+    """
+
+    def final_decro(func):
+        if not callable(func):
+            raise TypeError(f"Expected a callable object, got {type(func)}")
+
+        # kwargs key -> list of (texts, future) waiting for the next batched call
+        pending: dict[tuple, list[tuple[list[str], asyncio.Future]]] = {}
+        flush_handles: dict[tuple, asyncio.TimerHandle] = {}
+        batch_tasks = set()
+        stats = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "coalesced_requests": 0,
+            "passthrough_requests": 0,
+        }
+
+        async def run_batch(items, kwargs):
+            texts = [text for item_texts, _ in items for text in item_texts]
+            stats["batches"] += 1
+            stats["coalesced_requests"] += len(items)
+            try:
+                embeddings = await func(texts, **kwargs)
+            except asyncio.CancelledError:
+                for _, future in items:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            if len(embeddings) != len(texts):
+                error = ValueError(
+                    f"{queue_name}: embedding count mismatch, {len(embeddings)} != {len(texts)}"
+                )
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+
+            offset = 0
+            for item_texts, future in items:
+                if not future.done():
+                    future.set_result(embeddings[offset : offset + len(item_texts)])
+                offset += len(item_texts)
+
+        def flush(key):
+            handle = flush_handles.pop(key, None)
+            if handle is not None:
+                handle.cancel()
+            items = pending.pop(key, None)
+            if items:
+                task = asyncio.create_task(run_batch(items, dict(key)))
+                batch_tasks.add(task)
+                task.add_done_callback(batch_tasks.discard)
+
+        def get_stats() -> dict[str, Any]:
+            """Return batch-fill statistics of the coalesced embedding calls"""
+            batched_texts = stats["texts"]
+            total_batches = stats["batches"] + stats["passthrough_requests"]
+            return {
+                **stats,
+                "max_batch_size": max_batch_size,
+                "avg_batch_size": round(batched_texts / total_batches, 2)
+                if total_batches
+                else 0.0,
+                "avg_batch_fill": round(
+                    batched_texts / (total_batches * max_batch_size), 3
+                )
+                if total_batches
+                else 0.0,
+            }
+
+        @wraps(func)
+        async def wait_func(texts, **kwargs):
+            """
+            Queue texts for the next batched embedding call
+
+            Args:
+                texts: List of texts to embed
+                **kwargs: Keyword arguments passed to the function, only calls with
+                          identical keyword arguments are coalesced
+
+            Returns:
+                Embeddings for the given texts, in order
+            """
+            texts = list(texts)
+            stats["requests"] += 1
+            stats["texts"] += len(texts)
+
+            try:
+                key = tuple(sorted(kwargs.items()))
+                hash(key)
+            except TypeError:
+                key = None
+            if key is None or len(texts) >= max_batch_size:
+                stats["passthrough_requests"] += 1
+                return await func(texts, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+
+            # Keep batches within max_batch_size
+            queued = sum(len(item_texts) for item_texts, _ in pending.get(key, []))
+            if queued + len(texts) > max_batch_size:
+                flush(key)
+
+            pending.setdefault(key, []).append((texts, future))
+            queued = sum(len(item_texts) for item_texts, _ in pending[key])
+            if queued >= max_batch_size:
+                flush(key)
+            elif key not in flush_handles:
+                flush_handles[key] = loop.call_later(max_wait_time, flush, key)
+
+            return await future
+
+        wait_func.get_stats = get_stats
+
+        return wait_func
+
+    return final_decro
+
+
 def wrap_embedding_func_with_attrs(**kwargs):
     """Wrap a function with attributes"""
 
@@ -1103,6 +1570,62 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def encode_with_byte_offsets(
+        self, content: str
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Encodes a string and returns the UTF-8 byte offset at which every token starts.
+
+        Offsets are computed with one vectorized pass over a per-vocabulary table of
+        token byte lengths, so callers can slice token windows straight out of the
+        encoded content instead of decoding them. Requires a tokenizer that exposes
+        `n_vocab` and `decode_single_token_bytes` (e.g. tiktoken).
+
+        Args:
+            content: The string to encode.
+
+        Returns:
+            A tuple of (tokens, offsets) as arrays, where offsets has len(tokens) + 1
+            entries and offsets[-1] is the total byte length, or None if not supported.
+        """
+        token_byte_lengths = self._get_token_byte_lengths()
+        if token_byte_lengths is None:
+            return None
+        encode_to_numpy = getattr(self.tokenizer, "encode_to_numpy", None)
+        if encode_to_numpy is not None:
+            # Avoids materializing a Python list of ints for large inputs
+            tokens = encode_to_numpy(content)
+        else:
+            tokens = np.asarray(self.encode(content), dtype=np.int32)
+        # Gather the byte lengths and prefix-sum them in place, without temporaries
+        offsets = np.empty(len(tokens) + 1, dtype=np.int64)
+        offsets[0] = 0
+        np.take(
+            token_byte_lengths,
+            tokens,
+            out=offsets[1:],
+            mode="clip",  # mode="raise" would buffer the whole output
+        )
+        np.cumsum(offsets[1:], out=offsets[1:])
+        return tokens, offsets
+
+    def _get_token_byte_lengths(self) -> np.ndarray | None:
+        """Build (once) the byte length of every token in the vocabulary."""
+        if not hasattr(self, "_token_byte_lengths"):
+            n_vocab = getattr(self.tokenizer, "n_vocab", None)
+            decode_single = getattr(self.tokenizer, "decode_single_token_bytes", None)
+            lengths = None
+            if n_vocab and decode_single is not None:
+                lengths = np.zeros(n_vocab, dtype=np.int64)
+                for token in range(n_vocab):
+                    try:
+                        lengths[token] = len(decode_single(token))
+                    except KeyError:
+                        # Unused token ids in the vocabulary
+                        pass
+            self._token_byte_lengths = lengths
+        return self._token_byte_lengths
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1159,7 +1682,7 @@ def truncate_list_by_token_size(
     key: Callable[[Any], str],
     max_token_size: int,
     tokenizer: Tokenizer,
-) -> list[int]:
+) -> list[Any]:
     """Truncate a list of data by token size"""
     if max_token_size <= 0:
         return []
@@ -1171,6 +1694,464 @@ def truncate_list_by_token_size(
     return list_data
 
 
+async def atruncate_list_by_token_size(
+    list_data: list[Any],
+    key: Callable[[Any], str],
+    max_token_size: int,
+    tokenizer: Tokenizer,
+) -> list[Any]:
+    """Truncate a list of data by token size, counting tokens on the CPU executor
+
+    Items are counted in batches that double in size, so like the sequential version
+    it stops soon after the limit is reached instead of tokenizing the whole list.
+    """
+    if max_token_size <= 0:
+        return []
+    tokens = 0
+    start = 0
+    batch_chars = DEFAULT_CPU_OFFLOAD_MIN_CHARS
+    while start < len(list_data):
+        texts = []
+        chars = 0
+        for data in itertools.islice(list_data, start, None):
+            text = key(data)
+            texts.append(text)
+            chars += len(text)
+            if chars >= batch_chars:
+                break
+        for i, count in enumerate(
+            await count_tokens_batch(tokenizer, texts), start=start
+        ):
+            tokens += count
+            if tokens > max_token_size:
+                return list_data[:i]
+        start += len(texts)
+        batch_chars = max(batch_chars, chars) * 2
+    return list_data
+
+
+# Process-wide executor for CPU-bound tokenization and parsing, shared by all AlightRAG
+# instances of the process and reference counted by acquire/release_cpu_executor
+_cpu_executor: Executor | None = None
+_cpu_executor_mode: str = CPU_EXECUTOR_NONE
+_cpu_executor_workers: int = 0
+_cpu_executor_tokenizer_name: str | None = None
+_cpu_executor_users: int = 0
+
+# Tokenizer loaded once by each process pool worker
+_cpu_worker_tokenizer: Tokenizer | None = None
+
+
+class _CollectingLogHandler(logging.Handler):
+    """Collects the log records of a process pool worker for the parent process"""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Render the message and traceback now, args may not be picklable
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+# Log handler of a process pool worker, records are returned with each result
+_cpu_worker_log_handler: _CollectingLogHandler | None = None
+
+
+def _init_cpu_worker(tokenizer: Tokenizer | None, log_level: int) -> None:
+    global _cpu_worker_tokenizer, _cpu_worker_log_handler
+    _cpu_worker_tokenizer = tokenizer
+    _cpu_worker_log_handler = _CollectingLogHandler()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_cpu_worker_log_handler)
+    logger.setLevel(log_level)
+    if tokenizer is not None:
+        tokenizer.encode("warm up")
+
+
+def _run_in_cpu_worker(
+    func: Callable[..., Any], *args: Any
+) -> tuple[Any, list[logging.LogRecord]]:
+    """Run func in a process pool worker, returning its result and log records"""
+    try:
+        return func(*args), _cpu_worker_log_handler.records
+    finally:
+        _cpu_worker_log_handler.records = []
+
+
+async def _run_on_cpu_executor(executor: Executor, func: Callable[..., Any], *args):
+    """Run func on the executor, replaying log records of process pool workers"""
+    loop = asyncio.get_running_loop()
+    if not isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, func, *args)
+    try:
+        result, records = await loop.run_in_executor(
+            executor, _run_in_cpu_worker, func, *args
+        )
+    except BrokenProcessPool as e:
+        # Workers are started lazily, so a pool that cannot run shows up here
+        _fall_back_to_cpu_threads(executor, e)
+        raise
+    for record in records:
+        logger.handle(record)
+    return result
+
+
+def _fall_back_to_cpu_threads(broken: Executor, error: BaseException) -> None:
+    """Replace a broken process pool with a thread pool of the same size"""
+    global _cpu_executor, _cpu_executor_mode, _cpu_executor_tokenizer_name
+    if _cpu_executor is not broken:
+        # Already replaced after an earlier failed call
+        return
+    logger.warning(f"CPU process pool is not usable, using threads: {error!r}")
+    _cpu_executor = ThreadPoolExecutor(
+        max_workers=_cpu_executor_workers, thread_name_prefix="alightrag-cpu"
+    )
+    _cpu_executor_mode = CPU_EXECUTOR_THREAD
+    _cpu_executor_tokenizer_name = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _count_tokens(tokenizer: Tokenizer, texts: Sequence[str]) -> list[int]:
+    return [len(tokenizer.encode(text)) for text in texts]
+
+
+def _count_tokens_in_worker(texts: Sequence[str]) -> list[int]:
+    return _count_tokens(_cpu_worker_tokenizer, texts)
+
+
+def acquire_cpu_executor(
+    mode: str, max_workers: int, tokenizer: Tokenizer | None = None
+) -> None:
+    """Start the process-wide CPU executor, or join the one already running.
+
+    Args:
+        mode: One of "none", "thread" or "process"
+        max_workers: Number of worker threads or processes
+        tokenizer: Tokenizer preloaded by each worker of a process pool
+    """
+    global _cpu_executor, _cpu_executor_mode, _cpu_executor_workers
+    global _cpu_executor_tokenizer_name, _cpu_executor_users
+
+    if mode not in VALID_CPU_EXECUTOR_MODES:
+        raise ValueError(
+            f"Invalid CPU executor mode: {mode}. Valid modes: {sorted(VALID_CPU_EXECUTOR_MODES)}"
+        )
+    _cpu_executor_users += 1
+    if _cpu_executor is not None:
+        if mode != _cpu_executor_mode:
+            logger.warning(
+                f"CPU executor already running in {_cpu_executor_mode} mode, ignoring {mode}"
+            )
+        return
+    if mode == CPU_EXECUTOR_NONE:
+        return
+
+    if mode == CPU_EXECUTOR_PROCESS:
+        try:
+            # spawn: forking a process that already runs threads and an event loop is unsafe
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_cpu_worker,
+                initargs=(tokenizer, logger.getEffectiveLevel()),
+            )
+            _cpu_executor_tokenizer_name = tokenizer.model_name if tokenizer else None
+        except Exception as e:
+            logger.warning(f"Failed to start CPU process pool, using threads: {e}")
+            mode = CPU_EXECUTOR_THREAD
+    if mode == CPU_EXECUTOR_THREAD:
+        _cpu_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="alightrag-cpu"
+        )
+    _cpu_executor_mode = mode
+    _cpu_executor_workers = max_workers
+    logger.info(f"CPU executor started: {mode} x {max_workers}")
+
+
+def release_cpu_executor() -> None:
+    """Leave the CPU executor, shutting it down when its last user leaves"""
+    global _cpu_executor, _cpu_executor_mode, _cpu_executor_workers
+    global _cpu_executor_tokenizer_name, _cpu_executor_users
+
+    _cpu_executor_users = max(_cpu_executor_users - 1, 0)
+    if _cpu_executor_users or _cpu_executor is None:
+        return
+    executor = _cpu_executor
+    _cpu_executor = None
+    _cpu_executor_mode = CPU_EXECUTOR_NONE
+    _cpu_executor_workers = 0
+    _cpu_executor_tokenizer_name = None
+    executor.shutdown(wait=False, cancel_futures=True)
+    logger.debug("CPU executor shut down")
+
+
+def get_cpu_executor_info() -> dict[str, Any]:
+    """Return the mode and size of the CPU executor"""
+    return {"mode": _cpu_executor_mode, "workers": _cpu_executor_workers}
+
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any, size: int = -1) -> Any:
+    """Run a CPU-bound function on the CPU executor.
+
+    Runs inline when no executor is configured or when ``size`` (the number of
+    characters to process) is below DEFAULT_CPU_OFFLOAD_MIN_CHARS. With a process
+    pool, ``func`` and ``args`` must be picklable.
+    """
+    executor = _cpu_executor
+    if executor is None or 0 <= size < DEFAULT_CPU_OFFLOAD_MIN_CHARS:
+        return func(*args)
+    try:
+        return await _run_on_cpu_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # Retry on the thread pool that replaced the broken process pool
+        return await run_cpu_bound(func, *args, size=size)
+
+
+async def count_tokens_batch(tokenizer: Tokenizer, texts: Sequence[str]) -> list[int]:
+    """Count the tokens of each text in one call on the CPU executor"""
+    executor = _cpu_executor
+    if executor is None or sum(map(len, texts)) < DEFAULT_CPU_OFFLOAD_MIN_CHARS:
+        return _count_tokens(tokenizer, texts)
+    if _cpu_executor_mode == CPU_EXECUTOR_PROCESS:
+        if tokenizer.model_name != _cpu_executor_tokenizer_name:
+            # Workers hold another tokenizer, avoid pickling this one on every call
+            return await asyncio.to_thread(_count_tokens, tokenizer, texts)
+        try:
+            return await _run_on_cpu_executor(
+                executor, _count_tokens_in_worker, list(texts)
+            )
+        except BrokenProcessPool:
+            # Retry on the thread pool that replaced the broken process pool
+            return await count_tokens_batch(tokenizer, texts)
+    return await _run_on_cpu_executor(executor, _count_tokens, tokenizer, texts)
+
+
+class EventLoopLagMonitor:
+    """Measure event loop lag: how much later than scheduled a periodic probe wakes up.
+
+    Lag shows how long the loop was blocked by synchronous work, which delays every
+    concurrent request handled by the same loop.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_EVENT_LOOP_LAG_INTERVAL,
+        window: int = DEFAULT_EVENT_LOOP_LAG_WINDOW,
+    ):
+        self.interval = interval
+        self._samples: deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self._samples.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Lag statistics in milliseconds over the recent window"""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0}
+        return {
+            "samples": len(samples),
+            "interval_ms": self.interval * 1000,
+            "current_ms": round(self._samples[-1] * 1000, 2),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p99_ms": round(samples[int((len(samples) - 1) * 0.99)] * 1000, 2),
+            "window_max_ms": round(samples[-1] * 1000, 2),
+            "max_ms": round(self._max_lag * 1000, 2),
+        }
+
+
+# Process-wide registry of long-lived HTTP clients shared by the LLM, embedding and
+# rerank bindings: (loop id, kind, base_url, api_key, options) -> (loop, client).
+# aiohttp sessions and httpx clients are bound to the event loop that created them.
+_shared_http_clients: dict[tuple, tuple[asyncio.AbstractEventLoop, Any]] = {}
+# Number of AlightRAG instances using the shared clients
+_shared_http_client_users: int = 0
+
+
+def get_http_pool_config() -> dict[str, Any]:
+    """Connection pool settings of the shared HTTP clients, read from the environment"""
+    http2 = get_env_value("HTTP2_ENABLED", DEFAULT_HTTP2_ENABLED, bool)
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but h2 is not installed, using HTTP/1.1")
+        http2 = False
+    return {
+        "max_connections": get_env_value(
+            "HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS, int
+        ),
+        "max_keepalive_connections": get_env_value(
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+        "keepalive_expiry": get_env_value(
+            "HTTP_KEEPALIVE_EXPIRY", DEFAULT_HTTP_KEEPALIVE_EXPIRY, float
+        ),
+        "http2": http2,
+    }
+
+
+def _is_http_client_closed(client: Any) -> bool:
+    # aiohttp: closed property, httpx: is_closed property, openai: is_closed() method
+    closed = getattr(client, "closed", None)
+    if closed is None:
+        closed = getattr(client, "is_closed", False)
+    return bool(closed()) if callable(closed) else bool(closed)
+
+
+async def _close_http_client(client: Any) -> None:
+    close = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if close is not None:
+        result = close()
+        if asyncio.iscoroutine(result):
+            await result
+
+
+def get_shared_http_client(
+    kind: str,
+    base_url: str | None,
+    api_key: str | None,
+    options: dict[str, Any] | None,
+    factory: Callable[[], Any],
+) -> Any:
+    """Return the pooled client for (kind, base_url, api_key, options), creating it once.
+
+    Must be called from a running event loop. A client that has been closed, or that
+    belongs to another event loop, is replaced by a new one from `factory`.
+
+    Args:
+        kind: Client family, e.g. "openai" or "aiohttp"
+        base_url: Endpoint the client talks to
+        api_key: API key the client was created with
+        options: Other constructor options; clients with different options are not shared
+        factory: Creates the client when none is cached
+    """
+    loop = asyncio.get_running_loop()
+    frozen_options = json.dumps(options or {}, sort_keys=True, default=repr)
+    key = (id(loop), kind, base_url, api_key, frozen_options)
+    entry = _shared_http_clients.get(key)
+    if entry is not None and entry[0] is loop and not _is_http_client_closed(entry[1]):
+        return entry[1]
+
+    client = factory()
+    _shared_http_clients[key] = (loop, client)
+    logger.debug(f"Created shared {kind} client for {base_url}")
+    return client
+
+
+def acquire_shared_http_clients() -> None:
+    """Register a user of the shared clients, see release_shared_http_clients"""
+    global _shared_http_client_users
+    _shared_http_client_users += 1
+
+
+async def release_shared_http_clients() -> int:
+    """Leave the shared clients, closing them when their last user leaves.
+
+    Returns:
+        Number of clients closed
+    """
+    global _shared_http_client_users
+    _shared_http_client_users = max(_shared_http_client_users - 1, 0)
+    if _shared_http_client_users:
+        return 0
+    return await close_shared_http_clients()
+
+
+async def close_shared_http_clients() -> int:
+    """Close the shared clients of the running event loop, even if they are in use.
+
+    Meant for application shutdown; AlightRAG instances use release_shared_http_clients.
+    Clients of event loops that have been closed are dropped, clients of other
+    running loops are kept. Bindings create new clients on their next request.
+
+    Returns:
+        Number of clients closed
+    """
+    loop = asyncio.get_running_loop()
+    closed = 0
+    for key, (client_loop, client) in list(_shared_http_clients.items()):
+        if client_loop is not loop and not client_loop.is_closed():
+            continue
+        del _shared_http_clients[key]
+        if client_loop is loop:
+            try:
+                await _close_http_client(client)
+                closed += 1
+            except Exception as e:
+                logger.warning(f"Failed to close shared HTTP client: {e}")
+    if closed:
+        logger.debug(f"Closed {closed} shared HTTP clients")
+    return closed
+
+
+def create_pooled_httpx_client(client_cls: type | None = None, **kwargs: Any) -> Any:
+    """Create an httpx AsyncClient (or subclass) with the shared pool settings"""
+    import httpx
+
+    config = get_http_pool_config()
+    client_cls = client_cls or httpx.AsyncClient
+    return client_cls(
+        limits=httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        ),
+        http2=config["http2"],
+        **kwargs,
+    )
+
+
+def get_shared_aiohttp_session(url: str) -> Any:
+    """Return the pooled aiohttp session for the origin (scheme, host, port) of url.
+
+    Headers and timeouts are passed per request, so every endpoint of one origin
+    shares the session and its keep-alive connections.
+    """
+    import aiohttp
+
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+
+    def factory():
+        config = get_http_pool_config()
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=config["max_connections"],
+                keepalive_timeout=config["keepalive_expiry"],
+            )
+        )
+
+    return get_shared_http_client("aiohttp", origin, None, None, factory)
+
+
 def cosine_similarity(v1, v2):
     """Calculate cosine similarity between two vectors"""
     dot_product = np.dot(v1, v2)
@@ -1273,6 +2254,41 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     await hashing_kv.upsert({flattened_key: cache_entry})
 
 
+# Cache entry holding the knowledge graph version stamp that query cache keys include
+KG_VERSION_CACHE_KEY = generate_cache_key("default", "kg_version", "current")
+
+
+async def get_kg_version(hashing_kv) -> str:
+    """Return the current knowledge graph version stamp ("" if none recorded yet).
+
+    The stamp is part of every query cache key, so bumping it makes cached
+    query answers computed against an older graph unreachable.
+    """
+    if hashing_kv is None:
+        return ""
+    entry = await hashing_kv.get_by_id(KG_VERSION_CACHE_KEY)
+    return entry.get("return", "") if entry else ""
+
+
+async def bump_kg_version(hashing_kv) -> str:
+    """Record a new knowledge graph version stamp after the graph was modified."""
+    if hashing_kv is None:
+        return ""
+    version = str(time.time_ns())
+    await hashing_kv.upsert(
+        {
+            KG_VERSION_CACHE_KEY: {
+                "return": version,
+                "cache_type": "kg_version",
+                "chunk_id": None,
+                "original_prompt": "",
+                "queryparam": None,
+            }
+        }
+    )
+    return version
+
+
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
     unicode_escape_pattern = re.compile(r"\\u([0-9a-fA-F]{4})")
@@ -2308,46 +3324,38 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Get chunk embeddings from vector database as one (n, dim) matrix
+        found_ids, chunk_matrix = await chunks_vdb.get_vectors_matrix_by_ids(
+            all_chunk_ids
+        )
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(found_ids)} chunk vectors Retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
+        if not found_ids or len(found_ids) != len(all_chunk_ids):
+            if not found_ids:
                 logger.warning(
                     "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
                 )
             else:
                 logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
+                    f"Vector similarity chunk selection: found {len(found_ids)} but expecting {len(all_chunk_ids)}"
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
+        # Cosine similarities for all candidates with one matrix-vector product
+        query_vector = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norms = np.linalg.norm(chunk_matrix, axis=1) * np.linalg.norm(query_vector)
+        similarities = (chunk_matrix @ query_vector) / np.maximum(norms, 1e-12)
 
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Partial selection of the top num_of_chunks, then sort only those
+        top_k = min(num_of_chunks, len(found_ids))
+        if top_k < len(found_ids):
+            top_rows = np.argpartition(-similarities, top_k - 1)[:top_k]
+        else:
+            top_rows = np.arange(len(found_ids))
+        top_rows = top_rows[np.argsort(-similarities[top_rows], kind="stable")]
+        selected_chunks = [found_ids[row] for row in top_rows]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2591,7 +3599,7 @@ async def process_chunks_unified(
 
         original_count = len(unique_chunks)
 
-        unique_chunks = truncate_list_by_token_size(
+        unique_chunks = await atruncate_list_by_token_size(
             unique_chunks,
             key=lambda x: "\n".join(
                 json.dumps(item, ensure_ascii=False) for item in [x]